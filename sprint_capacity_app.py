@@ -18,10 +18,19 @@ Date: 2025-09-09
 
 import pandas as pd
 import numpy as np
+import openpyxl
+from pandas.io.parsers import TextParser
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Tuple, Optional, NamedTuple
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional, NamedTuple
+import csv
+import hashlib
+from collections import ChainMap
+import itertools
 import re
 import json
+import bisect
+import calendar
+import time
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -29,7 +38,8 @@ from email.mime.base import MIMEBase
 from email import encoders
 import os
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -56,6 +66,214 @@ class Employee:
     location: str = "GCC"  # Default to GCC for backward compatibility
 
 
+class EmployeeRegistry:
+    """Interned employees indexed by emp_id and normalized name
+
+    Each distinct (emp_id, name, location) is interned once and kept in first-seen
+    order, matching how employees have always been de-duplicated. Location changes
+    for an emp_id across month blocks are recorded as they are seen.
+    """
+
+    def __init__(self):
+        self._employees: List[Employee] = []
+        self._by_key: Dict[Tuple[str, str, str], Employee] = {}
+        self._by_emp_id: Dict[str, List[Employee]] = {}
+        self._by_name: Dict[str, List[Employee]] = {}
+        self._name_keys: Dict[int, Tuple[str, List[str]]] = {}
+        self._location_history: Dict[str, List[Tuple[Optional[int], Optional[int], str]]] = {}
+
+    @classmethod
+    def from_employees(cls, employees: List[Employee]) -> 'EmployeeRegistry':
+        """Build a registry that interns the given employee objects"""
+        registry = cls()
+        for employee in employees:
+            registry.add(employee)
+        return registry
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        """Lowercase name with commas/dots removed and whitespace collapsed"""
+        return ' '.join(name.lower().replace(',', ' ').replace('.', ' ').split())
+
+    @property
+    def employees(self) -> List[Employee]:
+        """Interned employees in first-seen order"""
+        return self._employees
+
+    def __len__(self) -> int:
+        return len(self._employees)
+
+    def __iter__(self):
+        return iter(self._employees)
+
+    def __contains__(self, employee: Employee) -> bool:
+        return (employee.emp_id, employee.name, employee.location) in self._by_key
+
+    def intern(self, emp_id: str, name: str, location: str = "GCC",
+               month: int = None, year: int = None) -> Employee:
+        """Return the shared Employee for these values, registering it on first sight
+
+        month and year say where the employee was seen and are used for the
+        location history.
+        """
+        employee = self._by_key.get((emp_id, name, location))
+        if employee is None:
+            return self.add(Employee(emp_id=emp_id, name=name, location=location), month, year)
+        self.record_location(employee, month, year)
+        return employee
+
+    def add(self, employee: Employee, month: int = None, year: int = None) -> Employee:
+        """Register an employee object, returning the already interned one if present"""
+        key = (employee.emp_id, employee.name, employee.location)
+        existing = self._by_key.get(key)
+        if existing is not None:
+            self.record_location(existing, month, year)
+            return existing
+
+        self._by_key[key] = employee
+        self._employees.append(employee)
+        self._by_emp_id.setdefault(employee.emp_id, []).append(employee)
+        self._by_name.setdefault(
+            self.normalize_name(employee.name), []).append(employee)
+        self.record_location(employee, month, year)
+        return employee
+
+    def record_location(self, employee: Employee, month: int = None, year: int = None):
+        """Note the employee's location, logging when it differs from the last one seen"""
+        history = self._location_history.setdefault(employee.emp_id, [])
+        if history and history[-1][2] == employee.location:
+            return
+        if history:
+            logger.info(
+                f"Location change for {employee.emp_id} ({employee.name}): "
+                f"{history[-1][2]} -> {employee.location}"
+                + (f" from {month}/{year}" if month else ""))
+        history.append((year, month, employee.location))
+
+    def get(self, emp_id: str) -> Optional[Employee]:
+        """First employee registered with this emp_id"""
+        variants = self._by_emp_id.get(emp_id)
+        return variants[0] if variants else None
+
+    def variants(self, emp_id: str) -> List[Employee]:
+        """All interned employees sharing an emp_id (e.g. after a location change)"""
+        return list(self._by_emp_id.get(emp_id, []))
+
+    def find_by_name(self, name: str) -> List[Employee]:
+        """Employees whose normalized name equals the normalized given name"""
+        return list(self._by_name.get(self.normalize_name(name), []))
+
+    def location_history(self, emp_id: str) -> List[Tuple[Optional[int], Optional[int], str]]:
+        """(year, month, location) each time the employee's location changed"""
+        return list(self._location_history.get(emp_id, []))
+
+    def name_keys(self, employee: Employee) -> Tuple[str, List[str]]:
+        """Cached lowercase name and name parts used for fuzzy name matching"""
+        keys = self._name_keys.get(id(employee))
+        if keys is None:
+            name_lower = employee.name.strip().lower()
+            keys = (name_lower, name_lower.replace(
+                ',', ' ').replace('.', ' ').split())
+            self._name_keys[id(employee)] = keys
+        return keys
+
+    def leave_entries_by_emp_id(self, leave_entries: List['LeaveEntry']) -> Dict[str, List['LeaveEntry']]:
+        """Group leave entries by emp_id, keeping their order"""
+        grouped: Dict[str, List[LeaveEntry]] = {}
+        for leave_entry in leave_entries:
+            grouped.setdefault(leave_entry.employee.emp_id,
+                               []).append(leave_entry)
+        return grouped
+
+
+class OnCallResolver:
+    """Resolves on-call schedule names to employees through a name-token index
+
+    The index over the registry's employee names is built once. A name is
+    matched by the first strategy that finds anyone: an alias from config,
+    the exact name, one name containing the other, then name parts (longer
+    than three letters) containing each other. When a strategy finds several
+    employees the one with the lowest (name, emp_id) wins and the name is
+    reported as ambiguous, so the result does not depend on sheet order.
+    Resolutions are memoized per on-call string.
+    """
+
+    def __init__(self, registry: EmployeeRegistry, aliases: Dict[str, str] = None):
+        self.registry = registry
+        self.aliases = {name.strip().lower(): target
+                        for name, target in (aliases or {}).items()}
+        # Lowercase name -> employees, name part -> employees (first variant per emp_id)
+        self._by_name: Dict[str, List[Employee]] = {}
+        self._by_part: Dict[str, List[Employee]] = {}
+        seen = set()
+        for employee in registry:
+            if employee.emp_id in seen:
+                continue
+            seen.add(employee.emp_id)
+            name_lower, name_parts = registry.name_keys(employee)
+            self._by_name.setdefault(name_lower, []).append(employee)
+            for part in dict.fromkeys(name_parts):
+                self._by_part.setdefault(part, []).append(employee)
+        self._resolved: Dict[str, Optional[Employee]] = {}
+        self.diagnostics: Dict[str, List[str]] = {}
+
+    def resolve(self, oncall_name: str) -> Optional[Employee]:
+        """Employee for an on-call name, or None if nobody matches"""
+        key = oncall_name.strip().lower()
+        if key not in self._resolved:
+            self._resolved[key] = self._resolve(key) if key else None
+        return self._resolved[key]
+
+    def _resolve(self, key: str) -> Optional[Employee]:
+        alias = self.aliases.get(key)
+        if alias is not None:
+            employee = self.registry.get(str(alias).strip())
+            if employee is None:
+                employee = self._match(str(alias).strip().lower(), key)
+            if employee is not None:
+                return employee
+            self._diagnose(key, f"alias '{alias}' matches no employee")
+
+        employee = self._match(key, key)
+        if employee is None:
+            self._diagnose(key, "no matching employee")
+        return employee
+
+    def _match(self, name_lower: str, key: str) -> Optional[Employee]:
+        """Best candidate by strategy, reporting ties under key"""
+        name_parts = name_lower.replace(',', ' ').replace('.', ' ').split()
+        strategies = [
+            # 1. Exact match
+            lambda: self._by_name.get(name_lower, []),
+            # 2. One name contains the other
+            lambda: [employee for emp_name, employees in self._by_name.items()
+                     if emp_name in name_lower or name_lower in emp_name
+                     for employee in employees],
+            # 3. Name parts contain each other (e.g. "Siva Guru" matches "Sivaguru");
+            # only significant parts of the on-call name (not "mr", "ms", etc.)
+            lambda: [employee for emp_part, employees in self._by_part.items()
+                     if any(part in emp_part or emp_part in part
+                            for part in name_parts if len(part) > 3)
+                     for employee in employees],
+        ]
+        for strategy in strategies:
+            candidates = {employee.emp_id: employee for employee in strategy()}
+            if candidates:
+                ranked = sorted(candidates.values(),
+                                key=lambda employee: (employee.name.strip().lower(), employee.emp_id))
+                if len(ranked) > 1:
+                    shown = ", ".join(f"{employee.name} ({employee.emp_id})"
+                                      for employee in ranked[:5])
+                    more = f" and {len(ranked) - 5} more" if len(ranked) > 5 else ""
+                    self._diagnose(key, f"ambiguous between {shown}{more}; using {ranked[0].name}")
+                return ranked[0]
+        return None
+
+    def _diagnose(self, key: str, message: str):
+        self.diagnostics.setdefault(key, []).append(message)
+        logger.warning(f"On-call name '{key}': {message}")
+
+
 @dataclass
 class LeaveEntry:
     """Leave entry data structure"""
@@ -82,6 +300,8 @@ class Sprint:
     end_date: date
     oncall_primary: str = ""
     oncall_secondary: str = ""
+    # (first day, last day, primary) for each on-call rotation within the sprint
+    oncall_shifts: List[Tuple[date, date, str]] = field(default_factory=list)
 
     def contains_date(self, check_date: date) -> bool:
         """Check if a date falls within this sprint"""
@@ -92,14 +312,12 @@ class Sprint:
         if gcc_holidays is None:
             gcc_holidays = set()
 
-        working_days = 0
-        current_date = self.start_date
-        while current_date <= self.end_date:
-            # Count only weekdays that are not GCC holidays
-            if current_date.weekday() < 5 and current_date not in gcc_holidays:
-                working_days += 1
-            current_date += timedelta(days=1)
-        return working_days
+        if self.end_date < self.start_date:
+            return 0
+
+        # Count only weekdays that are not GCC holidays (the end date is exclusive)
+        return int(np.busday_count(self.start_date, self.end_date + timedelta(days=1),
+                                   holidays=sorted(gcc_holidays)))
 
 
 @dataclass
@@ -117,6 +335,773 @@ class SprintCapacity:
     actual_capacity_hours: float  # Actual capacity after deductions
     gcc_holidays: set = None  # GCC holidays in this sprint
     us_holidays: set = None  # US holidays in this sprint
+    holidays: Dict[str, set] = None  # Holidays in this sprint at every employee location
+
+    def holiday_counts(self) -> List[Tuple[str, int]]:
+        """(location, holidays in the sprint) for locations with any, GCC and US first"""
+        holidays = self.holidays
+        if holidays is None:
+            holidays = {'GCC': self.gcc_holidays or set(), 'US': self.us_holidays or set()}
+        locations = sorted(holidays, key=lambda location: (
+            location not in ('GCC', 'US'), location != 'GCC', location))
+        return [(location, len(holidays[location])) for location in locations if holidays[location]]
+
+
+@dataclass
+class SprintCapacityDiff:
+    """Baseline and what-if capacity of a sprint changed by a scenario"""
+    baseline: SprintCapacity
+    scenario: SprintCapacity
+
+    @property
+    def sprint_number(self) -> int:
+        return self.scenario.sprint.number
+
+    @property
+    def capacity_percentage_change(self) -> float:
+        return self.scenario.capacity_percentage - self.baseline.capacity_percentage
+
+    @property
+    def actual_hours_change(self) -> float:
+        return self.scenario.actual_capacity_hours - self.baseline.actual_capacity_hours
+
+    def changed_members(self) -> List[Tuple[Employee, str, str]]:
+        """(employee, baseline status, scenario status) of each member whose status changed"""
+        return [(employee, before, after)
+                for (employee, before), (_, after) in zip(self.baseline.all_members_status,
+                                                          self.scenario.all_members_status)
+                if before != after]
+
+
+@dataclass
+class ScenarioResult:
+    """Sprint capacities under a what-if scenario and the sprints it changed"""
+    name: str
+    sprint_capacities: List[SprintCapacity]
+    diffs: List[SprintCapacityDiff]
+
+    def format_table(self) -> str:
+        """Plain-text table of the capacity changes against the baseline"""
+        lines = [
+            "=" * 60,
+            f"SCENARIO: {self.name or 'unnamed'}",
+            "=" * 60,
+        ]
+        if not self.diffs:
+            lines.append("No sprint capacity changed")
+        for diff in self.diffs:
+            lines.append(
+                f"Sprint {diff.sprint_number}: {diff.baseline.capacity_percentage:.1f}% -> "
+                f"{diff.scenario.capacity_percentage:.1f}% "
+                f"({diff.capacity_percentage_change:+.1f} pts, {diff.actual_hours_change:+.1f} hours)")
+            if diff.scenario.sprint.oncall_primary != diff.baseline.sprint.oncall_primary:
+                lines.append(f"  On-call: {diff.baseline.sprint.oncall_primary or 'none'} -> "
+                             f"{diff.scenario.sprint.oncall_primary or 'none'}")
+            for employee, before, after in diff.changed_members():
+                lines.append(f"  {employee.name}: {before} -> {after}")
+        lines.append("=" * 60)
+        return "\n".join(lines)
+
+
+@dataclass
+class SectionStats:
+    """Size and parse time of one month section"""
+    label: str
+    rows: int
+    employees: int
+    leave_entries: int
+    seconds: float
+    reused: bool = False
+
+
+@dataclass
+class IngestionStats:
+    """Counters and per-stage timings of one workbook parse"""
+    file_path: str = ""
+    sheet_name: str = ""
+    from_cache: bool = False
+    from_snapshot: bool = False
+    rows_scanned: int = 0
+    header_rows: int = 0
+    separator_rows: int = 0
+    employee_rows: int = 0
+    cells_inspected: int = 0  # Leave cells looked at on employee rows
+    date_strings_parsed: int = 0
+    parse_failures: int = 0  # Leave cell text that yielded no dates
+    sheet_seconds: Dict[str, float] = field(default_factory=dict)
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    sections: List[SectionStats] = field(default_factory=list)
+
+    def format_table(self) -> str:
+        """Plain-text table of the counters and timings"""
+        lines = [
+            "=" * 60,
+            "INGESTION REPORT",
+            "=" * 60,
+            f"File: {self.file_path}",
+        ]
+        if self.from_cache or self.from_snapshot:
+            source = "parse cache" if self.from_cache else "snapshot"
+            lines.append(f"Loaded from {source} (no sheets parsed)")
+            lines.append("=" * 60)
+            return "\n".join(lines)
+
+        lines.append(f"Sheet: {self.sheet_name}")
+        lines.append("")
+        for label, value in [
+            ("Rows scanned", self.rows_scanned),
+            ("Header rows", self.header_rows),
+            ("Separator rows", self.separator_rows),
+            ("Employee rows", self.employee_rows),
+            ("Cells inspected", self.cells_inspected),
+            ("Date strings parsed", self.date_strings_parsed),
+            ("Parse failures", self.parse_failures),
+        ]:
+            lines.append(f"{label:<24}{value:>12,}")
+
+        if self.sheet_seconds or self.stage_seconds:
+            lines.append("")
+            lines.append(f"{'Sheet / stage':<36}{'Time (s)':>12}")
+            lines.append("-" * 48)
+            for name, seconds in self.sheet_seconds.items():
+                lines.append(f"{'Sheet ' + name:<36}{seconds:>12.3f}")
+                if name == self.sheet_name:
+                    for stage, stage_seconds in self.stage_seconds.items():
+                        lines.append(f"{'  ' + stage:<36}{stage_seconds:>12.3f}")
+
+        if self.sections:
+            lines.append("")
+            lines.append(f"{'Section':<20}{'Rows':>8}{'Employees':>11}{'Entries':>9}{'Time (s)':>10}")
+            lines.append("-" * 58)
+            for section in self.sections:
+                label = section.label + (" (reused)" if section.reused else "")
+                lines.append(
+                    f"{label:<20}{section.rows:>8}{section.employees:>11}"
+                    f"{section.leave_entries:>9}{section.seconds:>10.3f}")
+
+        lines.append("=" * 60)
+        return "\n".join(lines)
+
+
+class LeaveIndex:
+    """Per-employee sorted leave-day ordinals for sprint window queries
+
+    Built once from the leave entries and keyed by emp_id. Each employee has the
+    sorted ordinals of their non-public-holiday leave days, with the number of
+    the entry each day came from (entries keep their order), and the sorted
+    weekday ordinals of their capacity leave (planned and optional holiday).
+    Repeated days are kept, as every occurrence counts against capacity. A
+    sprint window is then a pair of bisects per employee.
+    """
+
+    CAPACITY_LEAVE_TYPES = ('planned', 'optional_holiday')
+
+    def __init__(self, leave_entries: List[LeaveEntry]):
+        self.leave_entries = leave_entries
+        # emp_id -> (sorted ordinals, entry number of each ordinal, entry leave types)
+        self.display_days: Dict[str, Tuple[List[int], List[int], List[str]]] = {}
+        # emp_id -> sorted weekday ordinals of capacity leave
+        self.capacity_days: Dict[str, List[int]] = {}
+
+        display_rows: Dict[str, List[Tuple[int, int]]] = {}
+        entry_types: Dict[str, List[str]] = {}
+        for leave_entry in leave_entries:
+            emp_id = leave_entry.employee.emp_id
+            if leave_entry.leave_type == 'public_holiday':
+                continue
+            ordinals = [leave_date.toordinal() for leave_date in leave_entry.leave_dates]
+            types = entry_types.setdefault(emp_id, [])
+            entry_number = len(types)
+            types.append(leave_entry.leave_type)
+            display_rows.setdefault(emp_id, []).extend(
+                (ordinal, entry_number) for ordinal in ordinals)
+            if leave_entry.leave_type in self.CAPACITY_LEAVE_TYPES:
+                # Ordinal 1 (0001-01-01) was a Monday
+                self.capacity_days.setdefault(emp_id, []).extend(
+                    ordinal for ordinal in ordinals if (ordinal + 6) % 7 < 5)
+
+        for emp_id, rows in display_rows.items():
+            rows.sort()
+            self.display_days[emp_id] = ([ordinal for ordinal, _ in rows],
+                                         [entry for _, entry in rows], entry_types[emp_id])
+        for days in self.capacity_days.values():
+            days.sort()
+
+    @staticmethod
+    def _window(days: List[int], start: int, end: int) -> Tuple[int, int]:
+        """Slice bounds of the days in [start, end]"""
+        return bisect.bisect_left(days, start), bisect.bisect_right(days, end)
+
+    def leave_lists(self, emp_id: str, start_date: date,
+                    end_date: date) -> List[Tuple[str, List[int]]]:
+        """(leave type, ordinals) of each entry with leave days in [start_date, end_date], in entry order"""
+        indexed = self.display_days.get(emp_id)
+        if indexed is None:
+            return []
+        days, entries, types = indexed
+        lo, hi = self._window(days, start_date.toordinal(), end_date.toordinal())
+        by_entry: Dict[int, List[int]] = {}
+        for ordinal, entry in zip(days[lo:hi], entries[lo:hi]):
+            by_entry.setdefault(entry, []).append(ordinal)
+        return [(types[entry], by_entry[entry]) for entry in sorted(by_entry)]
+
+    def capacity_ordinals(self, emp_id: str, start_date: date, end_date: date) -> List[int]:
+        """Sorted planned and optional holiday weekday ordinals in [start_date, end_date]"""
+        days = self.capacity_days.get(emp_id)
+        if not days:
+            return []
+        lo, hi = self._window(days, start_date.toordinal(), end_date.toordinal())
+        return days[lo:hi]
+
+    def count_leave_days(self, emp_id: str, start_date: date, end_date: date,
+                         excluded_days: Iterable[date] = ()) -> int:
+        """Planned and optional holiday weekdays in [start_date, end_date], minus excluded days"""
+        days = self.capacity_days.get(emp_id)
+        if not days:
+            return 0
+        start, end = start_date.toordinal(), end_date.toordinal()
+        lo, hi = self._window(days, start, end)
+        count = hi - lo
+        if count:
+            for excluded in map(date.toordinal, excluded_days):
+                if start <= excluded <= end:
+                    excluded_lo, excluded_hi = self._window(days, excluded, excluded)
+                    count -= excluded_hi - excluded_lo
+        return count
+
+    def overlay(self, added_days: Dict[str, Dict[date, str]],
+                removed_days: Dict[str, Iterable[date]]) -> 'LeaveIndex':
+        """Copy-on-write view of the index with leave days removed and added
+
+        Only the employees in the overlay get new day lists; every other
+        employee's lists are shared with this index. A removed day drops every
+        leave entry on that day; added days (day -> leave type) form one new
+        entry per leave type and skip the days the employee is already on leave.
+        """
+        display_days: Dict[str, Tuple[List[int], List[int], List[str]]] = {}
+        capacity_days: Dict[str, List[int]] = {}
+
+        for emp_id in set(added_days) | set(removed_days):
+            removed = {day.toordinal() for day in removed_days.get(emp_id, ())}
+            days, entries, types = self.display_days.get(emp_id, ([], [], []))
+            rows = [(ordinal, entry) for ordinal, entry in zip(days, entries)
+                    if ordinal not in removed]
+            capacity = [ordinal for ordinal in self.capacity_days.get(emp_id, [])
+                        if ordinal not in removed]
+            on_leave = {ordinal for ordinal, _ in rows}
+            types = list(types)
+            added_entries: Dict[str, int] = {}
+            for day, leave_type in sorted(added_days.get(emp_id, {}).items()):
+                ordinal = day.toordinal()
+                if ordinal in on_leave:
+                    continue
+                if leave_type not in added_entries:
+                    added_entries[leave_type] = len(types)
+                    types.append(leave_type)
+                rows.append((ordinal, added_entries[leave_type]))
+                on_leave.add(ordinal)
+                if leave_type in self.CAPACITY_LEAVE_TYPES and (ordinal + 6) % 7 < 5:
+                    capacity.append(ordinal)
+            rows.sort()
+            capacity.sort()
+            display_days[emp_id] = ([ordinal for ordinal, _ in rows],
+                                    [entry for _, entry in rows], types)
+            capacity_days[emp_id] = capacity
+
+        return self._view(display_days, capacity_days)
+
+    def reindexed(self, entries_by_emp_id: Dict[str, List[LeaveEntry]]) -> 'LeaveIndex':
+        """Copy-on-write view of the index with the given employees indexed from new leave entries"""
+        changed = LeaveIndex([leave_entry for leave_entries in entries_by_emp_id.values()
+                              for leave_entry in leave_entries])
+        return self._view(
+            {emp_id: changed.display_days.get(emp_id, ([], [], [])) for emp_id in entries_by_emp_id},
+            {emp_id: changed.capacity_days.get(emp_id, []) for emp_id in entries_by_emp_id})
+
+    def commit(self, view: 'LeaveIndex'):
+        """Write the employees changed in a view of this index into the index itself"""
+        self.display_days.update(view.display_days.maps[0])
+        self.capacity_days.update(view.capacity_days.maps[0])
+
+    def _view(self, display_days: Dict[str, Tuple[List[int], List[int], List[str]]],
+              capacity_days: Dict[str, List[int]]) -> 'LeaveIndex':
+        """Index whose lists come from the given employees first, then from this index"""
+        view = LeaveIndex.__new__(LeaveIndex)
+        view.leave_entries = self.leave_entries
+        view.display_days = ChainMap(display_days, self.display_days)
+        view.capacity_days = ChainMap(capacity_days, self.capacity_days)
+        return view
+
+
+class HolidayCalendar:
+    """Public holidays per employee location, collapsed from the leave table
+
+    The sheet repeats every public holiday on each employee's row; here each
+    location keeps one sorted tuple of its holiday dates, so a date range is
+    two bisects instead of a scan over the leave entries.
+    """
+
+    def __init__(self, holidays: Dict[str, Iterable[date]] = None):
+        self.holidays: Dict[str, Tuple[date, ...]] = {
+            location: tuple(sorted(set(days)))
+            for location, days in (holidays or {}).items()
+        }
+
+    @classmethod
+    def from_entries(cls, leave_entries: List[LeaveEntry]) -> 'HolidayCalendar':
+        """Collect the public holiday entries of each employee location"""
+        holidays: Dict[str, set] = {}
+        for leave_entry in leave_entries:
+            if leave_entry.leave_type == 'public_holiday':
+                holidays.setdefault(leave_entry.employee.location,
+                                    set()).update(leave_entry.leave_dates)
+        return cls(holidays)
+
+    @property
+    def locations(self) -> List[str]:
+        return list(self.holidays)
+
+    def __len__(self) -> int:
+        return sum(len(days) for days in self.holidays.values())
+
+    def years(self) -> set:
+        """Years that have a holiday at any location"""
+        return {day.year for days in self.holidays.values() for day in days}
+
+    def holidays_between(self, start_date: date, end_date: date, location: str) -> set:
+        """Holidays at a location from start_date to end_date inclusive"""
+        days = self.holidays.get(location, ())
+        return set(days[bisect.bisect_left(days, start_date):bisect.bisect_right(days, end_date)])
+
+    def holidays_by_location(self, start_date: date, end_date: date) -> Dict[str, set]:
+        """Holidays from start_date to end_date inclusive at every location"""
+        return {location: self.holidays_between(start_date, end_date, location)
+                for location in self.holidays}
+
+
+class OnCallIndex:
+    """Sorted interval index over on-call rotations
+
+    Rotations are sorted by start date, with the running maximum of their end
+    dates alongside, so the rotations overlapping a date range are found with
+    two bisects plus the overlaps themselves.
+    """
+
+    def __init__(self, oncall_schedules: List[OnCallSchedule]):
+        self.oncall_schedules = oncall_schedules
+        self.rotations = sorted(oncall_schedules,
+                                key=lambda oncall: (oncall.start_date, oncall.end_date))
+        self.starts = [oncall.start_date for oncall in self.rotations]
+        self.max_ends = list(itertools.accumulate(
+            (oncall.end_date for oncall in self.rotations), max))
+
+    def __len__(self) -> int:
+        return len(self.rotations)
+
+    def overlapping(self, start_date: date, end_date: date) -> List[OnCallSchedule]:
+        """Rotations with at least one day in [start_date, end_date], by start date"""
+        hi = bisect.bisect_right(self.starts, end_date)
+        lo = bisect.bisect_left(self.max_ends, start_date, 0, hi)
+        return [oncall for oncall in self.rotations[lo:hi] if oncall.end_date >= start_date]
+
+    def primary_shifts(self, start_date: date, end_date: date) -> List[Tuple[date, date, OnCallSchedule]]:
+        """Split [start_date, end_date] into runs of days with the same on-call rotation
+
+        On a day covered by several rotations (a handover day) the rotation
+        that started first stays on call until it ends. Days without a
+        rotation are left out.
+        """
+        shifts = []
+        day = start_date
+        for oncall in self.overlapping(start_date, end_date):
+            shift_start = max(day, oncall.start_date)
+            shift_end = min(oncall.end_date, end_date)
+            if shift_start <= shift_end:
+                shifts.append((shift_start, shift_end, oncall))
+                day = shift_end + timedelta(days=1)
+        return shifts
+
+
+# Full and three-letter month names
+MONTH_NUMBERS = {
+    'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3,
+    'apr': 4, 'april': 4, 'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7,
+    'aug': 8, 'august': 8, 'sep': 9, 'september': 9, 'oct': 10, 'october': 10,
+    'nov': 11, 'november': 11, 'dec': 12, 'december': 12
+}
+
+# Month names recognised in the separator and header rows of the year sheet (no 'jun')
+SHEET_MONTH_MAPPING = {name: month for name, month in MONTH_NUMBERS.items() if name != 'jun'}
+
+# Full month names recognised in sheet column names
+COLUMN_MONTH_MAPPING = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4,
+    'may': 5, 'june': 6, 'july': 7, 'august': 8,
+    'september': 9, 'october': 10, 'november': 11, 'december': 12
+}
+
+# Cell text that pandas reads as a missing value by default
+EXCEL_NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+    '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+])
+
+# Cell text in CSV exports that the xlsx reader would hold as a number or a timestamp
+CSV_NUMBER_PATTERN = re.compile(r'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?')
+CSV_TIMESTAMP_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d+)?')
+
+# Leave data sources selectable with the 'data_source' config key
+DATA_SOURCES = ['auto', 'xlsx', 'openpyxl', 'csv']
+
+# Sprint capacity engines selectable with the 'capacity_engine' config key
+CAPACITY_ENGINES = ['loop', 'matrix']
+
+# Upcoming sprints after the current one in the standard report (previous, current, next two)
+DEFAULT_HORIZON = 2
+
+# Day ranges in leave text: "16 to 27", "16-27" (ordinal suffixes allowed)
+DATE_RANGE_PATTERNS = [
+    re.compile(r'(\d{1,2})(?:st|nd|rd|th)?\s+to\s+(\d{1,2})(?:st|nd|rd|th)?'),
+    re.compile(r'(\d{1,2})(?:st|nd|rd|th)?\s*-\s*(\d{1,2})(?:st|nd|rd|th)?'),
+]
+
+# Single days in leave text: "1st", "4th", "15"
+DAY_PATTERN = re.compile(r'(\d{1,2})(?:st|nd|rd|th)?')
+
+# Tokens of leave text: a day number with optional ordinal suffix, a "to" or "-"
+# range operator, or a separator (whitespace or any other text)
+DATE_TOKEN_PATTERN = re.compile(
+    r'(\d+)(?:st|nd|rd|th)?|(\s+to\s+|\s*-\s*)|\s+|[^\d\s-]+')
+
+# Cell values that repeat column headers and never hold leave dates
+HEADER_CELL_VALUES = ['Public Holiday', 'Optional Holiday', 'Planned Leave', 'Holiday',
+                      'Opting?', 'GCC Holiday', 'NA', 'No', 'Yes']
+
+
+class SheetSegmentation(NamedTuple):
+    """Row classification of a year sheet"""
+    employee_rows: pd.DataFrame  # month, year, section, header_epoch per employee row position
+    column_headers: List[Dict]  # header mapping in effect for each header epoch
+
+
+class LeaveDateParser:
+    """Date-string parser built on a single-pass tokenizer with LRU caches
+
+    Leave text is scanned once into day spans: "16 to 27" becomes (16, 27) and
+    "1st & 4th" becomes (1, 1), (4, 4). Spans only depend on the text, so they
+    are cached by text and expanded to dates for a month on request. The same
+    cell text ("26th", "16 to 27") repeats across employees and months, so
+    expanded results are also cached by (text, month, year) and returned as
+    immutable tuples of sorted, unique dates.
+    """
+
+    def __init__(self, cache_size: int = 8192):
+        self._day_spans_cached = lru_cache(maxsize=cache_size)(self.tokenize)
+        self._parse_cached = lru_cache(maxsize=cache_size)(self._parse)
+
+    def parse(self, date_str: str, month: int, year: int) -> Tuple[date, ...]:
+        """Parse one date string"""
+        if not isinstance(date_str, str):
+            if pd.isna(date_str):
+                return ()
+            date_str = str(date_str)
+        date_str = date_str.strip()
+        if not date_str:
+            return ()
+        return self._parse_cached(date_str, month, year)
+
+    def parse_many(self, strings, month: int, year: int) -> List[Tuple[date, ...]]:
+        """Parse date strings that share a month and year"""
+        return [self.parse(date_str, month, year) for date_str in strings]
+
+    def day_spans(self, date_str: str) -> Tuple[Tuple[int, int], ...]:
+        """(first day, last day) of each day or day range in a date string"""
+        return self._day_spans_cached(str(date_str).strip())
+
+    def cache_info(self):
+        """Hit/miss statistics of the result cache"""
+        return self._parse_cached.cache_info()
+
+    def cache_clear(self):
+        """Drop all cached results"""
+        self._day_spans_cached.cache_clear()
+        self._parse_cached.cache_clear()
+
+    def _parse(self, date_str: str, month: int, year: int) -> Tuple[date, ...]:
+        """Expand the day spans of a stripped, non-empty date string to dates"""
+        if not 1 <= month <= 12:
+            return ()
+        last_day = calendar.monthrange(year, month)[1]
+        days = set()
+        for first, last in self._day_spans_cached(date_str):
+            days.update(range(first, min(last, last_day) + 1))
+        return tuple(date(year, month, day) for day in sorted(days))
+
+    @classmethod
+    def tokenize(cls, date_str: str) -> Tuple[Tuple[int, int], ...]:
+        """Scan a date string once and return its day spans
+
+        A day number followed by a range operator and another day number is a
+        range; any other day number stands alone. Days outside 1-31 are dropped,
+        and a range with an end outside 1-31 is dropped whole.
+        """
+        has_to = 'to' in date_str
+        has_dash = '-' in date_str
+        if has_to and has_dash:
+            # Cells that mix "to" and "-" ranges go through the pattern passes,
+            # whose precedence between the two kinds the scan does not model
+            return cls._pattern_spans(date_str)
+
+        spans = []
+        pending = None  # Day number that may start a range
+        in_range = False  # A range operator followed the pending day
+        for digits, operator in DATE_TOKEN_PATTERN.findall(date_str):
+            if digits:
+                if len(digits) > 2:
+                    if has_to or has_dash:
+                        # A range can start inside a long digit run
+                        return cls._pattern_spans(date_str)
+                    # Long digit runs read as consecutive two-digit days ("2026" is 20, 26)
+                    if pending is not None:
+                        spans.append((pending, pending))
+                    for pos in range(0, len(digits), 2):
+                        day = int(digits[pos:pos + 2])
+                        spans.append((day, day))
+                    pending = None
+                elif in_range:
+                    first, last = pending, int(digits)
+                    if 1 <= first <= 31 and 1 <= last <= 31 and first <= last:
+                        spans.append((first, last))
+                    pending = None
+                else:
+                    if pending is not None:
+                        spans.append((pending, pending))
+                    pending = int(digits)
+                in_range = False
+            elif operator and pending is not None and not in_range:
+                in_range = True
+            else:
+                if pending is not None:
+                    spans.append((pending, pending))
+                pending = None
+                in_range = False
+        if pending is not None:
+            spans.append((pending, pending))
+
+        return tuple((first, last) for first, last in spans if 1 <= first <= 31)
+
+    @staticmethod
+    def _pattern_spans(date_str: str) -> Tuple[Tuple[int, int], ...]:
+        """Day spans from separate range and single-day pattern passes"""
+        spans = []
+
+        # Ranges first, removing each matched range so its ends aren't read again
+        for pattern in DATE_RANGE_PATTERNS:
+            for start_str, end_str in pattern.findall(date_str):
+                first = int(start_str)
+                last = int(end_str)
+                if 1 <= first <= 31 and 1 <= last <= 31 and first <= last:
+                    spans.append((first, last))
+            date_str = pattern.sub('', date_str)
+
+        # Then individual days
+        for day_str in DAY_PATTERN.findall(date_str):
+            day = int(day_str)
+            if 1 <= day <= 31:
+                spans.append((day, day))
+        return tuple(spans)
+
+
+class Calendar:
+    """Precomputed day table shared by parsing, capacity and report code
+
+    Covers whole years, indexed by date ordinal: weekday flags and a holiday
+    flag per location. Date objects and '%b %d' display strings are created
+    once per day. Queries outside the covered years extend the table.
+    Weekday and working-day counts use NumPy business-day calendars (one per
+    location) and are cached per date range and location.
+    """
+
+    def __init__(self, start_year: int, end_year: int,
+                 holidays: Dict[str, Iterable[date]] = None):
+        self.holidays = {location: frozenset(days)
+                         for location, days in (holidays or {}).items()}
+        self.busday_calendars = {
+            location: np.busdaycalendar(holidays=sorted(days))
+            for location, days in self.holidays.items()
+        }
+        self.weekday_calendar = np.busdaycalendar()
+        self._busday_counts: Dict[Tuple[date, date, Optional[str]], int] = {}
+        self._build(start_year, end_year)
+
+    def _build(self, start_year: int, end_year: int):
+        """(Re)build the day table for start_year..end_year"""
+        self.start_year = start_year
+        self.end_year = end_year
+        self.first_ordinal = date(start_year, 1, 1).toordinal()
+        last_ordinal = date(end_year, 12, 31).toordinal()
+        ordinals = np.arange(self.first_ordinal, last_ordinal + 1)
+
+        # Ordinal 1 (0001-01-01) was a Monday
+        self.weekday_numbers = ((ordinals + 6) % 7).astype(np.int8)
+        self.weekday_flags = self.weekday_numbers < 5
+        self.dates = [date.fromordinal(ordinal) for ordinal in ordinals.tolist()]
+
+        self.holiday_flags: Dict[str, np.ndarray] = {}
+        for location, days in self.holidays.items():
+            flags = np.zeros(len(ordinals), dtype=bool)
+            positions = [day.toordinal() - self.first_ordinal for day in days]
+            flags[[pos for pos in positions if 0 <= pos < len(flags)]] = True
+            self.holiday_flags[location] = flags
+
+        self._labels: Optional[np.ndarray] = None
+        self._end_suffixes: Optional[np.ndarray] = None
+        self._label_dates: Dict[int, Dict[str, date]] = {}
+
+    def _position(self, day: date) -> int:
+        """Table position of a day, extending the table to cover its year"""
+        pos = day.toordinal() - self.first_ordinal
+        if not 0 <= pos < len(self.dates):
+            self._build(min(self.start_year, day.year),
+                        max(self.end_year, day.year))
+            pos = day.toordinal() - self.first_ordinal
+        return pos
+
+    def _span(self, start_date: date, end_date: date) -> Tuple[int, int]:
+        """Table positions [lo, hi) of the days start_date..end_date"""
+        if end_date < start_date:
+            return 0, 0
+        self._position(start_date)
+        self._position(end_date)
+        return self._position(start_date), self._position(end_date) + 1
+
+    def is_weekday(self, day: date) -> bool:
+        """True for Monday to Friday"""
+        pos = self._position(day)
+        return bool(self.weekday_flags[pos])
+
+    def days(self, start_date: date, end_date: date) -> List[date]:
+        """Every day from start_date to end_date inclusive"""
+        lo, hi = self._span(start_date, end_date)
+        return self.dates[lo:hi]
+
+    def weekdays(self, start_date: date, end_date: date) -> int:
+        """Number of weekdays from start_date to end_date inclusive"""
+        return self.working_days(start_date, end_date, None)
+
+    def working_days(self, start_date: date, end_date: date, location: Optional[str]) -> int:
+        """Weekdays from start_date to end_date that are not holidays at a location"""
+        key = (start_date, end_date, location)
+        count = self._busday_counts.get(key)
+        if count is None:
+            if end_date < start_date:
+                count = 0
+            else:
+                busday_calendar = self.busday_calendars.get(location, self.weekday_calendar)
+                count = int(np.busday_count(start_date, end_date + timedelta(days=1),
+                                            busdaycal=busday_calendar))
+            self._busday_counts[key] = count
+        return count
+
+    def working_day_flags(self, start_date: date, end_date: date, location: str = None) -> np.ndarray:
+        """Per-day flags from start_date to end_date: weekdays that are not holidays at a location
+
+        Without a location (or for one without holidays) these are the weekday flags.
+        """
+        lo, hi = self._span(start_date, end_date)
+        flags = self.weekday_flags[lo:hi]
+        holiday_flags = self.holiday_flags.get(location)
+        if holiday_flags is not None:
+            flags = flags & ~holiday_flags[lo:hi]
+        return flags
+
+    def holidays_between(self, start_date: date, end_date: date, location: str) -> set:
+        """Holidays at a location from start_date to end_date inclusive"""
+        lo, hi = self._span(start_date, end_date)
+        flags = self.holiday_flags.get(location)
+        if flags is None:
+            return set()
+        dates = self.dates
+        return {dates[lo + pos] for pos in np.flatnonzero(flags[lo:hi]).tolist()}
+
+    @property
+    def labels(self) -> np.ndarray:
+        """Display string of every day in the table, e.g. 'Feb 16'"""
+        if self._labels is None:
+            self._labels = np.array(
+                [day.strftime("%b %d") for day in self.dates], dtype=object)
+        return self._labels
+
+    @property
+    def end_suffixes(self) -> np.ndarray:
+        """'-DD' suffix of every day in the table, closing a range label"""
+        if self._end_suffixes is None:
+            self._end_suffixes = np.array(
+                [f"-{day.day:02d}" for day in self.dates], dtype=object)
+        return self._end_suffixes
+
+    def label(self, day: date) -> str:
+        """Display string of a day, e.g. 'Feb 16'"""
+        pos = self._position(day)
+        return self.labels[pos]
+
+    def format_ranges(self, ordinals, groups, group_count: int) -> List[str]:
+        """Format many date lists as ranges at once, e.g. "Feb 16-18, Feb 20"
+
+        ordinals holds the day ordinals of all lists and groups the number of the
+        list each belongs to. Runs of consecutive days are found with NumPy and
+        labelled from the day table; the result has one string per list, the same
+        as format_dates_as_ranges gives for that list.
+        """
+        formatted = [""] * group_count
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        if not len(ordinals):
+            return formatted
+        groups = np.asarray(groups, dtype=np.int64)
+        self._position(date.fromordinal(int(ordinals.min())))
+        self._position(date.fromordinal(int(ordinals.max())))
+
+        order = np.lexsort((ordinals, groups))
+        ordinals = ordinals[order]
+        groups = groups[order]
+
+        # A run starts where a list starts or the day does not follow the previous one
+        run_starts = np.ones(len(ordinals), dtype=bool)
+        run_starts[1:] = (np.diff(ordinals) != 1) | (groups[1:] != groups[:-1])
+        start_pos = np.flatnonzero(run_starts)
+        end_pos = np.append(start_pos[1:], len(ordinals)) - 1
+        run_first = ordinals[start_pos] - self.first_ordinal
+        run_last = ordinals[end_pos] - self.first_ordinal
+
+        run_labels = self.labels[run_first]
+        is_range = run_last != run_first
+        run_labels[is_range] = run_labels[is_range] + self.end_suffixes[run_last[is_range]]
+
+        # Join the runs of each list
+        run_groups = groups[start_pos]
+        list_starts = np.flatnonzero(np.r_[True, run_groups[1:] != run_groups[:-1]])
+        list_ends = np.append(list_starts[1:], len(run_groups))
+        run_labels = run_labels.tolist()
+        for group, lo, hi in zip(run_groups[list_starts].tolist(), list_starts.tolist(),
+                                 list_ends.tolist()):
+            formatted[group] = ", ".join(run_labels[lo:hi])
+        return formatted
+
+    def date_from_label(self, label: str, year: int) -> Optional[date]:
+        """Day of a year whose display string is label, None if there is none"""
+        if year not in self._label_dates:
+            first = date(year, 1, 1).toordinal()
+            last = date(year, 12, 31).toordinal()
+            self._label_dates[year] = {
+                self.label(date.fromordinal(ordinal)): date.fromordinal(ordinal)
+                for ordinal in range(first, last + 1)
+            }
+        return self._label_dates[year].get(label)
+
+    @staticmethod
+    def month_number(month_name: str) -> Optional[int]:
+        """Month number of a full or three-letter month name"""
+        return MONTH_NUMBERS.get(str(month_name).strip().lower())
 
 
 class SprintCapacityCalculator:
@@ -128,6 +1113,99 @@ class SprintCapacityCalculator:
         self.employees: List[Employee] = []
         self.leave_entries: List[LeaveEntry] = []
         self.oncall_schedules: List[OnCallSchedule] = []
+        self.registry: Optional[EmployeeRegistry] = None
+        self.registry_employees: Optional[List[Employee]] = None
+        self.leave_index: Optional[LeaveIndex] = None
+        self.holiday_calendar: Optional[HolidayCalendar] = None
+        self.oncall_resolver: Optional[OnCallResolver] = None
+        self.oncall_index: Optional[OnCallIndex] = None
+        self.sprint_calendar: Optional['SprintCalendar'] = None
+        self.holiday_calendar_entries: Optional[List[LeaveEntry]] = None
+        self.date_parser = LeaveDateParser()
+        self.calendar: Optional[Calendar] = None
+        self.calendar_entries: Optional[List[LeaveEntry]] = None
+
+    def get_registry(self) -> EmployeeRegistry:
+        """Registry over the current employees, rebuilt when the employee list is replaced"""
+        if self.registry is None or self.registry_employees is not self.employees:
+            self.registry = EmployeeRegistry.from_employees(self.employees)
+            self.registry_employees = self.employees
+        return self.registry
+
+    def get_oncall_resolver(self) -> OnCallResolver:
+        """On-call name resolver over the current registry and the configured aliases"""
+        registry = self.get_registry()
+        if self.oncall_resolver is None or self.oncall_resolver.registry is not registry:
+            self.oncall_resolver = OnCallResolver(
+                registry, self.config.get('oncall_aliases', {}))
+        return self.oncall_resolver
+
+    def get_sprint_calendar(self) -> 'SprintCalendar':
+        """Sprint calendar for the configured sprints, rebuilt when the sprint settings change"""
+        first_sprint_start = datetime.strptime(
+            self.config['sprint_start_date'], '%Y-%m-%d').date()
+        if (self.sprint_calendar is None
+                or self.sprint_calendar.first_sprint_start != first_sprint_start
+                or self.sprint_calendar.duration_days != self.config['sprint_duration_days']):
+            self.sprint_calendar = SprintCalendar.from_config(self.config)
+        return self.sprint_calendar
+
+    def get_oncall_index(self, oncall_schedules: List[OnCallSchedule] = None) -> OnCallIndex:
+        """Interval index over on-call rotations, rebuilt when the schedule list is replaced"""
+        if oncall_schedules is None:
+            oncall_schedules = self.oncall_schedules
+        if self.oncall_index is None or self.oncall_index.oncall_schedules is not oncall_schedules:
+            self.oncall_index = OnCallIndex(oncall_schedules)
+        return self.oncall_index
+
+    def get_leave_index(self) -> LeaveIndex:
+        """Per-employee leave index, rebuilt when the leave entry list is replaced"""
+        if self.leave_index is None or self.leave_index.leave_entries is not self.leave_entries:
+            self.leave_index = LeaveIndex(self.leave_entries)
+        return self.leave_index
+
+    def get_holiday_calendar(self) -> HolidayCalendar:
+        """Per-location holiday calendar, rebuilt when the leave entry list is replaced
+
+        After collapse_holidays() it is the calendar collected at ingest.
+        """
+        if self.holiday_calendar is None or self.holiday_calendar_entries is not self.leave_entries:
+            self.holiday_calendar = HolidayCalendar.from_entries(self.leave_entries)
+            self.holiday_calendar_entries = self.leave_entries
+        return self.holiday_calendar
+
+    def set_holiday_calendar(self, holiday_calendar: HolidayCalendar):
+        """Use a holiday calendar collected elsewhere (e.g. a snapshot) with the current leave entries"""
+        self.holiday_calendar = holiday_calendar
+        self.holiday_calendar_entries = self.leave_entries
+
+    def collapse_holidays(self):
+        """Move the per-employee public holiday entries into the per-location holiday calendar"""
+        holiday_calendar = self.get_holiday_calendar()
+        leave_entries = [leave_entry for leave_entry in self.leave_entries
+                         if leave_entry.leave_type != 'public_holiday']
+        logger.info(
+            f"Collapsed {len(self.leave_entries) - len(leave_entries)} public holiday entries into "
+            f"{len(holiday_calendar)} holidays across {len(holiday_calendar.locations)} locations")
+        self.leave_entries = leave_entries
+        self.holiday_calendar_entries = leave_entries
+
+    def get_calendar(self) -> Calendar:
+        """Calendar over the years in the leave data, rebuilt when the leave entry list is replaced
+
+        Holidays come from the per-location holiday calendar.
+        """
+        if self.calendar is None or self.calendar_entries is not self.leave_entries:
+            holiday_calendar = self.get_holiday_calendar()
+            years = holiday_calendar.years()
+            for leave_entry in self.leave_entries:
+                years.update(leave_date.year for leave_date in leave_entry.leave_dates)
+            current_year = datetime.now().year
+            self.calendar = Calendar(min(years, default=current_year),
+                                     max(years, default=current_year),
+                                     holiday_calendar.holidays)
+            self.calendar_entries = self.leave_entries
+        return self.calendar
 
     def load_config(self, config_file: str) -> Dict:
         """Load configuration from JSON file and merge with environment variables"""
@@ -136,6 +1214,15 @@ class SprintCapacityCalculator:
             "sprint_duration_days": 14,
             "excel_file_path": "CapacityUpdate.xlsx",
             "excel_sheet_name": "",  # Optional: specify sheet name, otherwise auto-detect
+            "excel_streaming": False,  # Stream the sheet row by row instead of loading a DataFrame
+            "data_source": "auto",  # auto, xlsx, openpyxl or csv
+            "oncall_csv_path": "",  # Optional: CSV export of the 'On Call Schedules' sheet
+            "parse_cache_enabled": True,  # Reuse parsed workbook data while the file is unchanged
+            "parse_cache_dir": ".capacity_cache",
+            "snapshot_path": "",  # Optional: load parsed data from a .npz snapshot instead of Excel
+            "capacity_engine": "loop",  # loop (one sprint at a time) or matrix (all sprints at once)
+            "oncall_aliases": {},  # On-call schedule name -> emp_id or employee name
+            "forecast_horizon": 2,  # Upcoming sprints to calculate after the current one
             "email_settings": {
                 "smtp_server": "smtp.gmail.com",
                 "smtp_port": 587,
@@ -193,66 +1280,7 @@ class SprintCapacityCalculator:
         - Multiple: 1st, 4th, 15th
         - Range: 16 to 27, 16-27
         """
-        if pd.isna(date_str) or not date_str or str(date_str).strip() == '':
-            return []
-
-        dates = []
-        date_str = str(date_str).strip()
-
-        # First, handle range patterns (e.g., "16 to 27" or "16-27")
-        range_patterns = [
-            # "16 to 27"
-            r'(\d{1,2})(?:st|nd|rd|th)?\s+to\s+(\d{1,2})(?:st|nd|rd|th)?',
-            r'(\d{1,2})(?:st|nd|rd|th)?\s*-\s*(\d{1,2})(?:st|nd|rd|th)?',    # "16-27"
-        ]
-
-        for pattern in range_patterns:
-            range_matches = re.findall(pattern, date_str)
-            for start_str, end_str in range_matches:
-                try:
-                    start_day = int(start_str)
-                    end_day = int(end_str)
-
-                    # Create dates for all days in range
-                    if 1 <= start_day <= 31 and 1 <= end_day <= 31:
-                        for day in range(start_day, end_day + 1):
-                            try:
-                                parsed_date = date(year, month, day)
-                                if parsed_date not in dates:
-                                    dates.append(parsed_date)
-                            except ValueError:
-                                # Invalid date (e.g., Feb 30)
-                                continue
-                except ValueError:
-                    continue
-
-            # Remove the matched ranges from the string to avoid double-processing
-            date_str = re.sub(pattern, '', date_str)
-
-        # Then handle individual dates
-        patterns = [
-            # 1st, 2nd, 3rd, 4th, or just numbers
-            r'(\d{1,2})(?:st|nd|rd|th)?',
-            r'(\d{1,2})',  # Simple numbers
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, date_str)
-            for match in matches:
-                try:
-                    day = int(match)
-                    if 1 <= day <= 31:
-                        try:
-                            parsed_date = date(year, month, day)
-                            if parsed_date not in dates:
-                                dates.append(parsed_date)
-                        except ValueError:
-                            # Invalid date (e.g., Feb 30)
-                            continue
-                except ValueError:
-                    continue
-
-        return sorted(dates)
+        return list(self.date_parser.parse(date_str, month, year))
 
     def format_dates_as_ranges(self, dates: List[date]) -> str:
         """Format a list of dates as ranges where possible
@@ -266,6 +1294,7 @@ class SprintCapacityCalculator:
         if not dates:
             return ""
 
+        calendar = self.get_calendar()
         sorted_dates = sorted(dates)
         ranges = []
         range_start = sorted_dates[0]
@@ -281,20 +1310,20 @@ class SprintCapacityCalculator:
                 # Range is broken, save the current range and start a new one
                 if range_start == range_end:
                     # Single date
-                    ranges.append(range_start.strftime("%b %d"))
+                    ranges.append(calendar.label(range_start))
                 else:
                     # Date range
                     ranges.append(
-                        f"{range_start.strftime('%b %d')}-{range_end.strftime('%d')}")
+                        f"{calendar.label(range_start)}-{range_end.day:02d}")
                 range_start = current_date
                 range_end = current_date
 
         # Don't forget the last range
         if range_start == range_end:
-            ranges.append(range_start.strftime("%b %d"))
+            ranges.append(calendar.label(range_start))
         else:
             ranges.append(
-                f"{range_start.strftime('%b %d')}-{range_end.strftime('%d')}")
+                f"{calendar.label(range_start)}-{range_end.day:02d}")
 
         return ", ".join(ranges)
 
@@ -303,14 +1332,8 @@ class SprintCapacityCalculator:
         current_year = datetime.now().year
 
         # Extract month from column name
-        month_mapping = {
-            'january': 1, 'february': 2, 'march': 3, 'april': 4,
-            'may': 5, 'june': 6, 'july': 7, 'august': 8,
-            'september': 9, 'october': 10, 'november': 11, 'december': 12
-        }
-
         column_lower = column_name.lower()
-        for month_name, month_num in month_mapping.items():
+        for month_name, month_num in COLUMN_MONTH_MAPPING.items():
             if month_name in column_lower:
                 return month_num, current_year
 
@@ -318,324 +1341,1008 @@ class SprintCapacityCalculator:
         return datetime.now().month, current_year
 
 
+class WorkbookSession:
+    """Single open handle on an Excel workbook shared by all sheet readers
+
+    The workbook is opened once and every sheet that is requested is parsed
+    once and kept for the lifetime of the session, so the year sheet and the
+    'On Call Schedules' sheet are both read from the same handle.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._excel_file: Optional[pd.ExcelFile] = None
+        self._sheets: Dict[str, pd.DataFrame] = {}
+
+    def __enter__(self) -> 'WorkbookSession':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def excel_file(self) -> pd.ExcelFile:
+        """Open the workbook on first use"""
+        if self._excel_file is None:
+            self._excel_file = pd.ExcelFile(self.file_path)
+            logger.info(f"Opened workbook: {self.file_path}")
+        return self._excel_file
+
+    @property
+    def book(self):
+        """Underlying read-only openpyxl workbook"""
+        return self.excel_file.book
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """Names of all sheets in the workbook"""
+        return self.excel_file.sheet_names
+
+    def has_sheet(self, sheet_name: str) -> bool:
+        """Check if the workbook contains a sheet"""
+        return sheet_name in self.sheet_names
+
+    def read_sheet(self, sheet_name: str) -> pd.DataFrame:
+        """Read a sheet, parsing it only the first time it is requested"""
+        if sheet_name not in self._sheets:
+            self._sheets[sheet_name] = pd.read_excel(
+                self.excel_file, sheet_name=sheet_name)
+        return self._sheets[sheet_name]
+
+    def iter_rows(self, sheet_name: str) -> Iterator[List]:
+        """Stream a sheet's rows from the read-only workbook without building a DataFrame
+
+        Cells are converted the way pandas reads them: empty cells, error cells and
+        the default NA strings become NaN and integral numbers become ints.
+        """
+        worksheet = self.book[sheet_name]
+        if hasattr(worksheet, 'reset_dimensions'):
+            # Read-only sheets can report stale dimensions
+            worksheet.reset_dimensions()
+
+        for row in worksheet.iter_rows():
+            yield [self._convert_cell(cell) for cell in row]
+
+    @staticmethod
+    def _convert_cell(cell):
+        """Convert an openpyxl cell to the value pandas would hold for it"""
+        value = cell.value
+        if value is None or cell.data_type == 'e':
+            return np.nan
+        if cell.data_type == 'n' and not isinstance(value, (bool, datetime)):
+            int_value = int(value)
+            return int_value if int_value == value else float(value)
+        if isinstance(value, str) and value in EXCEL_NA_VALUES:
+            return np.nan
+        return value
+
+    def close(self):
+        """Release the workbook handle and cached sheets"""
+        if self._excel_file is not None:
+            self._excel_file.close()
+            self._excel_file = None
+        self._sheets.clear()
+
+
+class OpenpyxlWorkbookSession(WorkbookSession):
+    """Workbook session that reads sheets with openpyxl's read-only reader directly
+
+    Sheets are built from the streamed rows rather than through pd.read_excel, so
+    no ExcelFile wrapper is created; column types are inferred the same way.
+    """
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        self._book = None
+
+    @property
+    def book(self):
+        """Open the workbook read-only on first use"""
+        if self._book is None:
+            self._book = openpyxl.load_workbook(
+                self.file_path, read_only=True, data_only=True, keep_links=False)
+            logger.info(f"Opened workbook (read-only): {self.file_path}")
+        return self._book
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """Names of all sheets in the workbook"""
+        return self.book.sheetnames
+
+    def read_sheet(self, sheet_name: str) -> pd.DataFrame:
+        """Read a sheet from its streamed rows, parsing it only the first time it is requested"""
+        if sheet_name not in self._sheets:
+            rows = []
+            width = 0
+            last_row = 0
+            for row in self.iter_rows(sheet_name):
+                while row and pd.isna(row[-1]):
+                    row.pop()
+                if row:
+                    last_row = len(rows) + 1
+                    width = max(width, len(row))
+                rows.append(row)
+            rows = rows[:last_row]
+            for row in rows:
+                row.extend([np.nan] * (width - len(row)))
+
+            if rows:
+                self._sheets[sheet_name] = TextParser(rows, header=0).read()
+            else:
+                self._sheets[sheet_name] = pd.DataFrame()
+        return self._sheets[sheet_name]
+
+    def close(self):
+        """Release the workbook handle and cached sheets"""
+        if self._book is not None:
+            self._book.close()
+            self._book = None
+        self._sheets.clear()
+
+
+class CsvWorkbookSession(WorkbookSession):
+    """Workbook session over CSV/TSV exports of the year sheet and 'On Call Schedules' sheet
+
+    Each export is one sheet of the workbook; .tsv files are tab separated. Cells are
+    typed the way pandas reads the xlsx: numbers become ints or floats, empty cells
+    and NA strings become NaN and ISO timestamps become datetimes.
+    """
+
+    ONCALL_SHEET_NAME = 'On Call Schedules'
+
+    def __init__(self, file_path: str, sheet_name: str = None,
+                 oncall_file_path: str = None):
+        super().__init__(file_path)
+        self.sheet_files = {sheet_name or Path(file_path).stem: file_path}
+        if oncall_file_path:
+            self.sheet_files[self.ONCALL_SHEET_NAME] = oncall_file_path
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """Names of the exported sheets"""
+        return list(self.sheet_files)
+
+    @staticmethod
+    def delimiter(file_path: str) -> str:
+        """Field delimiter for an export file"""
+        return '\t' if file_path.lower().endswith('.tsv') else ','
+
+    def read_sheet(self, sheet_name: str) -> pd.DataFrame:
+        """Read an export, parsing it only the first time it is requested"""
+        if sheet_name not in self._sheets:
+            file_path = self.sheet_files[sheet_name]
+            df = pd.read_csv(file_path, sep=self.delimiter(file_path),
+                             encoding='utf-8-sig')
+            logger.info(f"Read CSV export: {file_path}")
+
+            # Timestamps are written as text; restore them as the xlsx reader returns them
+            df.columns = [
+                datetime.fromisoformat(col) if isinstance(col, str)
+                and CSV_TIMESTAMP_PATTERN.fullmatch(col) else col
+                for col in df.columns
+            ]
+            for col in df.columns:
+                if pd.api.types.is_string_dtype(df[col]):
+                    is_timestamp = df[col].str.fullmatch(
+                        CSV_TIMESTAMP_PATTERN, na=False)
+                    if is_timestamp.any():
+                        df[col] = df[col].astype(object)
+                        df.loc[is_timestamp, col] = df.loc[is_timestamp, col].map(
+                            datetime.fromisoformat)
+            self._sheets[sheet_name] = df
+        return self._sheets[sheet_name]
+
+    def iter_rows(self, sheet_name: str) -> Iterator[List]:
+        """Stream an export's rows, converting each cell like the xlsx row reader does"""
+        file_path = self.sheet_files[sheet_name]
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            for row in csv.reader(f, delimiter=self.delimiter(file_path)):
+                yield [self._convert_text(value) for value in row]
+
+    @staticmethod
+    def _convert_text(value: str):
+        """Convert exported cell text to the value the xlsx reader would hold for it"""
+        if value in EXCEL_NA_VALUES:
+            return np.nan
+        if CSV_NUMBER_PATTERN.fullmatch(value):
+            number = float(value)
+            int_value = int(number) if np.isfinite(number) else None
+            return int_value if int_value == number else number
+        if CSV_TIMESTAMP_PATTERN.fullmatch(value):
+            return datetime.fromisoformat(value)
+        return value
+
+    def close(self):
+        """Release cached sheets"""
+        self._sheets.clear()
+
+
 class ExcelDataParser:
     """Parser for Excel capacity data"""
 
     def __init__(self, calculator: SprintCapacityCalculator):
         self.calculator = calculator
+        # (employees, leave entries) of each month section from the last parse, by fingerprint
+        self.section_results: Dict[str, Tuple[List[Employee], List[LeaveEntry]]] = {}
+        # Employees of the last parse
+        self.registry = EmployeeRegistry()
+        # Counters and timings of the last parse
+        self.stats = IngestionStats()
+
+    def open_session(self, file_path: str) -> WorkbookSession:
+        """Open the leave data source selected by the 'data_source' config key
 
-    def parse_excel_file(self, file_path: str) -> Tuple[List[Employee], List[LeaveEntry]]:
+        'auto' reads .csv/.tsv exports as CSV and everything else as xlsx.
+        """
+        data_source = self.calculator.config.get('data_source', 'auto') or 'auto'
+        if data_source not in DATA_SOURCES:
+            raise ValueError(
+                f"Unknown data source '{data_source}', expected one of {DATA_SOURCES}")
+        if data_source == 'auto':
+            is_csv = file_path.lower().endswith(('.csv', '.tsv'))
+            data_source = 'csv' if is_csv else 'xlsx'
+
+        if data_source == 'csv':
+            return CsvWorkbookSession(
+                file_path,
+                sheet_name=self.calculator.config.get('excel_sheet_name') or None,
+                oncall_file_path=self.calculator.config.get('oncall_csv_path') or None)
+        if data_source == 'openpyxl':
+            return OpenpyxlWorkbookSession(file_path)
+        return WorkbookSession(file_path)
+
+    def parse_excel_file(self, file_path: str, session: WorkbookSession = None,
+                         previous_sections: Dict = None) -> Tuple[List[Employee], List[LeaveEntry]]:
         """Parse Excel file and extract employee and leave data
 
         This parser handles Excel files where data is organized by month in row groups.
         Each month section starts with a header row containing month names in column headers.
         Automatically detects and uses the current year's sheet.
+        Pass an open WorkbookSession to reuse its handle instead of reopening the file, and
+        the section_results of an earlier parse as previous_sections to skip re-parsing
+        month sections that have not changed.
         """
-        try:
-            # Get current year
-            current_year = datetime.now().year
+        owns_session = session is None
+        if owns_session:
+            session = self.open_session(file_path)
 
-            # Read Excel file and get all sheet names
-            excel_file = pd.ExcelFile(file_path)
-            sheet_names = excel_file.sheet_names
-            logger.info(f"Available sheets in Excel file: {sheet_names}")
-
-            # Check if sheet name is specified in config
-            sheet_name = None
-            config_sheet_name = self.calculator.config.get(
-                'excel_sheet_name', None)
-
-            if config_sheet_name:
-                # Use sheet name from config if specified
-                if config_sheet_name in sheet_names:
-                    sheet_name = config_sheet_name
-                    logger.info(f"Using sheet from config: {sheet_name}")
-                else:
-                    logger.warning(
-                        f"Configured sheet '{config_sheet_name}' not found in {sheet_names}")
-
-            # If no config sheet or not found, try to find sheet with current year name
-            if not sheet_name:
-                if str(current_year) in sheet_names:
-                    sheet_name = str(current_year)
-                    logger.info(f"Using sheet for current year: {sheet_name}")
-                else:
-                    # Fallback to first sheet if current year sheet not found
-                    sheet_name = sheet_names[0] if sheet_names else None
-                    logger.warning(
-                        f"Sheet '{current_year}' not found. Using default sheet: {sheet_name}")
-
-            if not sheet_name:
-                raise ValueError("No sheets found in Excel file")
+        try:
+            sheet_name = self.select_sheet(session.sheet_names)
+            self.stats = IngestionStats(file_path=file_path, sheet_name=sheet_name)
+            sheet_start = time.perf_counter()
 
             # Read the specific sheet
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
+            df = session.read_sheet(sheet_name)
+            self.stats.stage_seconds['read sheet'] = time.perf_counter() - sheet_start
             logger.info(
                 f"Successfully loaded Excel file: {file_path}, Sheet: {sheet_name}")
             logger.info(f"Data shape: {df.shape}")
 
-            # Detect the correct column name for Employee ID
-            # Different sheets may use different column names
-            emp_id_column = None
-            emp_name_column = None
-            location_column = None
-
             # Check first row for actual headers
-            first_row = df.iloc[0] if len(df) > 0 else None
-            if first_row is not None:
-                for col in df.columns:
-                    cell_value = str(first_row[col]).strip(
-                    ) if not pd.isna(first_row[col]) else ''
-                    if cell_value == 'Emp Id':
-                        emp_id_column = col
-                    elif cell_value == 'Emp Name':
-                        emp_name_column = col
-                    elif cell_value == 'Location':
-                        location_column = col
-
-            # If not found in first row, check column names directly
-            if emp_id_column is None:
-                if 'Emp Id' in df.columns:
-                    emp_id_column = 'Emp Id'
-                else:
-                    # Use first column as fallback
-                    emp_id_column = df.columns[0]
-                    logger.info(
-                        f"Using first column as Emp Id column: {emp_id_column}")
+            first_row = list(df.iloc[0]) if len(df) > 0 else None
+            emp_id_column, emp_name_column, location_column = self.detect_columns(
+                list(df.columns), first_row)
+            logger.info(
+                f"Detected columns - Emp Id: {emp_id_column}, Emp Name: {emp_name_column}, Location: {location_column}")
 
-            if emp_name_column is None:
-                if 'Emp Name' in df.columns:
-                    emp_name_column = 'Emp Name'
-                else:
-                    # Use second column as fallback
-                    emp_name_column = df.columns[1] if len(
-                        df.columns) > 1 else None
-                    logger.info(
-                        f"Using second column as Emp Name column: {emp_name_column}")
+            # Classify rows once with column masks, then extract leave only
+            # from the employee rows
+            stage_start = time.perf_counter()
+            segmentation = self.segment_month_sections(df, emp_id_column)
+            self.stats.stage_seconds['segment rows'] = time.perf_counter() - stage_start
 
-            if location_column is None:
-                if 'Location' in df.columns:
-                    location_column = 'Location'
+            stage_start = time.perf_counter()
+            employees, leave_entries = self.extract_leave_entries(
+                df, segmentation, emp_id_column, emp_name_column, location_column,
+                previous_sections)
+            self.stats.stage_seconds['extract leave'] = time.perf_counter() - stage_start
+            self.stats.sheet_seconds[sheet_name] = time.perf_counter() - sheet_start
 
+            # Return all leave entries (both past and future)
+            # This allows users to see complete leave history in reports
             logger.info(
-                f"Detected columns - Emp Id: {emp_id_column}, Emp Name: {emp_name_column}, Location: {location_column}")
-
-            employees = []
-            leave_entries = []
+                f"Parsed {len(employees)} employees and {len(leave_entries)} total leave entries")
+            self.log_stats()
+            return employees, leave_entries
 
-            # Parse the multi-month structure
-            current_month = None
-            current_year = datetime.now().year
+        except Exception as e:
+            logger.error(f"Error parsing Excel file: {e}")
+            raise
+        finally:
+            if owns_session:
+                session.close()
 
-            # Map column names to their actual headers from the first header row
-            column_headers = {}
+    def parse_excel_file_streaming(self, file_path: str,
+                                   session: WorkbookSession = None) -> Tuple[List[Employee], List[LeaveEntry]]:
+        """Parse the year sheet in streaming mode, one month section at a time
 
-            for idx, row in df.iterrows():
-                emp_id_val = str(row[emp_id_column]).strip(
-                ) if not pd.isna(row[emp_id_column]) else ''
-
-                # Check if this is a month separator row
-                # These rows have "Finance Systems" or similar in the first column and a month name in the third column
-                month_col = df.columns[2]  # Third column
-                month_val_str = str(row[month_col]).strip(
-                ) if not pd.isna(row[month_col]) else ''
-
-                month_mapping = {
-                    'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3,
-                    'apr': 4, 'april': 4, 'may': 5, 'june': 6, 'jul': 7, 'july': 7,
-                    'aug': 8, 'august': 8, 'sep': 9, 'september': 9, 'oct': 10, 'october': 10,
-                    'nov': 11, 'november': 11, 'dec': 12, 'december': 12
-                }
+        Produces the same employees and leave entries as parse_excel_file without
+        materializing the sheet as a DataFrame.
+        """
+        registry = EmployeeRegistry()
+        leave_entries = []
+
+        for section_employees, section_entries in self.iter_leave_sections(file_path, session):
+            self._merge_section(registry, section_employees,
+                                section_entries, leave_entries)
+
+        self.registry = registry
+        employees = registry.employees
+
+        logger.info(
+            f"Streamed {len(employees)} employees and {len(leave_entries)} total leave entries")
+        self.log_stats()
+        return employees, leave_entries
+
+    def log_stats(self):
+        """Log a one-line summary of the last parse's counters"""
+        stats = self.stats
+        logger.info(
+            f"Ingestion stats: {stats.rows_scanned} rows scanned, {stats.header_rows} header, "
+            f"{stats.separator_rows} separator, {stats.employee_rows} employee rows, "
+            f"{stats.cells_inspected} cells inspected, {stats.date_strings_parsed} date strings parsed, "
+            f"{stats.parse_failures} parse failures in {sum(stats.sheet_seconds.values()):.3f}s")
+
+    def iter_leave_sections(self, file_path: str, session: WorkbookSession = None
+                            ) -> Iterator[Tuple[List[Employee], List[LeaveEntry]]]:
+        """Yield (employees, leave entries) for each month section of the year sheet
+
+        Rows come from openpyxl's read-only row iterator and are classified one at a
+        time with the same rules as segment_month_sections, so peak memory is bounded
+        by one month block rather than the whole sheet. Unlike pandas, which types a
+        column from all of its cells, each cell keeps its own type here; a column
+        holding only numbers therefore yields '16' rather than '16.0' descriptions.
+        """
+        owns_session = session is None
+        if owns_session:
+            session = self.open_session(file_path)
 
-                # Check if this row is a month separator (has month name in third column)
+        try:
+            sheet_name = self.select_sheet(session.sheet_names)
+            logger.info(
+                f"Streaming Excel file: {file_path}, Sheet: {sheet_name}")
+            stats = self.stats = IngestionStats(file_path=file_path, sheet_name=sheet_name)
+            sheet_start = section_start = time.perf_counter()
+            section_rows = 0
+
+            rows = session.iter_rows(sheet_name)
+            header = next(rows, None)
+            if header is None:
+                return
+            while header and pd.isna(header[-1]):
+                header.pop()
+            columns = self._header_names(header)
+
+            first_row = next(rows, None)
+            if first_row is not None:
+                self._widen_row(first_row, columns)
+                rows = itertools.chain([first_row], rows)
+            emp_id_column, emp_name_column, location_column = self.detect_columns(
+                columns, first_row)
+            positions = self._column_positions(
+                columns, emp_id_column, emp_name_column, location_column)
+            emp_id_pos = positions[0]
+
+            now = datetime.now()
+            current_month = None
+            current_year = now.year
+            column_headers = {}
+            layout = None
+            section_registry = EmployeeRegistry()
+            section_entries = []
+
+            for row in rows:
+                stats.rows_scanned += 1
+                if self._widen_row(row, columns):
+                    layout = None
+                emp_id_val = str(row[emp_id_pos]).strip(
+                ) if not pd.isna(row[emp_id_pos]) else ''
+                month_val = row[2]
+                month_val_str = str(month_val).strip(
+                ) if not pd.isna(month_val) else ''
+                is_boundary = False
+
+                # Month separator row: month name in the third column
                 if emp_id_val in ['Finance Systems', 'Emp Id'] or emp_id_val == '':
-                    for month_name, month_num in month_mapping.items():
-                        if month_name == month_val_str.lower():
-                            current_month = month_num
-                            # Keep the current year or infer it
-                            if current_month < datetime.now().month:
-                                current_year = datetime.now().year + 1
-                            else:
-                                current_year = datetime.now().year
-                            logger.info(
-                                f"Found month separator: {month_name.title()} {current_year} (month {month_num})")
-                            break
+                    month_num = SHEET_MONTH_MAPPING.get(month_val_str.lower())
+                    if month_num:
+                        current_month = month_num
+                        current_year = now.year + 1 if month_num < now.month else now.year
+                        logger.info(
+                            f"Found month separator: {month_val_str.title()} {current_year} (month {month_num})")
+                        is_boundary = True
 
-                # Check if this is a month header row
-                # Header rows have 'Emp Id' in the Emp Id column
                 if emp_id_val == 'Emp Id':
-                    # Map column names to their actual header values
-                    for col in df.columns:
-                        header_val = str(row[col]).strip(
-                        ) if not pd.isna(row[col]) else ''
+                    # Month header row: remap columns to their header values
+                    for col, value in zip(columns, row):
+                        header_val = str(value).strip() if not pd.isna(value) else ''
                         if header_val and header_val not in ['Emp Id', 'Emp Name']:
                             column_headers[col] = header_val
-
-                    # Extract month from the third column (which contains month name)
-                    month_header = str(row[month_col]).strip(
-                    ) if not pd.isna(row[month_col]) else ''
-
-                    # Determine month from header if not already set by separator
-                    if 'planned' not in month_header.lower():
-                        for month_name, month_num in month_mapping.items():
-                            if month_name in month_header.lower():
-                                current_month = month_num
-
-                                # Extract year from header if present (e.g., "2026 January")
-                                import re
-                                year_match = re.search(
-                                    r'(20\d{2})', month_header)
-                                if year_match:
-                                    current_year = int(year_match.group(1))
-                                else:
-                                    # If no year in header, infer based on month
-                                    # If month is earlier than current month, assume next year
-                                    if current_month < datetime.now().month:
-                                        current_year = datetime.now().year + 1
-                                    else:
-                                        current_year = datetime.now().year
-
-                                logger.info(
-                                    f"Found month section: {month_name.title()} {current_year} (month {month_num})")
-                                break
-
-                    continue  # Skip header row
-
-                # Check if this row is a month separator (has datetime in planned leave column)
-                month_val = row[month_col]
-                if pd.notna(month_val) and isinstance(month_val, datetime):
-                    # Only use datetime if we haven't already detected month from string
+                    layout = None
+
+                    month_year = self._month_from_header(month_val_str, now)
+                    if month_year:
+                        current_month, current_year = month_year
+                    is_boundary = True
+                elif not pd.isna(month_val) and isinstance(month_val, datetime):
+                    # Datetime separator row
                     if current_month is None:
                         current_month = month_val.month
                         current_year = month_val.year
                         logger.info(
                             f"Found month section from datetime: {month_val.strftime('%B %Y')} (month {current_month})")
+                    is_boundary = True
+
+                if is_boundary:
+                    if emp_id_val == 'Emp Id':
+                        stats.header_rows += 1
+                    else:
+                        stats.separator_rows += 1
+                    if len(section_registry):
+                        self._record_section(
+                            section_registry, section_entries, section_rows, section_month, section_start)
+                        yield section_registry.employees, section_entries
+                        section_registry = EmployeeRegistry()
+                        section_entries = []
+                        section_rows = 0
+                        section_start = time.perf_counter()
                     continue
 
                 # Skip rows without valid employee ID
-                if not emp_id_val or not emp_id_val.isdigit():
+                if not emp_id_val.isdigit():
                     continue
 
-                # If we haven't found a month yet, try to extract from column names
                 if current_month is None:
-                    for col in df.columns:
-                        # Handle datetime columns
-                        if isinstance(col, datetime):
-                            current_month = col.month
-                            current_year = col.year
-                            logger.info(
-                                f"Inferred month from datetime column: {col.strftime('%B %Y')} (month {current_month})")
-                            break
-
-                        # Handle string columns
-                        col_str = str(col)
-                        month_mapping = {
-                            'january': 1, 'february': 2, 'march': 3, 'april': 4,
-                            'may': 5, 'june': 6, 'july': 7, 'august': 8,
-                            'september': 9, 'october': 10, 'november': 11, 'december': 12
-                        }
-                        for month_name, month_num in month_mapping.items():
-                            if month_name in col_str.lower():
-                                current_month = month_num
-                                logger.info(
-                                    f"Inferred month from column: {month_name.title()} (month {month_num})")
-                                break
-                        if current_month:
-                            break
-
-                # Create employee
-                emp_name_val = ''
-                if emp_name_column:
-                    emp_name_val = str(row[emp_name_column]).strip() if not pd.isna(
-                        row[emp_name_column]) else ''
-
-                # Get location if available
-                location_val = 'GCC'  # Default to GCC
-                if location_column and location_column in row.index:
-                    location_str = str(row[location_column]).strip() if not pd.isna(
-                        row[location_column]) else ''
-                    if location_str in ['US', 'GCC']:
-                        location_val = location_str
-
-                employee = Employee(
-                    emp_id=emp_id_val,
-                    name=emp_name_val,
-                    location=location_val
-                )
+                    month_year = self._month_from_columns(columns, now)
+                    if month_year:
+                        current_month, current_year = month_year
+
+                if layout is None:
+                    layout = self._leave_column_layout(
+                        columns, column_headers, emp_id_column, emp_name_column)
+
+                stats.employee_rows += 1
+                section_rows += 1
+                section_month = (current_month or now.month, current_year)
+                employee, row_entries = self._employee_row_entries(
+                    row, section_month[0], section_month[1], positions, layout,
+                    section_registry)
+                section_entries.extend(row_entries)
+
+            if len(section_registry):
+                self._record_section(
+                    section_registry, section_entries, section_rows, section_month, section_start)
+                yield section_registry.employees, section_entries
+            stats.sheet_seconds[sheet_name] = time.perf_counter() - sheet_start
 
-                if employee not in employees:
-                    employees.append(employee)
-
-                # Process leave columns for this employee
-                # Skip the ID and Name columns
-                skip_columns = [emp_id_column, emp_name_column] if emp_name_column else [
-                    emp_id_column]
-                # Add any other columns to skip
-                skip_columns.extend(['Unnamed: 5'])
-
-                # Find the "Opting?" column to check if optional holidays are opted
-                opting_column = None
-                for col in df.columns:
-                    header_val = column_headers.get(col, str(col))
-                    if 'opting' in str(header_val).lower():
-                        opting_column = col
-                        break
-
-                # Get the opting value for this employee
-                is_opting_optional_holiday = False
-                if opting_column is not None:
-                    opting_value = str(row[opting_column]).strip(
-                    ).lower() if not pd.isna(row[opting_column]) else ''
-                    is_opting_optional_holiday = opting_value in [
-                        'yes', 'y', 'true']
-
-                for col in df.columns:
-                    if col in skip_columns:
-                        continue
+        except Exception as e:
+            logger.error(f"Error streaming Excel file: {e}")
+            raise
+        finally:
+            if owns_session:
+                session.close()
+
+    def _record_section(self, section_registry: EmployeeRegistry, section_entries: List[LeaveEntry],
+                        rows: int, month_year: Tuple[int, int], section_start: float):
+        """Add a streamed month section to the parse stats"""
+        month, year = month_year
+        self.stats.sections.append(SectionStats(
+            label=f"{len(self.stats.sections) + 1}. {date(year, month, 1).strftime('%b %Y')}",
+            rows=rows,
+            employees=len(section_registry),
+            leave_entries=len(section_entries),
+            seconds=time.perf_counter() - section_start
+        ))
+
+    @staticmethod
+    def _header_names(header: List) -> List:
+        """Column names pandas would give a header row ('Unnamed: n', 'X.1' for repeats)"""
+        columns = []
+        seen = {}
+        for pos, value in enumerate(header):
+            name = f"Unnamed: {pos}" if pd.isna(value) else value
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            columns.append(name)
+        return columns
 
-                    leave_value = row[col]
-                    if pd.isna(leave_value) or str(leave_value).strip() == '':
-                        continue
+    @staticmethod
+    def _widen_row(row: List, columns: List) -> bool:
+        """Pad a row to the known width, adding unnamed columns for longer rows
 
-                    # Skip if this looks like a header value
-                    leave_value_str = str(leave_value).strip()
-                    if leave_value_str in ['Public Holiday', 'Optional Holiday', 'Planned Leave', 'Holiday', 'Opting?', 'GCC Holiday', 'NA', 'No', 'Yes']:
-                        continue
+        Returns True when new columns were added.
+        """
+        while row and len(row) > len(columns) and pd.isna(row[-1]):
+            row.pop()
+        added = len(row) > len(columns)
+        for pos in range(len(columns), len(row)):
+            columns.append(f"Unnamed: {pos}")
+        row.extend([np.nan] * (len(columns) - len(row)))
+        return added
+
+    def select_sheet(self, sheet_names: List[str]) -> str:
+        """Pick the configured sheet, else the current year's sheet, else the first sheet"""
+        # Get current year
+        current_year = datetime.now().year
+        logger.info(f"Available sheets in Excel file: {sheet_names}")
+
+        # Check if sheet name is specified in config
+        sheet_name = None
+        config_sheet_name = self.calculator.config.get(
+            'excel_sheet_name', None)
+
+        if config_sheet_name:
+            # Use sheet name from config if specified
+            if config_sheet_name in sheet_names:
+                sheet_name = config_sheet_name
+                logger.info(f"Using sheet from config: {sheet_name}")
+            else:
+                logger.warning(
+                    f"Configured sheet '{config_sheet_name}' not found in {sheet_names}")
+
+        # If no config sheet or not found, try to find sheet with current year name
+        if not sheet_name:
+            if str(current_year) in sheet_names:
+                sheet_name = str(current_year)
+                logger.info(f"Using sheet for current year: {sheet_name}")
+            else:
+                # Fallback to first sheet if current year sheet not found
+                sheet_name = sheet_names[0] if sheet_names else None
+                logger.warning(
+                    f"Sheet '{current_year}' not found. Using default sheet: {sheet_name}")
 
-                    # Determine leave type using the actual header value if available
-                    header_name = column_headers.get(col, col)
-                    leave_type = self.determine_leave_type(header_name)
+        if not sheet_name:
+            raise ValueError("No sheets found in Excel file")
+        return sheet_name
 
-                    # Skip optional holidays if employee is not opting for them
-                    if leave_type == 'optional_holiday' and not is_opting_optional_holiday:
-                        continue
+    def detect_columns(self, columns: List, first_row: Optional[List] = None) -> Tuple:
+        """Detect the Emp Id, Emp Name and Location columns
 
-                    # Use current month context
-                    month = current_month if current_month else datetime.now().month
-                    year = current_year
+        Different sheets may use different column names, so the first data row is
+        checked for the real headers before falling back to the column names.
+        """
+        emp_id_column = None
+        emp_name_column = None
+        location_column = None
+
+        if first_row is not None:
+            for col, value in zip(columns, first_row):
+                cell_value = str(value).strip() if not pd.isna(value) else ''
+                if cell_value == 'Emp Id':
+                    emp_id_column = col
+                elif cell_value == 'Emp Name':
+                    emp_name_column = col
+                elif cell_value == 'Location':
+                    location_column = col
+
+        # If not found in first row, check column names directly
+        if emp_id_column is None:
+            if 'Emp Id' in columns:
+                emp_id_column = 'Emp Id'
+            else:
+                # Use first column as fallback
+                emp_id_column = columns[0]
+                logger.info(
+                    f"Using first column as Emp Id column: {emp_id_column}")
 
-                    # Parse dates
-                    leave_dates = self.calculator.parse_date_string(
-                        leave_value_str, month, year)
+        if emp_name_column is None:
+            if 'Emp Name' in columns:
+                emp_name_column = 'Emp Name'
+            else:
+                # Use second column as fallback
+                emp_name_column = columns[1] if len(columns) > 1 else None
+                logger.info(
+                    f"Using second column as Emp Name column: {emp_name_column}")
 
-                    if leave_dates:
-                        leave_entry = LeaveEntry(
-                            employee=employee,
-                            leave_dates=leave_dates,
-                            leave_type=leave_type,
-                            description=leave_value_str
-                        )
-                        leave_entries.append(leave_entry)
+        if location_column is None:
+            if 'Location' in columns:
+                location_column = 'Location'
 
-            # Return all leave entries (both past and future)
-            # This allows users to see complete leave history in reports
+        logger.info(
+            f"Detected columns - Emp Id: {emp_id_column}, Emp Name: {emp_name_column}, Location: {location_column}")
+        return emp_id_column, emp_name_column, location_column
+
+    def segment_month_sections(self, df: pd.DataFrame, emp_id_column) -> SheetSegmentation:
+        """Classify the rows of a year sheet and attach month context to employee rows
+
+        Header rows ('Emp Id'), month separator rows (month name in the third column)
+        and datetime separator rows are detected with boolean masks. The month and
+        year each of them introduces is forward-filled onto the employee rows below.
+        """
+        now = datetime.now()
+        row_count = len(df)
+        month_col = df.columns[2]  # Third column holds the month name
+
+        emp_ids = self._cell_strings(df[emp_id_column])
+        month_values = df[month_col].reset_index(drop=True)
+        month_strs = self._cell_strings(month_values)
+        month_lower = month_strs.str.lower()
+
+        header_mask = emp_ids == 'Emp Id'
+        separator_mask = emp_ids.isin(['Finance Systems', 'Emp Id']) | (emp_ids == '')
+        datetime_mask = month_values.notna() & month_values.map(
+            lambda value: isinstance(value, datetime)) & ~header_mask
+        employee_mask = ~header_mask & ~datetime_mask & emp_ids.str.isdigit()
+
+        event_month = pd.Series(np.nan, index=emp_ids.index)
+        event_year = pd.Series(np.nan, index=emp_ids.index)
+
+        # Month separator rows: exact month name in the third column
+        separator_months = month_lower.map(SHEET_MONTH_MAPPING).where(separator_mask)
+        separator_rows = separator_months.notna()
+        event_month[separator_rows] = separator_months[separator_rows]
+        event_year[separator_rows] = np.where(
+            separator_months[separator_rows] < now.month, now.year + 1, now.year)
+        for pos in np.flatnonzero(separator_rows.to_numpy()):
             logger.info(
-                f"Parsed {len(employees)} employees and {len(leave_entries)} total leave entries")
-            return employees, leave_entries
+                f"Found month separator: {month_strs.iat[pos].title()} {int(event_year.iat[pos])} (month {int(event_month.iat[pos])})")
+
+        # Month header rows: month name (and optional year) in the header text
+        header_positions = np.flatnonzero(header_mask.to_numpy())
+        for pos in header_positions:
+            month_year = self._month_from_header(month_strs.iat[pos], now)
+            if month_year:
+                event_month.iat[pos], event_year.iat[pos] = month_year
+        structural_mask = header_mask | separator_rows | datetime_mask
+
+        # A datetime separator or the column names only set the month when no
+        # month has been seen yet, so at most one of them applies
+        first_event = event_month.first_valid_index()
+        candidates = []
+        if datetime_mask.any():
+            dt_pos = int(np.flatnonzero(datetime_mask.to_numpy())[0])
+            dt_value = month_values.iat[dt_pos]
+            candidates.append((dt_pos, dt_value.month, dt_value.year))
+        if employee_mask.any():
+            column_month_year = self._month_from_columns(df.columns, now)
+            if column_month_year:
+                emp_pos = int(np.flatnonzero(employee_mask.to_numpy())[0])
+                candidates.append((emp_pos,) + column_month_year)
+        if candidates:
+            pos, month, year = min(candidates)
+            if first_event is None or pos < first_event:
+                event_month.iat[pos] = month
+                event_year.iat[pos] = year
+                if datetime_mask.iat[pos]:
+                    logger.info(
+                        f"Found month section from datetime: {date(year, month, 1).strftime('%B %Y')} (month {month})")
+
+        months = event_month.ffill().fillna(now.month).astype(int)
+        years = event_year.ffill().fillna(now.year).astype(int)
+
+        employee_rows = pd.DataFrame({
+            'month': months[employee_mask],
+            'year': years[employee_mask],
+            'section': structural_mask.cumsum()[employee_mask],
+            'header_epoch': header_mask.cumsum()[employee_mask],
+        })
+
+        # Header mappings accumulate: each 'Emp Id' row overrides the columns it names
+        column_headers = [{}]
+        for pos in header_positions:
+            headers = dict(column_headers[-1])
+            for col, value in zip(df.columns, df.iloc[pos]):
+                header_val = str(value).strip() if not pd.isna(value) else ''
+                if header_val and header_val not in ['Emp Id', 'Emp Name']:
+                    headers[col] = header_val
+            column_headers.append(headers)
+
+        self.stats.rows_scanned = row_count
+        self.stats.header_rows = int(header_mask.sum())
+        self.stats.separator_rows = int((structural_mask & ~header_mask).sum())
+        self.stats.employee_rows = int(employee_mask.sum())
+
+        logger.info(
+            f"Segmented {row_count} rows: {int(header_mask.sum())} header, "
+            f"{int(separator_rows.sum())} month separator, {int(datetime_mask.sum())} datetime separator, "
+            f"{int(employee_mask.sum())} employee rows")
+        return SheetSegmentation(employee_rows=employee_rows, column_headers=column_headers)
+
+    def extract_leave_entries(self, df: pd.DataFrame, segmentation: SheetSegmentation,
+                              emp_id_column, emp_name_column, location_column,
+                              previous_sections: Dict = None) -> Tuple[List[Employee], List[LeaveEntry]]:
+        """Build employees and leave entries from the segmented employee rows
+
+        Each month section is fingerprinted from its cells and month context; sections
+        whose fingerprint appears in previous_sections reuse those results unparsed.
+        """
+        registry = EmployeeRegistry()
+        leave_entries = []
+        self.section_results = {}
+        reused_sections = 0
+
+        columns = list(df.columns)
+        values = df.to_numpy(dtype=object)
+        positions = self._column_positions(
+            columns, emp_id_column, emp_name_column, location_column)
+
+        # Resolve the leave columns and the "Opting?" column once per header row
+        epoch_layouts = [
+            self._leave_column_layout(columns, column_headers, emp_id_column, emp_name_column)
+            for column_headers in segmentation.column_headers
+        ]
 
-        except Exception as e:
-            logger.error(f"Error parsing Excel file: {e}")
-            raise
+        rows = segmentation.employee_rows
+        for _, section_rows in rows.groupby('section', sort=False):
+            section_start = time.perf_counter()
+            section_key = list(zip(section_rows.index, section_rows['month'],
+                                   section_rows['year'], section_rows['header_epoch']))
+            fingerprint = self._section_fingerprint(
+                values, section_key, positions, epoch_layouts)
+
+            if previous_sections and fingerprint in previous_sections:
+                section_employees, section_entries = previous_sections[fingerprint]
+                reused_sections += 1
+            else:
+                section_registry = EmployeeRegistry()
+                section_entries = []
+                for (month, year, epoch), block in itertools.groupby(
+                        section_key, key=lambda key: key[1:]):
+                    row_positions = [pos for pos, _, _, _ in block]
+                    section_entries.extend(self._block_leave_entries(
+                        values[row_positions], int(month), int(year), positions,
+                        epoch_layouts[epoch], section_registry))
+                section_employees = section_registry.employees
+
+            self.section_results[fingerprint] = (section_employees, section_entries)
+            _, month, year, _ = section_key[0]
+            self._merge_section(registry, section_employees, section_entries,
+                                leave_entries, int(month), int(year))
+            self.stats.sections.append(SectionStats(
+                label=f"{len(self.stats.sections) + 1}. {date(int(year), int(month), 1).strftime('%b %Y')}",
+                rows=len(section_key),
+                employees=len(section_employees),
+                leave_entries=len(section_entries),
+                seconds=time.perf_counter() - section_start,
+                reused=previous_sections is not None and fingerprint in previous_sections
+            ))
+
+        if previous_sections is not None:
+            logger.info(
+                f"Reused {reused_sections} of {len(self.section_results)} unchanged month sections")
+        self.registry = registry
+        return registry.employees, leave_entries
+
+    @staticmethod
+    def _merge_section(registry: EmployeeRegistry, section_employees: List[Employee],
+                       section_entries: List[LeaveEntry], leave_entries: List[LeaveEntry],
+                       month: int = None, year: int = None):
+        """Intern a section's employees and append copies of its leave entries
+
+        Section results may be reused from the parse cache, and two sections with
+        the same fingerprint share them, so they are copied rather than modified.
+        """
+        for employee in section_employees:
+            registry.intern(employee.emp_id, employee.name,
+                            employee.location, month, year)
+        for leave_entry in section_entries:
+            employee = leave_entry.employee
+            leave_entries.append(replace(
+                leave_entry,
+                employee=registry.intern(employee.emp_id, employee.name, employee.location),
+                leave_dates=list(leave_entry.leave_dates)))
+
+    @staticmethod
+    def _section_fingerprint(values: np.ndarray, section_key: List[Tuple], positions: Tuple,
+                             epoch_layouts: List[Tuple]) -> str:
+        """Hash of a month section's cells, month context and column layout"""
+        digest = hashlib.sha1(repr(positions).encode('utf-8'))
+        for pos, month, year, epoch in section_key:
+            digest.update(repr((int(month), int(year), epoch_layouts[epoch])).encode('utf-8'))
+            digest.update(repr([(type(value).__name__, value)
+                                for value in values[pos]]).encode('utf-8'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _column_positions(columns: List, emp_id_column, emp_name_column,
+                          location_column) -> Tuple[int, Optional[int], Optional[int]]:
+        """Positions of the Emp Id, Emp Name and Location columns"""
+        emp_id_pos = columns.index(emp_id_column)
+        name_pos = columns.index(emp_name_column) if emp_name_column else None
+        location_pos = columns.index(
+            location_column) if location_column in columns else None
+        return emp_id_pos, name_pos, location_pos
+
+    def _leave_column_layout(self, columns: List, column_headers: Dict, emp_id_column,
+                             emp_name_column) -> Tuple[Optional[int], List[Tuple[int, str]]]:
+        """Position of the "Opting?" column and (position, leave type) of each leave column"""
+        # Skip the ID and Name columns
+        skip_columns = [emp_id_column, emp_name_column] if emp_name_column else [
+            emp_id_column]
+        skip_columns.extend(['Unnamed: 5'])
+
+        opting_pos = None
+        for pos, col in enumerate(columns):
+            header_val = column_headers.get(col, str(col))
+            if 'opting' in str(header_val).lower():
+                opting_pos = pos
+                break
+
+        # Determine leave type using the actual header value if available
+        leave_columns = [
+            (pos, self.determine_leave_type(column_headers.get(col, col)))
+            for pos, col in enumerate(columns) if col not in skip_columns
+        ]
+        return opting_pos, leave_columns
+
+    def _employee_row_entries(self, row, month: int, year: int, positions: Tuple,
+                              layout: Tuple, registry: EmployeeRegistry) -> Tuple[Employee, List[LeaveEntry]]:
+        """Create the employee and leave entries for one employee row"""
+        emp_id_pos, name_pos, location_pos = positions
+        opting_pos, leave_columns = layout
+
+        emp_name_val = ''
+        if name_pos is not None:
+            emp_name_val = str(row[name_pos]).strip() if not pd.isna(
+                row[name_pos]) else ''
+
+        # Get location if available; the holiday calendar is kept per location (upper case)
+        location_val = 'GCC'  # Default to GCC
+        if location_pos is not None:
+            location_str = str(row[location_pos]).strip() if not pd.isna(
+                row[location_pos]) else ''
+            if location_str:
+                location_val = location_str.upper()
+
+        employee = registry.intern(
+            str(row[emp_id_pos]).strip(), emp_name_val, location_val, month, year)
+
+        # Get the opting value for this employee
+        is_opting_optional_holiday = False
+        if opting_pos is not None:
+            opting_value = str(row[opting_pos]).strip(
+            ).lower() if not pd.isna(row[opting_pos]) else ''
+            is_opting_optional_holiday = opting_value in [
+                'yes', 'y', 'true']
+
+        leave_entries = []
+        self.stats.cells_inspected += len(leave_columns)
+        for col_pos, leave_type in leave_columns:
+            leave_value = row[col_pos]
+            if pd.isna(leave_value) or str(leave_value).strip() == '':
+                continue
+
+            # Skip if this looks like a header value
+            leave_value_str = str(leave_value).strip()
+            if leave_value_str in HEADER_CELL_VALUES:
+                continue
+
+            # Skip optional holidays if employee is not opting for them
+            if leave_type == 'optional_holiday' and not is_opting_optional_holiday:
+                continue
+
+            # Parse dates
+            leave_dates = self.calculator.parse_date_string(
+                leave_value_str, month, year)
+            self.stats.date_strings_parsed += 1
+            if not leave_dates:
+                self.stats.parse_failures += 1
+
+            if leave_dates:
+                leave_entries.append(LeaveEntry(
+                    employee=employee,
+                    leave_dates=leave_dates,
+                    leave_type=leave_type,
+                    description=leave_value_str
+                ))
+
+        return employee, leave_entries
+
+    def _block_leave_entries(self, rows: np.ndarray, month: int, year: int, positions: Tuple,
+                             layout: Tuple, registry: EmployeeRegistry) -> List[LeaveEntry]:
+        """Create the employees and leave entries for a block of rows sharing month and layout
+
+        Same result as _employee_row_entries row by row, but the leave cells of the
+        whole block are filtered with array masks and each distinct cell text is
+        parsed once.
+        """
+        emp_id_pos, name_pos, location_pos = positions
+        opting_pos, leave_columns = layout
+        row_count = len(rows)
+
+        emp_ids = self._cell_strings(pd.Series(rows[:, emp_id_pos]))
+        names = self._cell_strings(pd.Series(rows[:, name_pos])) if name_pos is not None else pd.Series([''] * row_count)
+        if location_pos is not None:
+            locations = self._cell_strings(pd.Series(rows[:, location_pos]))
+            locations = locations.str.upper().where(locations != '', 'GCC')
+        else:
+            locations = pd.Series(['GCC'] * row_count)
+        employees = [
+            registry.intern(emp_id, name, location, month, year)
+            for emp_id, name, location in zip(emp_ids.tolist(), names.tolist(), locations.tolist())
+        ]
+
+        self.stats.cells_inspected += row_count * len(leave_columns)
+        if not leave_columns or not row_count:
+            return []
+
+        # Leave cells in row-major order, so entries come out row by row as before
+        leave_positions = [pos for pos, _ in leave_columns]
+        leave_types = [leave_type for _, leave_type in leave_columns]
+        cells = self._cell_strings(pd.Series(rows[:, leave_positions].ravel()))
+        keep = (cells != '') & ~cells.isin(HEADER_CELL_VALUES)
+
+        # Skip optional holidays of employees not opting for them
+        if opting_pos is not None:
+            opting = self._cell_strings(pd.Series(rows[:, opting_pos])).str.lower().isin(
+                ['yes', 'y', 'true']).to_numpy()
+        else:
+            opting = np.zeros(row_count, dtype=bool)
+        is_optional = np.array([leave_type == 'optional_holiday' for leave_type in leave_types])
+        keep &= ~(np.tile(is_optional, row_count) & np.repeat(~opting, len(leave_columns)))
+
+        kept_cells = np.flatnonzero(keep.to_numpy())
+        kept_texts = cells.to_numpy(dtype=object)[kept_cells]
+        codes, unique_texts = pd.factorize(kept_texts)
+        parsed = self.calculator.date_parser.parse_many(unique_texts, month, year)
+        self.stats.date_strings_parsed += len(kept_cells)
+        self.stats.parse_failures += int(
+            np.bincount(codes, minlength=len(parsed))[[not dates for dates in parsed]].sum())
+
+        leave_entries = []
+        for cell, text, code in zip(kept_cells.tolist(), kept_texts.tolist(), codes.tolist()):
+            leave_dates = parsed[code]
+            if leave_dates:
+                row, col = divmod(cell, len(leave_columns))
+                leave_entries.append(LeaveEntry(
+                    employee=employees[row],
+                    leave_dates=list(leave_dates),
+                    leave_type=leave_types[col],
+                    description=text
+                ))
+        return leave_entries
+
+    @staticmethod
+    def _cell_strings(column: pd.Series) -> pd.Series:
+        """Stripped string form of each cell in a column, '' for empty cells"""
+        column = column.reset_index(drop=True)
+        return column.map(str).str.strip().where(column.notna(), '')
+
+    @staticmethod
+    def _month_from_header(month_header: str, now: datetime) -> Optional[Tuple[int, int]]:
+        """Month and year named in a month header such as '2026 January'"""
+        header_lower = month_header.lower()
+        if 'planned' in header_lower:
+            return None
+
+        for month_name, month_num in SHEET_MONTH_MAPPING.items():
+            if month_name in header_lower:
+                # Extract year from header if present (e.g., "2026 January")
+                year_match = re.search(r'(20\d{2})', month_header)
+                if year_match:
+                    year = int(year_match.group(1))
+                elif month_num < now.month:
+                    # If month is earlier than current month, assume next year
+                    year = now.year + 1
+                else:
+                    year = now.year
+
+                logger.info(
+                    f"Found month section: {month_name.title()} {year} (month {month_num})")
+                return month_num, year
+        return None
+
+    @staticmethod
+    def _month_from_columns(columns, now: datetime) -> Optional[Tuple[int, int]]:
+        """Month inferred from the sheet's column names when no month row precedes the data"""
+        for col in columns:
+            # Handle datetime columns
+            if isinstance(col, datetime):
+                logger.info(
+                    f"Inferred month from datetime column: {col.strftime('%B %Y')} (month {col.month})")
+                return col.month, col.year
+
+            # Handle string columns
+            col_lower = str(col).lower()
+            for month_name, month_num in COLUMN_MONTH_MAPPING.items():
+                if month_name in col_lower:
+                    logger.info(
+                        f"Inferred month from column: {month_name.title()} (month {month_num})")
+                    return month_num, now.year
+        return None
 
     def clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean dataframe by removing duplicate headers and invalid rows"""
@@ -669,17 +2376,22 @@ class ExcelDataParser:
         else:
             return 'planned'
 
-    def parse_oncall_schedules(self, file_path: str) -> List[OnCallSchedule]:
+    def parse_oncall_schedules(self, file_path: str,
+                               session: WorkbookSession = None) -> List[OnCallSchedule]:
         """Parse on-call schedules from the 'On Call Schedules' sheet"""
+        owns_session = session is None
+        if owns_session:
+            session = self.open_session(file_path)
+
         try:
             # Read the On Call Schedules sheet
-            excel_file = pd.ExcelFile(file_path)
-            if 'On Call Schedules' not in excel_file.sheet_names:
+            if not session.has_sheet('On Call Schedules'):
                 logger.warning(
                     "'On Call Schedules' sheet not found in Excel file")
                 return []
 
-            df = pd.read_excel(file_path, sheet_name='On Call Schedules')
+            sheet_start = time.perf_counter()
+            df = session.read_sheet('On Call Schedules')
             logger.info(f"Reading On Call Schedules sheet, shape: {df.shape}")
 
             oncall_schedules = []
@@ -694,21 +2406,7 @@ class ExcelDataParser:
                     # Get month
                     month_str = str(row['Month']).strip(
                     ) if pd.notna(row['Month']) else ''
-                    month_mapping = {
-                        'jan': 1, 'january': 1,
-                        'feb': 2, 'february': 2,
-                        'mar': 3, 'march': 3,
-                        'apr': 4, 'april': 4,
-                        'may': 5,
-                        'jun': 6, 'june': 6,
-                        'jul': 7, 'july': 7,
-                        'aug': 8, 'august': 8,
-                        'sep': 9, 'september': 9,
-                        'oct': 10, 'october': 10,
-                        'nov': 11, 'november': 11,
-                        'dec': 12, 'december': 12
-                    }
-                    month = month_mapping.get(month_str.lower(), None)
+                    month = MONTH_NUMBERS.get(month_str.lower(), None)
                     if not month:
                         logger.warning(f"Could not parse month: {month_str}")
                         continue
@@ -761,11 +2459,463 @@ class ExcelDataParser:
                     continue
 
             logger.info(f"Parsed {len(oncall_schedules)} on-call schedules")
+            self.stats.sheet_seconds['On Call Schedules'] = time.perf_counter() - sheet_start
             return oncall_schedules
 
         except Exception as e:
             logger.error(f"Error parsing on-call schedules: {e}")
             return []
+        finally:
+            if owns_session:
+                session.close()
+
+
+class ParsedWorkbookCache:
+    """On-disk cache of parsed workbook data keyed by file fingerprint
+
+    Stores employees, leave entries and on-call schedules as JSON. An entry is
+    valid while the workbook's path, size, mtime (or, if those moved, its
+    content hash) and the parse-relevant config keys are unchanged. Results are
+    also kept per month section so a changed workbook only re-parses the
+    sections whose fingerprint changed.
+    """
+
+    CACHE_VERSION = 4
+
+    # Config keys that change what the parser produces
+    SETTINGS_KEYS = ['excel_sheet_name', 'excel_streaming', 'data_source', 'oncall_csv_path']
+
+    def __init__(self, calculator: SprintCapacityCalculator):
+        self.calculator = calculator
+        self.cache_dir = calculator.config.get(
+            'parse_cache_dir', '.capacity_cache')
+
+    def cache_path(self, file_path: str) -> str:
+        """Cache file used for a workbook path"""
+        path_key = hashlib.sha1(os.path.abspath(
+            file_path).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"parsed_{path_key}.json")
+
+    def parse_settings(self) -> Dict:
+        """Config values and parse date that the cached result depends on"""
+        settings = {key: self.calculator.config.get(key)
+                    for key in self.SETTINGS_KEYS}
+        # The on-call export of a CSV source is a separate file
+        oncall_file = self.calculator.config.get('oncall_csv_path')
+        if oncall_file and os.path.exists(oncall_file):
+            stat = os.stat(oncall_file)
+            settings['oncall_csv_stat'] = [stat.st_size, stat.st_mtime]
+        # Month sections without a year are resolved relative to the current month
+        settings['parse_month'] = datetime.now().strftime('%Y-%m')
+        return settings
+
+    @staticmethod
+    def file_hash(file_path: str) -> str:
+        """SHA-256 of the workbook contents"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def load(self, file_path: str) -> Optional[Tuple[List[Employee], List[LeaveEntry], List[OnCallSchedule]]]:
+        """Return cached parse results, or None when missing or stale"""
+        cache_file = self.cache_path(file_path)
+        if not os.path.exists(cache_file):
+            return None
+
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+
+            if cached.get('version') != self.CACHE_VERSION:
+                return None
+            if cached['settings'] != self.parse_settings():
+                logger.info("Parse cache settings changed, re-parsing workbook")
+                return None
+
+            fingerprint = cached['fingerprint']
+            stat = os.stat(file_path)
+            if (fingerprint['path'] != os.path.abspath(file_path)
+                    or fingerprint['size'] != stat.st_size
+                    or fingerprint['mtime'] != stat.st_mtime):
+                # Synced copies can be touched without changing; compare contents
+                if fingerprint['sha256'] != self.file_hash(file_path):
+                    logger.info("Workbook changed since last parse, re-parsing")
+                    return None
+                # Same contents: store the new size and mtime so later runs skip the hash
+                fingerprint.update(path=os.path.abspath(file_path), size=stat.st_size,
+                                   mtime=stat.st_mtime)
+                try:
+                    self._write(cache_file, cached)
+                except OSError as e:
+                    logger.warning(f"Could not update parse cache fingerprint: {e}")
+
+            employees, leave_entries = self._decode_entries(
+                cached['employees'], cached['leave_entries'])
+            oncall_schedules = [
+                OnCallSchedule(
+                    start_date=date.fromordinal(start),
+                    end_date=date.fromordinal(end),
+                    primary=primary,
+                    secondary=secondary
+                )
+                for start, end, primary, secondary in cached['oncall_schedules']
+            ]
+            logger.info(
+                f"Loaded parsed workbook from cache: {cache_file} "
+                f"({len(employees)} employees, {len(leave_entries)} leave entries)")
+            return employees, leave_entries, oncall_schedules
+
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable parse cache {cache_file}: {e}")
+            return None
+
+    def load_sections(self, file_path: str) -> Dict[str, Tuple[List[Employee], List[LeaveEntry]]]:
+        """Per-section parse results of the last cached parse, even if the workbook changed"""
+        cache_file = self.cache_path(file_path)
+        if not os.path.exists(cache_file):
+            return {}
+
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('version') != self.CACHE_VERSION:
+                return {}
+
+            sections = {}
+            for fingerprint, (section_employees, section_entries) in cached.get('sections', {}).items():
+                employees, leave_entries = self._decode_entries(
+                    section_employees, section_entries)
+                sections[fingerprint] = (employees, leave_entries)
+            return sections
+
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable parse cache {cache_file}: {e}")
+            return {}
+
+    @staticmethod
+    def _encode_entries(employees: List[Employee], leave_entries: List[LeaveEntry]) -> Tuple[List, List]:
+        """JSON form of employees and leave entries (entries refer to employees by index)"""
+        emp_index = {}
+        for employee in employees:
+            emp_index.setdefault(
+                (employee.emp_id, employee.name, employee.location), len(emp_index))
+        return (
+            [[employee.emp_id, employee.name, employee.location]
+             for employee in employees],
+            [[emp_index[(entry.employee.emp_id, entry.employee.name, entry.employee.location)],
+              [leave_date.toordinal() for leave_date in entry.leave_dates],
+              entry.leave_type, entry.description]
+             for entry in leave_entries]
+        )
+
+    @staticmethod
+    def _decode_entries(encoded_employees: List, encoded_entries: List) -> Tuple[List[Employee], List[LeaveEntry]]:
+        """Rebuild employees and leave entries from their JSON form"""
+        employees = [Employee(emp_id=emp_id, name=name, location=location)
+                     for emp_id, name, location in encoded_employees]
+        leave_entries = [
+            LeaveEntry(
+                employee=employees[emp_index],
+                leave_dates=[date.fromordinal(day) for day in days],
+                leave_type=leave_type,
+                description=description
+            )
+            for emp_index, days, leave_type, description in encoded_entries
+        ]
+        return employees, leave_entries
+
+    def save(self, file_path: str, employees: List[Employee], leave_entries: List[LeaveEntry],
+             oncall_schedules: List[OnCallSchedule], sections: Dict = None):
+        """Write parse results (and per-section results, if given) for a workbook to the cache"""
+        try:
+            stat = os.stat(file_path)
+            encoded_employees, encoded_entries = self._encode_entries(
+                employees, leave_entries)
+
+            cached = {
+                'version': self.CACHE_VERSION,
+                'fingerprint': {
+                    'path': os.path.abspath(file_path),
+                    'size': stat.st_size,
+                    'mtime': stat.st_mtime,
+                    'sha256': self.file_hash(file_path)
+                },
+                'settings': self.parse_settings(),
+                'employees': encoded_employees,
+                'leave_entries': encoded_entries,
+                'oncall_schedules': [
+                    [oncall.start_date.toordinal(), oncall.end_date.toordinal(),
+                     oncall.primary, oncall.secondary]
+                    for oncall in oncall_schedules
+                ],
+                'sections': {
+                    fingerprint: self._encode_entries(*section)
+                    for fingerprint, section in (sections or {}).items()
+                }
+            }
+
+            cache_file = self.cache_path(file_path)
+            self._write(cache_file, cached)
+            logger.info(f"Saved parsed workbook to cache: {cache_file}")
+
+        except Exception as e:
+            logger.warning(f"Could not write parse cache: {e}")
+
+    def _write(self, cache_file: str, cached: Dict):
+        """Replace a cache file in one step, so readers never see a partial file"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_file = cache_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(cached, f)
+        os.replace(temp_file, cache_file)
+
+
+class CapacitySnapshot:
+    """Compact columnar snapshot of parsed capacity data in a NumPy .npz file
+
+    Holds employees, leave entries (days as int32 ordinals), public holidays by
+    location and on-call schedules. Public holidays are stored once per location
+    rather than on every employee's row, and load as the holiday calendar. Loading
+    only needs NumPy, so report-only runs and the web dashboard can share one
+    pre-parsed artifact instead of reading Excel.
+    """
+
+    SNAPSHOT_VERSION = 2
+
+    # Leave type of each entry_type code
+    LEAVE_TYPES = ['planned', 'public_holiday', 'optional_holiday']
+
+    @classmethod
+    def export(cls, file_path: str, employees: List[Employee], leave_entries: List[LeaveEntry],
+               oncall_schedules: List[OnCallSchedule]):
+        """Write parsed data to a snapshot file"""
+        holidays = HolidayCalendar.from_entries(leave_entries).holidays
+        leave_entries = [leave_entry for leave_entry in leave_entries
+                         if leave_entry.leave_type != 'public_holiday']
+        emp_position = {}
+        for pos, employee in enumerate(employees):
+            emp_position.setdefault(
+                (employee.emp_id, employee.name, employee.location), pos)
+
+        sizes = [len(entry.leave_dates) for entry in leave_entries]
+        arrays = {
+            'version': np.array(cls.SNAPSHOT_VERSION, dtype=np.int32),
+            'emp_id': np.array([employee.emp_id for employee in employees], dtype=str),
+            'emp_name': np.array([employee.name for employee in employees], dtype=str),
+            'emp_location': np.array([employee.location for employee in employees], dtype=str),
+            'entry_emp': np.array(
+                [emp_position[(entry.employee.emp_id, entry.employee.name, entry.employee.location)]
+                 for entry in leave_entries], dtype=np.int32),
+            'entry_type': np.array(
+                [cls.LEAVE_TYPES.index(entry.leave_type) for entry in leave_entries],
+                dtype=np.int8),
+            'entry_description': np.array(
+                [entry.description for entry in leave_entries], dtype=str),
+            'entry_offsets': np.concatenate(([0], np.cumsum(sizes, dtype=np.int64))),
+            'entry_days': np.array(
+                [leave_date.toordinal() for entry in leave_entries for leave_date in entry.leave_dates],
+                dtype=np.int32),
+            'holiday_location': np.array(
+                [location for location, days in holidays.items() for _ in days], dtype=str),
+            'holiday_day': np.array(
+                [day.toordinal() for days in holidays.values() for day in days], dtype=np.int32),
+            'oncall_start': np.array(
+                [oncall.start_date.toordinal() for oncall in oncall_schedules], dtype=np.int32),
+            'oncall_end': np.array(
+                [oncall.end_date.toordinal() for oncall in oncall_schedules], dtype=np.int32),
+            'oncall_primary': np.array([oncall.primary for oncall in oncall_schedules], dtype=str),
+            'oncall_secondary': np.array([oncall.secondary for oncall in oncall_schedules], dtype=str),
+        }
+
+        folder = os.path.dirname(file_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(file_path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        logger.info(
+            f"Exported snapshot: {file_path} ({len(employees)} employees, "
+            f"{len(leave_entries)} leave entries, {sum(len(days) for days in holidays.values())} "
+            f"public holidays, {len(oncall_schedules)} on-call schedules)")
+
+    @classmethod
+    def load(cls, file_path: str) -> Tuple[List[Employee], List[LeaveEntry], List[OnCallSchedule],
+                                           HolidayCalendar]:
+        """Rehydrate employees, leave entries, on-call schedules and the holiday calendar from a snapshot file"""
+        with np.load(file_path, allow_pickle=False) as data:
+            version = int(data['version'])
+            if version != cls.SNAPSHOT_VERSION:
+                raise ValueError(
+                    f"Unsupported snapshot version {version} in {file_path}")
+
+            employees = [
+                Employee(emp_id=str(emp_id), name=str(name), location=str(location))
+                for emp_id, name, location in zip(
+                    data['emp_id'].tolist(), data['emp_name'].tolist(), data['emp_location'].tolist())
+            ]
+
+            offsets = data['entry_offsets'].tolist()
+            days = data['entry_days'].tolist()
+            leave_entries = [
+                LeaveEntry(
+                    employee=employees[emp_pos],
+                    leave_dates=[date.fromordinal(day)
+                                 for day in days[offsets[i]:offsets[i + 1]]],
+                    leave_type=cls.LEAVE_TYPES[type_code],
+                    description=str(description)
+                )
+                for i, (emp_pos, type_code, description) in enumerate(zip(
+                    data['entry_emp'].tolist(), data['entry_type'].tolist(),
+                    data['entry_description'].tolist()))
+            ]
+
+            oncall_schedules = [
+                OnCallSchedule(
+                    start_date=date.fromordinal(start),
+                    end_date=date.fromordinal(end),
+                    primary=str(primary),
+                    secondary=str(secondary)
+                )
+                for start, end, primary, secondary in zip(
+                    data['oncall_start'].tolist(), data['oncall_end'].tolist(),
+                    data['oncall_primary'].tolist(), data['oncall_secondary'].tolist())
+            ]
+
+            holidays: Dict[str, List[date]] = {}
+            for location, day in zip(data['holiday_location'].tolist(), data['holiday_day'].tolist()):
+                holidays.setdefault(str(location), []).append(date.fromordinal(day))
+            holiday_calendar = HolidayCalendar(holidays)
+
+        logger.info(
+            f"Loaded snapshot: {file_path} ({len(employees)} employees, "
+            f"{len(leave_entries)} leave entries, {len(holiday_calendar)} public holidays, "
+            f"{len(oncall_schedules)} on-call schedules)")
+        return employees, leave_entries, oncall_schedules, holiday_calendar
+
+
+class AvailabilityMatrix:
+    """Employee x day availability for a date range, reduced per sprint with NumPy
+
+    Rows follow the employee list and columns the days start_date..end_date.
+    working is 1 on the weekdays that are not public holidays at the employee's
+    location; leave counts the employee's planned and
+    optional holiday leave on weekdays (a day repeated in several cells counts
+    each time); available is working minus the leave on working days. A sprint
+    is a column slice, so its person-days are sums over that slice.
+    """
+
+    def __init__(self, employees: List[Employee], leave_index: LeaveIndex, calendar: Calendar,
+                 start_date: date, end_date: date):
+        self.employees = employees
+        self.start_date = start_date
+        self.end_date = end_date
+        self.first_ordinal = start_date.toordinal()
+        day_count = end_date.toordinal() - self.first_ordinal + 1
+
+        location_flags: Dict[str, np.ndarray] = {}
+        for employee in employees:
+            if employee.location not in location_flags:
+                location_flags[employee.location] = calendar.working_day_flags(
+                    start_date, end_date, employee.location).astype(np.int16)
+        self.working = np.zeros((len(employees), day_count), dtype=np.int16)
+        for row, employee in enumerate(employees):
+            self.working[row] = location_flags[employee.location]
+
+        self.rows: Dict[str, int] = {}
+        leave_rows = []
+        leave_columns = []
+        for row, employee in enumerate(employees):
+            self.rows.setdefault(employee.emp_id, row)
+            ordinals = leave_index.capacity_ordinals(employee.emp_id, start_date, end_date)
+            leave_rows.extend([row] * len(ordinals))
+            leave_columns.extend(ordinal - self.first_ordinal for ordinal in ordinals)
+        self.leave = np.zeros((len(employees), day_count), dtype=np.int16)
+        np.add.at(self.leave, (np.array(leave_rows, dtype=np.intp),
+                               np.array(leave_columns, dtype=np.intp)), 1)
+
+        self.available = self.working - self.leave * self.working
+
+    def _columns(self, start_date: date, end_date: date) -> slice:
+        """Column slice of the days start_date..end_date"""
+        return slice(start_date.toordinal() - self.first_ordinal,
+                     end_date.toordinal() - self.first_ordinal + 1)
+
+    def sprint_person_days(self, sprints: List[Sprint]) -> Tuple[np.ndarray, np.ndarray]:
+        """Total and available person-days of each sprint, summed over all employees"""
+        total = np.zeros(self.working.shape[1] + 1, dtype=np.int64)
+        available = np.zeros_like(total)
+        np.cumsum(self.working.sum(axis=0, dtype=np.int64), out=total[1:])
+        np.cumsum(self.available.sum(axis=0, dtype=np.int64), out=available[1:])
+        columns = [self._columns(sprint.start_date, sprint.end_date) for sprint in sprints]
+        starts = np.array([column.start for column in columns], dtype=np.intp)
+        stops = np.array([column.stop for column in columns], dtype=np.intp)
+        return total[stops] - total[starts], available[stops] - available[starts]
+
+    def employee_leave_days(self, emp_id: str, start_date: date, end_date: date) -> int:
+        """Planned and optional holiday leave weekdays of an employee from start_date to end_date"""
+        row = self.rows.get(emp_id)
+        if row is None:
+            return 0
+        return int(self.leave[row, self._columns(start_date, end_date)].sum())
+
+
+class SprintCalendar:
+    """Fixed-length sprints numbered from the first sprint start date
+
+    Sprint n starts (n - 1) * duration days after the first sprint, so finding
+    the sprint of a date or a sprint by number is arithmetic, not a walk from
+    the first sprint. Dates before the first sprint fall in sprints numbered
+    0, -1, ... This is the only place sprint numbers are computed.
+    """
+
+    def __init__(self, first_sprint_start: date, duration_days: int = 14):
+        if duration_days < 1:
+            raise ValueError(f"Sprint duration must be at least 1 day, got {duration_days}")
+        self.first_sprint_start = first_sprint_start
+        self.duration_days = duration_days
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'SprintCalendar':
+        """Sprint calendar for the configured first sprint start date and duration"""
+        first_sprint_start = datetime.strptime(
+            config['sprint_start_date'], '%Y-%m-%d').date()
+        return cls(first_sprint_start, config['sprint_duration_days'])
+
+    def number_for_date(self, day: date) -> int:
+        """Number of the sprint containing a date"""
+        return (day - self.first_sprint_start).days // self.duration_days + 1
+
+    def sprint_by_number(self, number: int) -> Sprint:
+        """Sprint with the given number"""
+        start_date = self.first_sprint_start + \
+            timedelta(days=(number - 1) * self.duration_days)
+        return Sprint(number=number, start_date=start_date,
+                      end_date=start_date + timedelta(days=self.duration_days - 1))
+
+    def sprint_for_date(self, day: date) -> Sprint:
+        """Sprint containing a date"""
+        return self.sprint_by_number(self.number_for_date(day))
+
+    def iter_sprints(self, first_number: int = 1, last_number: int = None) -> Iterator[Sprint]:
+        """Sprints first_number..last_number, created one at a time (no end if last_number is None)"""
+        numbers = itertools.count(first_number) if last_number is None else range(
+            first_number, last_number + 1)
+        for number in numbers:
+            yield self.sprint_by_number(number)
+
+    def sprints_between(self, start_date: date, end_date: date) -> Iterator[Sprint]:
+        """Sprints with at least one day from start_date to end_date"""
+        return self.iter_sprints(self.number_for_date(start_date), self.number_for_date(end_date))
+
+
+class SprintBaseline(NamedTuple):
+    """Baseline capacity of a sprint with the parts a scenario patches"""
+    holidays: Dict[str, set]
+    total_person_days: int
+    available_person_days: int
+    on_leave_positions: List[int]  # Employee list positions of the members on leave
+    capacity: SprintCapacity
 
 
 class SprintManager:
@@ -776,133 +2926,204 @@ class SprintManager:
 
     def calculate_sprints(self, start_date: date, num_sprints: int = 6, oncall_schedules: List[OnCallSchedule] = None) -> List[Sprint]:
         """Calculate sprint periods starting from given date"""
-        sprints = []
-        current_start = start_date
-
-        for i in range(num_sprints):
-            sprint_end = current_start + \
-                timedelta(
-                    days=self.calculator.config['sprint_duration_days'] - 1)
-            sprint = Sprint(
-                number=i + 1,
-                start_date=current_start,
-                end_date=sprint_end
-            )
+        sprint_calendar = SprintCalendar(
+            start_date, self.calculator.config['sprint_duration_days'])
+        sprints = list(sprint_calendar.iter_sprints(1, num_sprints))
 
-            # Assign on-call information if available
-            if oncall_schedules:
+        # Assign on-call information if available
+        if oncall_schedules:
+            for sprint in sprints:
                 self.assign_oncall_to_sprint(sprint, oncall_schedules)
 
-            sprints.append(sprint)
-            current_start = sprint_end + timedelta(days=1)
-
         return sprints
 
     def assign_oncall_to_sprint(self, sprint: Sprint, oncall_schedules: List[OnCallSchedule]):
-        """Assign on-call information to a sprint based on date overlap"""
-        # Find the on-call schedule that overlaps with this sprint
-        for oncall in oncall_schedules:
-            # Check if there's any overlap between sprint and on-call period
-            if (oncall.start_date <= sprint.end_date and oncall.end_date >= sprint.start_date):
-                sprint.oncall_primary = oncall.primary
-                sprint.oncall_secondary = oncall.secondary
-                logger.info(
-                    f"Assigned on-call to Sprint {sprint.number}: Primary={oncall.primary}, Secondary={oncall.secondary}")
-                break  # Use the first matching schedule
+        """Assign on-call information to a sprint based on date overlap
 
-    def get_current_and_upcoming_sprints(self, oncall_schedules: List[OnCallSchedule] = None) -> List[Sprint]:
-        """Get current and upcoming sprints based on today's date"""
-        today = date.today()
-        sprint_start_str = self.calculator.config['sprint_start_date']
-        first_sprint_start = datetime.strptime(
-            sprint_start_str, '%Y-%m-%d').date()
+        Every rotation overlapping the sprint becomes a shift; the rotation on
+        call on the sprint's first covered day is shown as its primary/secondary.
+        """
+        oncall_index = self.calculator.get_oncall_index(oncall_schedules)
+        shifts = oncall_index.primary_shifts(sprint.start_date, sprint.end_date)
+        if not shifts:
+            return
+
+        oncall = shifts[0][2]
+        sprint.oncall_primary = oncall.primary
+        sprint.oncall_secondary = oncall.secondary
+        sprint.oncall_shifts = [(shift_start, shift_end, shift_oncall.primary)
+                                for shift_start, shift_end, shift_oncall in shifts]
+        logger.info(
+            f"Assigned on-call to Sprint {sprint.number}: Primary={oncall.primary}, Secondary={oncall.secondary}")
+        if len(shifts) > 1:
+            logger.info(
+                f"On-call rotation changes during Sprint {sprint.number}: " + ", ".join(
+                    f"{primary} ({shift_start:%b %d}-{shift_end:%b %d})"
+                    for shift_start, shift_end, primary in sprint.oncall_shifts))
 
-        # Calculate which sprint we're currently in
-        days_since_start = (today - first_sprint_start).days
-        sprint_duration = self.calculator.config['sprint_duration_days']
-        current_sprint_number = max(0, days_since_start // sprint_duration)
+    def oncall_shifts(self, sprint: Sprint) -> List[Tuple[date, date, Employee]]:
+        """(first day, last day, employee) of each resolved on-call shift in a sprint
 
-        # Generate all sprints from the first sprint
-        # Include previous sprint (if available) + current + next 3 sprints
-        # Include previous sprint if available
-        start_index = max(0, current_sprint_number - 1)
-        all_sprints = self.calculate_sprints(
-            first_sprint_start, current_sprint_number + 5, oncall_schedules)
+        A sprint with a primary but no recorded shifts is one shift over the whole sprint.
+        """
+        shifts = sprint.oncall_shifts
+        if not shifts and sprint.oncall_primary:
+            shifts = [(sprint.start_date, sprint.end_date, sprint.oncall_primary)]
+        resolver = self.calculator.get_oncall_resolver()
+        resolved = []
+        for shift_start, shift_end, primary in shifts:
+            employee = resolver.resolve(primary) if primary else None
+            if employee is not None:
+                resolved.append((shift_start, shift_end, employee))
+        return resolved
+
+    def get_current_and_upcoming_sprints(self, oncall_schedules: List[OnCallSchedule] = None,
+                                         horizon: int = None) -> List[Sprint]:
+        """Get current and upcoming sprints based on today's date
+
+        Returns the previous sprint (if available), the current one and the next
+        `horizon` sprints (2 by default, four sprints in all); without a previous
+        sprint one more upcoming sprint is returned instead.
+        """
+        if horizon is None:
+            horizon = DEFAULT_HORIZON
+        if horizon < 1:
+            raise ValueError(f"Forecast horizon must be at least 1 sprint, got {horizon}")
+        sprint_calendar = self.calculator.get_sprint_calendar()
+
+        # Calculate which sprint we're currently in (the first one before it starts)
+        current_sprint_number = max(
+            1, sprint_calendar.number_for_date(date.today()))
+
+        # Return previous (if available), current and the following sprints
+        first_number = max(1, current_sprint_number - 1)
+        sprints = list(sprint_calendar.iter_sprints(first_number, first_number + horizon + 1))
+
+        # Assign on-call information if available
+        if oncall_schedules:
+            for sprint in sprints:
+                self.assign_oncall_to_sprint(sprint, oncall_schedules)
 
-        # Return previous (if available), current, and next 3 sprints
-        return all_sprints[start_index:start_index + 4]
+        return sprints
 
-    def calculate_sprint_capacity(self, sprint: Sprint) -> SprintCapacity:
-        """Calculate capacity for a specific sprint"""
-        total_members = len(self.calculator.employees)
+    def calculate_sprint_capacities(self, sprints: List[Sprint]) -> List[SprintCapacity]:
+        """Calculate capacity for several sprints with the configured capacity engine
+
+        'loop' calculates one sprint at a time; 'matrix' builds one employee x day
+        availability matrix covering all sprints and reduces it per sprint.
+        """
+        return [baseline.capacity for baseline in self.calculate_sprint_baselines(sprints)]
+
+    def calculate_sprint_baselines(self, sprints: List[Sprint]) -> List[SprintBaseline]:
+        """Capacity of several sprints with the configured capacity engine, with the parts
+        a what-if scenario or leave edit patches"""
+        engine = self.calculator.config.get('capacity_engine', 'loop')
+        if engine not in CAPACITY_ENGINES:
+            logger.warning(f"Unknown capacity engine '{engine}', using 'loop'")
+            engine = 'loop'
+        if engine == 'matrix' and sprints:
+            return self.sprint_baselines_matrix(sprints)
+        return [self.sprint_baseline(sprint) for sprint in sprints]
+
+    def calculate_sprint_capacities_matrix(self, sprints: List[Sprint]) -> List[SprintCapacity]:
+        """Calculate capacity for all sprints from one employee x day availability matrix"""
+        return [baseline.capacity for baseline in self.sprint_baselines_matrix(sprints)]
+
+    def sprint_baselines_matrix(self, sprints: List[Sprint]) -> List[SprintBaseline]:
+        """Sprint baselines for all sprints from one employee x day availability matrix"""
+        calendar = self.calculator.get_calendar()
+        matrix = AvailabilityMatrix(
+            self.calculator.employees, self.calculator.get_leave_index(), calendar,
+            min(sprint.start_date for sprint in sprints),
+            max(sprint.end_date for sprint in sprints))
+        total_person_days, available_person_days = matrix.sprint_person_days(sprints)
+
+        sprint_baselines = []
+        for sprint, sprint_total, sprint_available in zip(
+                sprints, total_person_days.tolist(), available_person_days.tolist()):
+            holidays = self.sprint_holidays(sprint)
+            members_on_leave, all_members_status = self.member_leave_statuses(
+                sprint, holidays)
+
+            # Weekdays and leave days of each on-call shift
+            oncall_days = [
+                (calendar.weekdays(shift_start, shift_end),
+                 matrix.employee_leave_days(oncall_employee.emp_id, shift_start, shift_end))
+                for shift_start, shift_end, oncall_employee in self.oncall_shifts(sprint)
+            ]
+
+            sprint_baselines.append(self._sprint_baseline(
+                sprint, members_on_leave, all_members_status, sprint_total, sprint_available,
+                oncall_days, holidays))
+        return sprint_baselines
+
+    def sprint_holidays(self, sprint: Sprint) -> Dict[str, set]:
+        """Public holidays in a sprint for each employee location
+
+        Each location's holidays apply to the employees at that location
+        (e.g. GCC holidays to GCC employees, US holidays to US employees).
+        """
+        return self.calculator.get_holiday_calendar().holidays_by_location(
+            sprint.start_date, sprint.end_date)
+
+    def member_leave_statuses(self, sprint: Sprint, holidays: Dict[str, set],
+                              employees: List[Employee] = None, leave_index: LeaveIndex = None
+                              ) -> Tuple[List[Tuple[Employee, str]], List[Tuple[Employee, str]]]:
+        """Leave status text of every employee (or of the given employees) in a sprint
+
+        Returns (members on leave, all members status); members on leave are the
+        employees with planned or optional holiday leave in the sprint.
+        """
         members_on_leave = []
         all_members_status = []
+        if employees is None:
+            employees = self.calculator.employees
 
-        # Identify all public holidays in this sprint, separated by location
-        # GCC holidays apply to GCC employees, US holidays apply to US employees
-        gcc_holidays = set()
-        us_holidays = set()
-
-        # Collect holidays from leave entries
-        # Holidays are stored per employee in the Excel file
-        for leave_entry in self.calculator.leave_entries:
-            if leave_entry.leave_type == 'public_holiday':
-                dates_in_sprint = [
-                    leave_date for leave_date in leave_entry.leave_dates
-                    if sprint.contains_date(leave_date)
-                ]
-                # Determine which holiday set to add to based on employee location
-                if leave_entry.employee.location == 'US':
-                    us_holidays.update(dates_in_sprint)
-                else:  # GCC or default
-                    gcc_holidays.update(dates_in_sprint)
+        # Look up each employee's leave days in this sprint from the per-employee index
+        if leave_index is None:
+            leave_index = self.calculator.get_leave_index()
+        calendar = self.calculator.get_calendar()
 
         # Format holidays for display
-        gcc_holidays_display = ""
-        if gcc_holidays:
-            gcc_date_strings = [d.strftime("%b %d")
-                                for d in sorted(gcc_holidays)]
-            gcc_holidays_display = ", ".join(gcc_date_strings)
-
-        us_holidays_display = ""
-        if us_holidays:
-            us_date_strings = [d.strftime("%b %d")
-                               for d in sorted(us_holidays)]
-            us_holidays_display = ", ".join(us_date_strings)
+        holidays_display = {
+            location: ", ".join(calendar.label(d) for d in sorted(location_holidays))
+            for location, location_holidays in holidays.items()
+        }
+
+        # Collect each employee's leave dates in this sprint, one date list per entry
+        # (public holidays are not indexed as they are added per location below)
+        leave_ordinals = []
+        leave_groups = []
+        list_count = 0
+        employee_leave_lists = []  # (leave type, date list number) per employee
+        for employee in employees:
+            leave_lists = []
+            for leave_type, ordinals_in_sprint in leave_index.leave_lists(
+                    employee.emp_id, sprint.start_date, sprint.end_date):
+                leave_ordinals.extend(ordinals_in_sprint)
+                leave_groups.extend([list_count] * len(ordinals_in_sprint))
+                leave_lists.append((leave_type, list_count))
+                list_count += 1
+            employee_leave_lists.append(leave_lists)
+
+        # Format every date list as ranges in one batch
+        dates_displays = calendar.format_ranges(
+            leave_ordinals, leave_groups, list_count)
 
         # Check each employee for leave during this sprint
-        for employee in self.calculator.employees:
+        for employee, leave_lists in zip(employees, employee_leave_lists):
             leave_info_by_type = {}  # Group by leave type
 
             # Add location-specific holidays
-            if employee.location == 'US' and us_holidays_display:
-                leave_info_by_type['public_holiday'] = [us_holidays_display]
-            elif employee.location == 'GCC' and gcc_holidays_display:
-                leave_info_by_type['public_holiday'] = [gcc_holidays_display]
-
-            # Check all leave entries for this employee
-            for leave_entry in self.calculator.leave_entries:
-                if leave_entry.employee.emp_id == employee.emp_id:
-                    # Get only the leave dates that fall within this sprint
-                    dates_in_sprint = [
-                        leave_date for leave_date in leave_entry.leave_dates
-                        if sprint.contains_date(leave_date)
-                    ]
-
-                    if dates_in_sprint:
-                        # Skip public holidays as we already added them above
-                        if leave_entry.leave_type == 'public_holiday':
-                            continue
-
-                        # Format the dates as ranges where possible
-                        dates_display = self.calculator.format_dates_as_ranges(
-                            dates_in_sprint)
-
-                        # Group by leave type
-                        if leave_entry.leave_type not in leave_info_by_type:
-                            leave_info_by_type[leave_entry.leave_type] = []
-                        leave_info_by_type[leave_entry.leave_type].append(
-                            dates_display)
+            location_holidays_display = holidays_display.get(employee.location)
+            if location_holidays_display:
+                leave_info_by_type['public_holiday'] = [location_holidays_display]
+
+            # Group the formatted date lists by leave type
+            for leave_type, group in leave_lists:
+                if leave_type not in leave_info_by_type:
+                    leave_info_by_type[leave_type] = []
+                leave_info_by_type[leave_type].append(dates_displays[group])
 
             if leave_info_by_type:
                 # Format leave reasons with dates
@@ -922,14 +3143,11 @@ class SprintManager:
                         # Parse dates back to date objects for proper sorting
                         date_objects = []
                         for date_str in all_date_strings:
-                            try:
-                                # Parse "Jan 15" format back to date
-                                parsed = datetime.strptime(
-                                    f"{date_str} {sprint.start_date.year}", "%b %d %Y").date()
+                            # Look up "Jan 15" format back to date
+                            parsed = calendar.date_from_label(
+                                date_str, sprint.start_date.year)
+                            if parsed is not None:
                                 date_objects.append(parsed)
-                            except:
-                                # If parsing fails, keep the string as is
-                                pass
 
                         # Sort and format as ranges where possible
                         if date_objects:
@@ -954,53 +3172,97 @@ class SprintManager:
                 # Employee has no leave - mark as available
                 all_members_status.append((employee, "Available"))
 
-        # Calculate total weekdays in sprint (before holidays)
-        total_weekdays = 0
-        current_date = sprint.start_date
-        while current_date <= sprint.end_date:
-            if current_date.weekday() < 5:  # Monday=0, Friday=4
-                total_weekdays += 1
-            current_date += timedelta(days=1)
+        return members_on_leave, all_members_status
+
+    def calculate_sprint_capacity(self, sprint: Sprint) -> SprintCapacity:
+        """Calculate capacity for a specific sprint"""
+        return self.sprint_baseline(sprint).capacity
+
+    def sprint_baseline(self, sprint: Sprint) -> SprintBaseline:
+        """Capacity of a sprint with the parts a what-if scenario or leave edit patches"""
+        # Identify all public holidays in this sprint, separated by location
+        holidays = self.sprint_holidays(sprint)
+        members_on_leave, all_members_status = self.member_leave_statuses(
+            sprint, holidays)
+        total_person_days, available_person_days = self.person_days(sprint, holidays)
+
+        return self._sprint_baseline(
+            sprint, members_on_leave, all_members_status, total_person_days,
+            available_person_days, self.sprint_oncall_days(sprint), holidays)
+
+    def _sprint_baseline(self, sprint: Sprint, members_on_leave: List[Tuple[Employee, str]],
+                         all_members_status: List[Tuple[Employee, str]], total_person_days: int,
+                         available_person_days: int, oncall_days: List[Tuple[int, int]],
+                         holidays: Dict[str, set]) -> SprintBaseline:
+        """Sprint capacity together with its person-days and members on leave"""
+        capacity = self._sprint_capacity(
+            sprint, members_on_leave, all_members_status, total_person_days,
+            available_person_days, oncall_days, holidays)
+        on_leave = {id(employee) for employee, _ in members_on_leave}
+        on_leave_positions = [position for position, employee in enumerate(self.calculator.employees)
+                              if id(employee) in on_leave]
+        return SprintBaseline(holidays, total_person_days, available_person_days,
+                              on_leave_positions, capacity)
+
+    def person_days(self, sprint: Sprint, holidays: Dict[str, set]) -> Tuple[int, int]:
+        """Total and available person-days of a sprint, one employee at a time"""
+        leave_index = self.calculator.get_leave_index()
+        calendar = self.calculator.get_calendar()
 
         # Calculate location-aware working days and capacity
         # Each employee gets different working days based on their location
         total_person_days = 0
         leave_person_days = 0
 
+        # Working days per location (weekdays that are not that location's holidays)
+        location_working_days = {}
+
         for employee in self.calculator.employees:
             # Determine which holidays apply to this employee
-            employee_holidays = gcc_holidays if employee.location != "US" else us_holidays
+            employee_holidays = holidays.get(employee.location, set())
 
-            # Calculate working days for this employee (excluding their location-specific holidays)
-            employee_working_days = 0
-            current_date = sprint.start_date
-            while current_date <= sprint.end_date:
-                # Count weekdays that are not holidays for this employee's location
-                if current_date.weekday() < 5 and current_date not in employee_holidays:
-                    employee_working_days += 1
-                current_date += timedelta(days=1)
+            # Working days for this employee (excluding their location-specific holidays)
+            employee_working_days = location_working_days.get(employee.location)
+            if employee_working_days is None:
+                employee_working_days = calendar.working_days(
+                    sprint.start_date, sprint.end_date, employee.location)
+                location_working_days[employee.location] = employee_working_days
 
             # Add this employee's working days to total
             total_person_days += employee_working_days
 
             # Count only planned and optional holiday leave days (not public holidays)
-            employee_leave_days = 0
-            for leave_entry in self.calculator.leave_entries:
-                if leave_entry.employee.emp_id == employee.emp_id:
-                    if leave_entry.leave_type in ['planned', 'optional_holiday']:
-                        # Count leave days that fall within this sprint and are working days for this employee
-                        for leave_date in leave_entry.leave_dates:
-                            if sprint.contains_date(leave_date) and leave_date.weekday() < 5 and leave_date not in employee_holidays:
-                                employee_leave_days += 1
-            leave_person_days += employee_leave_days
+            # that fall within this sprint and are working days for this employee
+            leave_person_days += leave_index.count_leave_days(
+                employee.emp_id, sprint.start_date, sprint.end_date, employee_holidays)
+
+        return total_person_days, total_person_days - leave_person_days
+
+    def sprint_oncall_days(self, sprint: Sprint, leave_index: LeaveIndex = None) -> List[Tuple[int, int]]:
+        """Weekdays and leave days of each on-call shift in a sprint"""
+        if leave_index is None:
+            leave_index = self.calculator.get_leave_index()
+        calendar = self.calculator.get_calendar()
+        return [
+            (calendar.weekdays(shift_start, shift_end),
+             leave_index.count_leave_days(oncall_employee.emp_id, shift_start, shift_end))
+            for shift_start, shift_end, oncall_employee in self.oncall_shifts(sprint)
+        ]
 
-        # Use total weekdays for display (before holidays are applied)
-        working_days = total_weekdays
+    def _sprint_capacity(self, sprint: Sprint, members_on_leave: List[Tuple[Employee, str]],
+                         all_members_status: List[Tuple[Employee, str]], total_person_days: int,
+                         available_person_days: int, oncall_days: List[Tuple[int, int]],
+                         holidays: Dict[str, set]) -> SprintCapacity:
+        """Capacity hours and percentage of a sprint from its person-days
 
-        # Calculate capacity percentage
-        available_person_days = total_person_days - leave_person_days
-        capacity_percentage = (
-            available_person_days / total_person_days * 100) if total_person_days > 0 else 0
+        oncall_days holds (weekdays, leave days) for each on-call shift; the
+        on-call reduction applies to the days of each shift only.
+        """
+        total_members = len(self.calculator.employees)
+        calendar = self.calculator.get_calendar()
+
+        # Use total weekdays for display (before holidays are applied)
+        working_days = calendar.weekdays(sprint.start_date, sprint.end_date)
 
         # For backward compatibility, keep available_members calculation
         available_members = total_members - len(members_on_leave)
@@ -1015,85 +3277,29 @@ class SprintManager:
         regular_team_person_days = total_person_days
         regular_team_available_days = available_person_days
 
-        # Find and handle on-call person separately
-        oncall_employee = None
+        # Handle on-call person separately, one shift at a time
         oncall_ideal_hours = 0
         oncall_actual_hours = 0
 
-        if sprint.oncall_primary:
-            # Find the primary on-call employee
-            oncall_name_lower = sprint.oncall_primary.strip().lower()
-
-            for employee in self.calculator.employees:
-                emp_name_lower = employee.name.strip().lower()
-
-                # Try multiple matching strategies:
-                # 1. Exact match
-                if emp_name_lower == oncall_name_lower:
-                    oncall_employee = employee
-                    break
-
-                # 2. One name contains the other
-                if emp_name_lower in oncall_name_lower or oncall_name_lower in emp_name_lower:
-                    oncall_employee = employee
-                    break
-
-                # 3. Match individual name parts (e.g., "Siva Guru" matches "Sivaguru")
-                # Remove common separators and compare
-                emp_name_parts = emp_name_lower.replace(
-                    ',', ' ').replace('.', ' ').split()
-                oncall_name_parts = oncall_name_lower.replace(
-                    ',', ' ').replace('.', ' ').split()
-
-                # Check if any significant part of oncall name matches employee name
-                for oncall_part in oncall_name_parts:
-                    if len(oncall_part) > 3:  # Only match significant parts (not "mr", "ms", etc.)
-                        for emp_part in emp_name_parts:
-                            if oncall_part in emp_part or emp_part in oncall_part:
-                                oncall_employee = employee
-                                break
-                    if oncall_employee:
-                        break
-
-                if oncall_employee:
-                    break
-
-            if oncall_employee:
-                # Calculate on-call person's working days
-                # On-call person works on ALL weekdays (Mon-Fri) including GCC holidays
-                oncall_working_days = 0
-                current_date = sprint.start_date
-                while current_date <= sprint.end_date:
-                    # Count only weekdays (Mon-Fri), holidays ARE working days for on-call
-                    if current_date.weekday() < 5:
-                        oncall_working_days += 1
-                    current_date += timedelta(days=1)
-
-                # Calculate on-call person's leave days
-                oncall_leave_days = 0
-                for leave_entry in self.calculator.leave_entries:
-                    if leave_entry.employee.emp_id == oncall_employee.emp_id:
-                        if leave_entry.leave_type in ['planned', 'optional_holiday']:
-                            for leave_date in leave_entry.leave_dates:
-                                if sprint.contains_date(leave_date) and leave_date.weekday() < 5:
-                                    oncall_leave_days += 1
-
-                # On-call person's available days (excluding leave)
-                oncall_available_days = oncall_working_days - oncall_leave_days
-
-                # On-call person works reduced hours per day (HOURS_PER_DAY - ONCALL_REDUCTION_HOURS)
-                oncall_hours_per_day = HOURS_PER_DAY - ONCALL_REDUCTION_HOURS
-
-                # Calculate on-call person's capacity
-                oncall_ideal_hours = oncall_working_days * oncall_hours_per_day
-                oncall_actual_hours = oncall_available_days * oncall_hours_per_day
-
-                # Subtract on-call person from regular team calculation
-                # Remove on-call person's days from regular team
-                regular_team_person_days -= working_days
-                # Adjust for on-call person
-                regular_team_available_days -= (working_days -
-                                                oncall_leave_days)
+        # On-call person works reduced hours per day (HOURS_PER_DAY - ONCALL_REDUCTION_HOURS)
+        oncall_hours_per_day = HOURS_PER_DAY - ONCALL_REDUCTION_HOURS
+
+        for oncall_working_days, oncall_leave_days in oncall_days:
+            # On-call person works on ALL weekdays (Mon-Fri) of the shift including GCC holidays
+            # Count only weekdays (Mon-Fri), holidays ARE working days for on-call
+
+            # On-call person's available days (excluding leave)
+            oncall_available_days = oncall_working_days - oncall_leave_days
+
+            # Calculate on-call person's capacity
+            oncall_ideal_hours += oncall_working_days * oncall_hours_per_day
+            oncall_actual_hours += oncall_available_days * oncall_hours_per_day
+
+            # Subtract on-call person from regular team calculation
+            # Remove on-call person's days from regular team
+            regular_team_person_days -= oncall_working_days
+            # Adjust for on-call person
+            regular_team_available_days -= oncall_available_days
 
         # Calculate capacity for regular team members (6 people at full hours)
         regular_team_ideal_hours = regular_team_person_days * HOURS_PER_DAY
@@ -1117,24 +3323,338 @@ class SprintManager:
             working_days=working_days,
             ideal_capacity_hours=ideal_capacity_hours,
             actual_capacity_hours=actual_capacity_hours,
-            gcc_holidays=gcc_holidays,
-            us_holidays=us_holidays
+            gcc_holidays=holidays.get('GCC', set()),
+            us_holidays=holidays.get('US', set()),
+            holidays=holidays
         )
 
 
+class CapacityScenario:
+    """What-if changes to the parsed leave and on-call data
+
+    Records leave days to add or remove per emp_id and on-call swaps; the
+    parsed leave table is never copied or changed. A later call wins over an
+    earlier one for the same day, and calls chain:
+
+        CapacityScenario("Diwali week").add_leave("200071", days).swap_oncall("Siva", "Ravi", start, end)
+    """
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        # emp_id -> {day: leave type} of leave to add
+        self.added_days: Dict[str, Dict[date, str]] = {}
+        # emp_id -> days whose leave is removed
+        self.removed_days: Dict[str, set] = {}
+        # (first day, last day, current on-call name, replacement name)
+        self.oncall_swaps: List[Tuple[date, date, str, str]] = []
+
+    def add_leave(self, emp_id: str, days: Iterable[date],
+                  leave_type: str = 'planned') -> 'CapacityScenario':
+        """Put an employee on leave on the given days"""
+        if leave_type not in LeaveIndex.CAPACITY_LEAVE_TYPES:
+            raise ValueError(f"Scenario leave type must be one of "
+                             f"{', '.join(LeaveIndex.CAPACITY_LEAVE_TYPES)}, got '{leave_type}'")
+        added = self.added_days.setdefault(emp_id, {})
+        for day in days:
+            added[day] = leave_type
+        return self
+
+    def remove_leave(self, emp_id: str, days: Iterable[date]) -> 'CapacityScenario':
+        """Cancel an employee's leave on the given days"""
+        removed = self.removed_days.setdefault(emp_id, set())
+        added = self.added_days.get(emp_id, {})
+        for day in days:
+            removed.add(day)
+            added.pop(day, None)
+        return self
+
+    def swap_oncall(self, current: str, replacement: str, start_date: date,
+                    end_date: date) -> 'CapacityScenario':
+        """Hand the on-call shifts of `current` from start_date to end_date to `replacement`"""
+        if end_date < start_date:
+            raise ValueError(f"On-call swap ends ({end_date}) before it starts ({start_date})")
+        self.oncall_swaps.append((start_date, end_date, current, replacement))
+        return self
+
+    @property
+    def employee_ids(self) -> set:
+        """emp_ids whose leave the scenario changes"""
+        return set(self.added_days) | set(self.removed_days)
+
+    def changed_ordinals(self) -> List[int]:
+        """Sorted ordinals of the days whose leave the scenario changes"""
+        ordinals = {day.toordinal() for days in self.added_days.values() for day in days}
+        ordinals.update(day.toordinal() for days in self.removed_days.values() for day in days)
+        return sorted(ordinals)
+
+
+class ScenarioEngine:
+    """Evaluates what-if scenarios against baseline sprint capacities
+
+    The baseline is calculated once with the configured capacity engine (or
+    taken from an earlier calculation). A scenario recomputes only the sprints
+    its changed leave days or on-call swaps fall in, and within those only
+    the employees it changes: their leave days are swapped into the baseline
+    person-days and their rows into the baseline member statuses. Leave is
+    read through a copy-on-write overlay of the leave index, so evaluating a
+    scenario costs about the size of the scenario, not of the leave table.
+    """
+
+    def __init__(self, sprint_manager: 'SprintManager', sprints: List[Sprint],
+                 baselines: List[SprintBaseline] = None):
+        self.sprint_manager = sprint_manager
+        self.calculator = sprint_manager.calculator
+        self.sprints = sprints
+        self.leave_index = self.calculator.get_leave_index()
+        self.employees = self.calculator.employees
+
+        # emp_id -> positions in the employee list
+        self.positions: Dict[str, List[int]] = {}
+        for position, employee in enumerate(self.employees):
+            self.positions.setdefault(employee.emp_id, []).append(position)
+
+        if baselines is None:
+            baselines = sprint_manager.calculate_sprint_baselines(sprints)
+            logger.info(f"Scenario baseline calculated for {len(sprints)} sprints "
+                        f"and {len(self.employees)} employees")
+        self.baselines: List[SprintBaseline] = list(baselines)
+
+    @property
+    def baseline(self) -> List[SprintCapacity]:
+        return [baseline.capacity for baseline in self.baselines]
+
+    def evaluate(self, scenario: CapacityScenario) -> ScenarioResult:
+        """Sprint capacities under a scenario, diffed against the baseline"""
+        unknown = sorted(emp_id for emp_id in scenario.employee_ids if emp_id not in self.positions)
+        if unknown:
+            raise ValueError(f"Scenario '{scenario.name}' changes leave of unknown employees: "
+                             f"{', '.join(unknown)}")
+
+        leave_index = self.leave_index.overlay(scenario.added_days, scenario.removed_days)
+        ordinals = scenario.changed_ordinals()
+
+        sprint_capacities = []
+        diffs = []
+        for sprint, baseline in zip(self.sprints, self.baselines):
+            scenario_sprint = self.swap_oncall(sprint, scenario)
+            if not self._contains_any(sprint, ordinals) and scenario_sprint is sprint:
+                sprint_capacities.append(baseline.capacity)
+                continue
+
+            capacity = self._patched_baseline(
+                scenario_sprint, baseline, scenario.employee_ids, leave_index).capacity
+            sprint_capacities.append(capacity)
+            diffs.append(SprintCapacityDiff(baseline.capacity, capacity))
+        return ScenarioResult(scenario.name, sprint_capacities, diffs)
+
+    @staticmethod
+    def _contains_any(sprint: Sprint, ordinals: List[int]) -> bool:
+        """Whether any of the sorted day ordinals falls in the sprint"""
+        return (bisect.bisect_left(ordinals, sprint.start_date.toordinal())
+                < bisect.bisect_right(ordinals, sprint.end_date.toordinal()))
+
+    def swap_oncall(self, sprint: Sprint, scenario: CapacityScenario) -> Sprint:
+        """Copy of a sprint with the scenario's on-call swaps applied (the sprint itself if none apply)"""
+        swaps = [swap for swap in scenario.oncall_swaps
+                 if swap[0] <= sprint.end_date and swap[1] >= sprint.start_date]
+        if not swaps:
+            return sprint
+
+        resolver = self.calculator.get_oncall_resolver()
+        shifts = sprint.oncall_shifts
+        if not shifts and sprint.oncall_primary:
+            shifts = [(sprint.start_date, sprint.end_date, sprint.oncall_primary)]
+        swapped_shifts = shifts
+        for swap_start, swap_end, current, replacement in swaps:
+            current_employee = resolver.resolve(current)
+            next_shifts = []
+            for shift in swapped_shifts:
+                shift_start, shift_end, primary = shift
+                is_current = primary == current or (
+                    current_employee is not None and resolver.resolve(primary) is current_employee)
+                if not is_current or shift_start > swap_end or shift_end < swap_start:
+                    next_shifts.append(shift)
+                    continue
+                # Split the shift around the swapped days
+                if shift_start < swap_start:
+                    next_shifts.append((shift_start, swap_start - timedelta(days=1), primary))
+                next_shifts.append((max(shift_start, swap_start), min(shift_end, swap_end), replacement))
+                if shift_end > swap_end:
+                    next_shifts.append((swap_end + timedelta(days=1), shift_end, primary))
+            swapped_shifts = next_shifts
+
+        if swapped_shifts == shifts:
+            return sprint
+        return replace(sprint, oncall_primary=swapped_shifts[0][2], oncall_shifts=swapped_shifts)
+
+    def _patched_baseline(self, sprint: Sprint, baseline: SprintBaseline, employee_ids: Iterable[str],
+                          leave_index: LeaveIndex) -> SprintBaseline:
+        """Baseline of a sprint with the given employees' leave read from another leave index"""
+        sprint_manager = self.sprint_manager
+        holidays = baseline.holidays
+        positions = sorted(position for emp_id in employee_ids
+                           for position in self.positions[emp_id])
+        changed = [self.employees[position] for position in positions]
+
+        # Swap the changed employees' leave days into the baseline person-days
+        available_person_days = baseline.available_person_days
+        for employee in changed:
+            employee_holidays = holidays.get(employee.location, set())
+            available_person_days -= (
+                leave_index.count_leave_days(
+                    employee.emp_id, sprint.start_date, sprint.end_date, employee_holidays)
+                - self.leave_index.count_leave_days(
+                    employee.emp_id, sprint.start_date, sprint.end_date, employee_holidays))
+
+        # Swap the changed employees' status rows into the baseline statuses
+        changed_on_leave, changed_status = sprint_manager.member_leave_statuses(
+            sprint, holidays, changed, leave_index)
+        all_members_status = list(baseline.capacity.all_members_status)
+        for position, status in zip(positions, changed_status):
+            all_members_status[position] = status
+        changed_positions = set(positions)
+        on_leave = {id(employee) for employee, _ in changed_on_leave}
+        on_leave_positions = sorted(
+            [position for position in baseline.on_leave_positions
+             if position not in changed_positions]
+            + [position for position in positions if id(self.employees[position]) in on_leave])
+        members_on_leave = [all_members_status[position] for position in on_leave_positions]
+
+        capacity = sprint_manager._sprint_capacity(
+            sprint, members_on_leave, all_members_status, baseline.total_person_days,
+            available_person_days, sprint_manager.sprint_oncall_days(sprint, leave_index), holidays)
+        return SprintBaseline(holidays, baseline.total_person_days, available_person_days,
+                              on_leave_positions, capacity)
+
+
+class CapacityState(ScenarioEngine):
+    """Sprint capacities kept up to date as leave is edited one employee at a time
+
+    An edit adds or removes leave days of one employee and leave type. It
+    changes the calculator's leave entries in place, re-indexes only that
+    employee and recalculates only the sprints the edited days fall in,
+    patching their person-day and hour aggregates into the baseline. The
+    other sprints keep their SprintCapacity objects, so report fragments
+    rendered from them stay valid. Edits are not written back to the workbook.
+    """
+
+    def __init__(self, sprint_manager: 'SprintManager', sprints: List[Sprint],
+                 baselines: List[SprintBaseline] = None):
+        super().__init__(sprint_manager, sprints, baselines)
+        self.entries_by_emp_id = self.calculator.get_registry().leave_entries_by_emp_id(
+            self.calculator.leave_entries)
+
+    @property
+    def sprint_capacities(self) -> List[SprintCapacity]:
+        return self.baseline
+
+    def add_leave(self, emp_id: str, dates: Iterable[date], leave_type: str = 'planned',
+                  description: str = '') -> List[SprintCapacityDiff]:
+        """Add a leave entry for an employee"""
+        return self.apply(emp_id, leave_type, added_dates=dates, description=description)
+
+    def remove_leave(self, emp_id: str, dates: Iterable[date],
+                     leave_type: str = 'planned') -> List[SprintCapacityDiff]:
+        """Remove days from an employee's leave entries of a leave type"""
+        return self.apply(emp_id, leave_type, removed_dates=dates)
+
+    def apply(self, emp_id: str, leave_type: str, added_dates: Iterable[date] = (),
+              removed_dates: Iterable[date] = (), description: str = '') -> List[SprintCapacityDiff]:
+        """Remove and add leave days of one employee and leave type
+
+        Removed days are dropped from the employee's entries of that type
+        (entries left without days are deleted); added days become one new
+        entry, skipping the days the employee is already on leave (as in a
+        scenario overlay). Returns the change of each recalculated sprint.
+        """
+        if leave_type not in LeaveIndex.CAPACITY_LEAVE_TYPES:
+            raise ValueError(f"Leave edits must be one of "
+                             f"{', '.join(LeaveIndex.CAPACITY_LEAVE_TYPES)}, got '{leave_type}'")
+        if emp_id not in self.positions:
+            raise ValueError(f"Unknown employee: {emp_id}")
+        added_dates = sorted(set(added_dates))
+        removed = set(removed_dates)
+
+        # Edit the employee's entries, then the same entries in the full list
+        leave_entries = self.calculator.leave_entries
+        employee_entries = self.entries_by_emp_id.get(emp_id, [])
+        replaced: Dict[int, Optional[LeaveEntry]] = {}
+        edited_entries = []
+        for leave_entry in employee_entries:
+            if leave_entry.leave_type == leave_type and removed.intersection(leave_entry.leave_dates):
+                leave_dates = [leave_date for leave_date in leave_entry.leave_dates
+                               if leave_date not in removed]
+                leave_entry_after = replace(leave_entry, leave_dates=leave_dates) if leave_dates else None
+                replaced[id(leave_entry)] = leave_entry_after
+                if leave_entry_after is None:
+                    continue
+                leave_entry = leave_entry_after
+            edited_entries.append(leave_entry)
+        on_leave = {leave_date for leave_entry in edited_entries
+                    if leave_entry.leave_type != 'public_holiday'
+                    for leave_date in leave_entry.leave_dates}
+        added_dates = [leave_date for leave_date in added_dates if leave_date not in on_leave]
+        if added_dates:
+            employee = self.employees[self.positions[emp_id][0]]
+            edited_entries.append(LeaveEntry(employee=employee, leave_dates=added_dates,
+                                             leave_type=leave_type, description=description))
+        if not replaced and not added_dates:
+            return []
+
+        if replaced:
+            kept_entries = []
+            for leave_entry in leave_entries:
+                leave_entry = replaced.get(id(leave_entry), leave_entry)
+                if leave_entry is not None:
+                    kept_entries.append(leave_entry)
+            leave_entries[:] = kept_entries
+        if added_dates:
+            leave_entries.append(edited_entries[-1])
+        self.entries_by_emp_id[emp_id] = edited_entries
+
+        # Recalculate the sprints the edited days fall in against the re-indexed employee
+        leave_index = self.leave_index.reindexed({emp_id: edited_entries})
+        ordinals = sorted({leave_date.toordinal() for leave_date in itertools.chain(added_dates, removed)})
+        diffs = []
+        for number, (sprint, baseline) in enumerate(zip(self.sprints, self.baselines)):
+            if not self._contains_any(sprint, ordinals):
+                continue
+            patched = self._patched_baseline(sprint, baseline, [emp_id], leave_index)
+            self.baselines[number] = patched
+            diffs.append(SprintCapacityDiff(baseline.capacity, patched.capacity))
+        self.leave_index.commit(leave_index)
+
+        logger.info(f"Leave edit for {emp_id} ({leave_type}): {len(added_dates)} days added, "
+                    f"{len(removed)} days removed, {len(diffs)} sprints recalculated")
+        return diffs
+
+
 class ReportGenerator:
     """Generates capacity reports for scrum masters"""
 
     def __init__(self, calculator: SprintCapacityCalculator):
         self.calculator = calculator
+        # (report type, sprint number) -> (sprint capacity, rendered section)
+        self.fragments: Dict[Tuple[str, int], Tuple[SprintCapacity, str]] = {}
+
+    def sprint_fragment(self, report_type: str, capacity: SprintCapacity, render) -> str:
+        """Report section of a sprint, rendered again only when its capacity object changes
+
+        Incremental leave edits replace the SprintCapacity objects of the sprints
+        they change only, so only those sections are rendered again.
+        """
+        key = (report_type, capacity.sprint.number)
+        cached = self.fragments.get(key)
+        if cached is not None and cached[0] is capacity:
+            return cached[1]
+        fragment = render(capacity)
+        self.fragments[key] = (capacity, fragment)
+        return fragment
 
     def generate_text_report(self, sprint_capacities: List[SprintCapacity]) -> str:
         """Generate a text-based capacity report"""
         report_lines = []
 
-        # Calculate absolute sprint number from reference date (2025-12-31)
-        reference_date = datetime.strptime('2025-12-31', '%Y-%m-%d').date()
-
         report_lines.append("=" * 60)
         report_lines.append("SPRINT CAPACITY REPORT")
         report_lines.append("=" * 60)
@@ -1145,102 +3665,102 @@ class ReportGenerator:
         report_lines.append("")
 
         for capacity in sprint_capacities:
-            sprint = capacity.sprint
-            # Calculate absolute sprint number from reference date
-            days_from_reference = (sprint.start_date - reference_date).days
-            absolute_sprint_number = (days_from_reference // 14) + 1
-            report_lines.append(f"SPRINT {absolute_sprint_number}")
-            report_lines.append(
-                f"Period: {sprint.start_date.strftime('%Y-%m-%d')} to {sprint.end_date.strftime('%Y-%m-%d')}")
-            report_lines.append(f"Working Days: {capacity.working_days}")
-
-            # Add holiday counts
-            gcc_count = len(capacity.gcc_holidays) if hasattr(
-                capacity, 'gcc_holidays') else 0
-            us_count = len(capacity.us_holidays) if hasattr(
-                capacity, 'us_holidays') else 0
-            if gcc_count > 0 or us_count > 0:
-                report_lines.append("Holidays:")
-                if gcc_count > 0:
-                    report_lines.append(f"  GCC - {gcc_count}")
-                if us_count > 0:
-                    report_lines.append(f"  US - {us_count}")
+            report_lines.append(self.sprint_fragment(
+                'text', capacity, self._text_sprint_section))
 
-            report_lines.append(
-                f"GCC Members Count: {capacity.total_team_members}")
-            report_lines.append(
-                f"GCC Team Capacity: {capacity.capacity_percentage:.1f}%")
-            report_lines.append(
-                f"Ideal Capacity: {capacity.ideal_capacity_hours:.1f} hours")
-            report_lines.append(
-                f"Actual Capacity: {capacity.actual_capacity_hours:.1f} hours")
+        return "\n".join(report_lines)
 
-            # Add on-call information if available
-            if sprint.oncall_primary or sprint.oncall_secondary:
-                report_lines.append(
-                    f"On-Call Primary: {sprint.oncall_primary}")
-                report_lines.append(
-                    f"On-Call Secondary: {sprint.oncall_secondary}")
+    def _text_sprint_section(self, capacity: SprintCapacity) -> str:
+        """Text report section of one sprint"""
+        report_lines = []
+        sprint_calendar = self.calculator.get_sprint_calendar()
+        sprint = capacity.sprint
+        # Calculate absolute sprint number from the sprint calendar
+        absolute_sprint_number = sprint_calendar.number_for_date(sprint.start_date)
+        report_lines.append(f"SPRINT {absolute_sprint_number}")
+        report_lines.append(
+            f"Period: {sprint.start_date.strftime('%Y-%m-%d')} to {sprint.end_date.strftime('%Y-%m-%d')}")
+        report_lines.append(f"Working Days: {capacity.working_days}")
 
-            # Show all team members with their status
-            report_lines.append("\nTeam Member Status:")
-            report_lines.append("")
+        # Add holiday counts
+        holiday_counts = capacity.holiday_counts()
+        if holiday_counts:
+            report_lines.append("Holidays:")
+            for location, count in holiday_counts:
+                report_lines.append(f"  {location} - {count}")
 
-            # Create table header with both GCC and US Holiday columns
+        report_lines.append(
+            f"GCC Members Count: {capacity.total_team_members}")
+        report_lines.append(
+            f"GCC Team Capacity: {capacity.capacity_percentage:.1f}%")
+        report_lines.append(
+            f"Ideal Capacity: {capacity.ideal_capacity_hours:.1f} hours")
+        report_lines.append(
+            f"Actual Capacity: {capacity.actual_capacity_hours:.1f} hours")
+
+        # Add on-call information if available
+        if sprint.oncall_primary or sprint.oncall_secondary:
+            report_lines.append(
+                f"On-Call Primary: {sprint.oncall_primary}")
             report_lines.append(
-                f"{'Emp Id':<10} {'Emp Name':<30} {'Planned Leave':<20} {'GCC Holiday':<20} {'US Holiday':<20}")
-            report_lines.append("-" * 112)
+                f"On-Call Secondary: {sprint.oncall_secondary}")
 
-            for employee, reason in capacity.all_members_status:
-                # Parse the leave reason to separate by type
-                planned_leave = []
-                gcc_holiday = []
-                us_holiday = []
+        # Show all team members with their status
+        report_lines.append("\nTeam Member Status:")
+        report_lines.append("")
 
-                if reason != "Available":
-                    # Split by semicolon to get different leave types
-                    leave_parts = reason.split('; ')
-                    for part in leave_parts:
-                        if part.startswith('planned:'):
-                            dates = part.replace('planned:', '').strip()
-                            planned_leave.append(dates)
-                        elif part.startswith('public_holiday:'):
-                            dates = part.replace('public_holiday:', '').strip()
-                            # Determine if this is GCC or US holiday based on employee location
-                            if employee.location == 'US':
-                                us_holiday.append(dates)
-                            else:
-                                gcc_holiday.append(dates)
-                        # Note: optional_holiday is still used in capacity calculation but not displayed
-
-                planned_str = ', '.join(
-                    planned_leave) if planned_leave else '-'
-                gcc_str = ', '.join(gcc_holiday) if gcc_holiday else '-'
-                us_str = ', '.join(us_holiday) if us_holiday else '-'
-
-                # Truncate long strings for text display
-                planned_display = (
-                    planned_str[:17] + '...') if len(planned_str) > 20 else planned_str
-                gcc_display = (
-                    gcc_str[:17] + '...') if len(gcc_str) > 20 else gcc_str
-                us_display = (
-                    us_str[:17] + '...') if len(us_str) > 20 else us_str
-
-                report_lines.append(
-                    f"{employee.emp_id:<10} {employee.name:<30} {planned_display:<20} {gcc_display:<20} {us_display:<20}"
-                )
+        # Create table header with both GCC and US Holiday columns
+        report_lines.append(
+            f"{'Emp Id':<10} {'Emp Name':<30} {'Planned Leave':<20} {'GCC Holiday':<20} {'US Holiday':<20}")
+        report_lines.append("-" * 112)
+
+        for employee, reason in capacity.all_members_status:
+            # Parse the leave reason to separate by type
+            planned_leave = []
+            gcc_holiday = []
+            us_holiday = []
+
+            if reason != "Available":
+                # Split by semicolon to get different leave types
+                leave_parts = reason.split('; ')
+                for part in leave_parts:
+                    if part.startswith('planned:'):
+                        dates = part.replace('planned:', '').strip()
+                        planned_leave.append(dates)
+                    elif part.startswith('public_holiday:'):
+                        dates = part.replace('public_holiday:', '').strip()
+                        # Determine if this is GCC or US holiday based on employee location
+                        if employee.location == 'US':
+                            us_holiday.append(dates)
+                        else:
+                            gcc_holiday.append(dates)
+                    # Note: optional_holiday is still used in capacity calculation but not displayed
+
+            planned_str = ', '.join(
+                planned_leave) if planned_leave else '-'
+            gcc_str = ', '.join(gcc_holiday) if gcc_holiday else '-'
+            us_str = ', '.join(us_holiday) if us_holiday else '-'
+
+            # Truncate long strings for text display
+            planned_display = (
+                planned_str[:17] + '...') if len(planned_str) > 20 else planned_str
+            gcc_display = (
+                gcc_str[:17] + '...') if len(gcc_str) > 20 else gcc_str
+            us_display = (
+                us_str[:17] + '...') if len(us_str) > 20 else us_str
+
+            report_lines.append(
+                f"{employee.emp_id:<10} {employee.name:<30} {planned_display:<20} {gcc_display:<20} {us_display:<20}"
+            )
 
-            report_lines.append("-" * 40)
-            report_lines.append("")
+        report_lines.append("-" * 40)
+        report_lines.append("")
 
         return "\n".join(report_lines)
 
     def generate_html_report(self, sprint_capacities: List[SprintCapacity]) -> str:
         """Generate an HTML-based capacity report"""
 
-        # Calculate absolute sprint number from reference date (2025-12-31)
-        reference_date = datetime.strptime('2025-12-31', '%Y-%m-%d').date()
-
         html = """<!DOCTYPE html>
 <html>
 <head>
@@ -1456,38 +3976,43 @@ class ReportGenerator:
 """
 
         for capacity in sprint_capacities:
-            sprint = capacity.sprint
+            html += self.sprint_fragment('html', capacity, self._html_sprint_section)
 
-            # Calculate absolute sprint number from reference date
-            days_from_reference = (sprint.start_date - reference_date).days
-            absolute_sprint_number = (days_from_reference // 14) + 1
-
-            # Determine capacity status color
-            capacity_class = "good"
-            if capacity.capacity_percentage < 80:
-                capacity_class = "critical"
-            elif capacity.capacity_percentage < 90:
-                capacity_class = "warning"
+        html += """
+        </div>
+    </div>
+</body>
+</html>"""
+        return html
 
-            # Build holiday counts
-            gcc_count = len(
-                capacity.gcc_holidays) if capacity.gcc_holidays else 0
-            us_count = len(capacity.us_holidays) if capacity.us_holidays else 0
-            holiday_display = ""
-            if gcc_count > 0 or us_count > 0:
-                holiday_parts = []
-                if gcc_count > 0:
-                    holiday_parts.append(f"GCC - {gcc_count}")
-                if us_count > 0:
-                    holiday_parts.append(f"US - {us_count}")
-                holiday_display = "<br>".join(holiday_parts)
-            else:
-                holiday_display = "None"
+    def _html_sprint_section(self, capacity: SprintCapacity) -> str:
+        """HTML report section of one sprint"""
+        html = ""
+        sprint_calendar = self.calculator.get_sprint_calendar()
+        sprint = capacity.sprint
+
+        # Calculate absolute sprint number from the sprint calendar
+        absolute_sprint_number = sprint_calendar.number_for_date(sprint.start_date)
+
+        # Determine capacity status color
+        capacity_class = "good"
+        if capacity.capacity_percentage < 80:
+            capacity_class = "critical"
+        elif capacity.capacity_percentage < 90:
+            capacity_class = "warning"
+
+        # Build holiday counts
+        holiday_counts = capacity.holiday_counts()
+        if holiday_counts:
+            holiday_display = "<br>".join(
+                f"{location} - {count}" for location, count in holiday_counts)
+        else:
+            holiday_display = "None"
 
-            # Build on-call metric cells if available
-            oncall_cells = ""
-            if sprint.oncall_primary or sprint.oncall_secondary:
-                oncall_cells = f"""
+        # Build on-call metric cells if available
+        oncall_cells = ""
+        if sprint.oncall_primary or sprint.oncall_secondary:
+            oncall_cells = f"""
                     <td class="metric-card">
                         <div class="metric-label">On-Call Primary</div>
                         <div class="metric-value oncall">{sprint.oncall_primary or '-'}</div>
@@ -1497,7 +4022,7 @@ class ReportGenerator:
                         <div class="metric-value oncall">{sprint.oncall_secondary or '-'}</div>
                     </td>"""
 
-            html += f"""
+        html += f"""
             <!-- Sprint {absolute_sprint_number} -->
             <div class="sprint-section">
                 <div class="sprint-title">
@@ -1534,8 +4059,8 @@ class ReportGenerator:
                 </table>
             """
 
-            # Show all team members with their status
-            html += """
+        # Show all team members with their status
+        html += """
                 <div class="team-status-header">👥 Team Member Status</div>
 
                 <table class="team-table">
@@ -1551,53 +4076,53 @@ class ReportGenerator:
                     <tbody>
             """
 
-            for employee, reason in capacity.all_members_status:
-                # Parse the leave reason to separate by type
-                planned_leave = []
-                gcc_holiday = []
-                us_holiday = []
-
-                if reason != "Available":
-                    # Split by semicolon to get different leave types
-                    leave_parts = reason.split('; ')
-                    for part in leave_parts:
-                        if part.startswith('planned:'):
-                            dates = part.replace('planned:', '').strip()
-                            planned_leave.append(dates)
-                        elif part.startswith('public_holiday:'):
-                            dates = part.replace('public_holiday:', '').strip()
-                            # Determine if this is GCC or US holiday based on employee location
-                            if employee.location == 'US':
-                                us_holiday.append(dates)
-                            else:
-                                gcc_holiday.append(dates)
-
-                # Create badge HTML for planned leave
-                planned_str = '-'
-                if planned_leave:
-                    badges = [
-                        f'<span class="leave-badge leave-planned">{date}</span>' for date in planned_leave]
-                    planned_str = ''.join(badges)
-
-                # Create badge HTML for GCC holidays
-                gcc_str = '-'
-                if gcc_holiday:
-                    badges = [
-                        f'<span class="leave-badge leave-holiday">{date}</span>' for date in gcc_holiday]
-                    gcc_str = ''.join(badges)
-
-                # Create badge HTML for US holidays
-                us_str = '-'
-                if us_holiday:
-                    badges = [
-                        f'<span class="leave-badge leave-holiday">{date}</span>' for date in us_holiday]
-                    us_str = ''.join(badges)
-
-                # Highlight rows with any leave
-                row_class = ' class="on-leave"' if (
-                    planned_leave or gcc_holiday or us_holiday) else ''
+        for employee, reason in capacity.all_members_status:
+            # Parse the leave reason to separate by type
+            planned_leave = []
+            gcc_holiday = []
+            us_holiday = []
+
+            if reason != "Available":
+                # Split by semicolon to get different leave types
+                leave_parts = reason.split('; ')
+                for part in leave_parts:
+                    if part.startswith('planned:'):
+                        dates = part.replace('planned:', '').strip()
+                        planned_leave.append(dates)
+                    elif part.startswith('public_holiday:'):
+                        dates = part.replace('public_holiday:', '').strip()
+                        # Determine if this is GCC or US holiday based on employee location
+                        if employee.location == 'US':
+                            us_holiday.append(dates)
+                        else:
+                            gcc_holiday.append(dates)
+
+            # Create badge HTML for planned leave
+            planned_str = '-'
+            if planned_leave:
+                badges = [
+                    f'<span class="leave-badge leave-planned">{date}</span>' for date in planned_leave]
+                planned_str = ''.join(badges)
+
+            # Create badge HTML for GCC holidays
+            gcc_str = '-'
+            if gcc_holiday:
+                badges = [
+                    f'<span class="leave-badge leave-holiday">{date}</span>' for date in gcc_holiday]
+                gcc_str = ''.join(badges)
+
+            # Create badge HTML for US holidays
+            us_str = '-'
+            if us_holiday:
+                badges = [
+                    f'<span class="leave-badge leave-holiday">{date}</span>' for date in us_holiday]
+                us_str = ''.join(badges)
+
+            # Highlight rows with any leave
+            row_class = ' class="on-leave"' if (
+                planned_leave or gcc_holiday or us_holiday) else ''
 
-                html += f"""
+            html += f"""
                         <tr{row_class}>
                             <td>{employee.emp_id}</td>
                             <td>{employee.name}</td>
@@ -1607,17 +4132,12 @@ class ReportGenerator:
                         </tr>
                 """
 
-            html += """
+        html += """
                     </tbody>
                 </table>
             </div>
             """
 
-        html += """
-        </div>
-    </div>
-</body>
-</html>"""
         return html
 
     def generate_email_template(self, sprint_capacities: List[SprintCapacity]) -> str:
@@ -1630,8 +4150,8 @@ class ReportGenerator:
                 "Not enough sprints to generate email template (need at least 4)")
             return ""
 
-        # Use the same reference date as the text report for consistency
-        reference_date = datetime.strptime('2025-12-31', '%Y-%m-%d').date()
+        # Use the same sprint calendar as the text report for consistency
+        sprint_calendar = self.calculator.get_sprint_calendar()
 
         # Show next 2 upcoming sprints (skip previous and current)
         # Get indices 2 and 3 (Next and Next+1)
@@ -1641,10 +4161,8 @@ class ReportGenerator:
         # Calculate absolute sprint numbers for all sprints
         absolute_sprint_numbers = []
         for sprint_cap in sprints_to_show:
-            days_from_ref = (sprint_cap.sprint.start_date -
-                             reference_date).days
-            absolute_sprint_num = (days_from_ref // 14) + 1
-            absolute_sprint_numbers.append(absolute_sprint_num)
+            absolute_sprint_numbers.append(
+                sprint_calendar.number_for_date(sprint_cap.sprint.start_date))
 
         html = """<!DOCTYPE html>
 <html>
@@ -1883,18 +4401,10 @@ class ReportGenerator:
                 capacity_class = "warning"
 
             # Build holiday counts
-            gcc_count = len(
-                sprint_cap.gcc_holidays) if sprint_cap.gcc_holidays else 0
-            us_count = len(
-                sprint_cap.us_holidays) if sprint_cap.us_holidays else 0
-            holiday_display = ""
-            if gcc_count > 0 or us_count > 0:
-                holiday_parts = []
-                if gcc_count > 0:
-                    holiday_parts.append(f"GCC - {gcc_count}")
-                if us_count > 0:
-                    holiday_parts.append(f"US - {us_count}")
-                holiday_display = "<br>".join(holiday_parts)
+            holiday_counts = sprint_cap.holiday_counts()
+            if holiday_counts:
+                holiday_display = "<br>".join(
+                    f"{location} - {count}" for location, count in holiday_counts)
             else:
                 holiday_display = "None"
 
@@ -2163,39 +4673,117 @@ class SprintCapacityApp:
         self.sprint_manager = SprintManager(self.calculator)
         self.report_generator = ReportGenerator(self.calculator)
         self.email_sender = EmailSender(self.calculator)
+        self.parse_cache = ParsedWorkbookCache(self.calculator)
+        self.refresh_cache = False  # Re-parse and overwrite the cache even if it is valid
+        # Sprints and sprint baselines of the last analysis
+        self.sprints: List[Sprint] = []
+        self.sprint_baselines: List[SprintBaseline] = []
+
+    def load_workbook_data(self, excel_file: str) -> Tuple[List[Employee], List[LeaveEntry], List[OnCallSchedule]]:
+        """Parse employees, leave entries and on-call schedules, reusing the parse cache when valid"""
+        use_cache = self.calculator.config.get('parse_cache_enabled', True)
+        previous_sections = None
+        if use_cache and not self.refresh_cache:
+            cached = self.parse_cache.load(excel_file)
+            if cached is not None:
+                self.parser.stats = IngestionStats(file_path=excel_file, from_cache=True)
+                return cached
+            # Workbook changed: only re-parse the month sections that differ
+            previous_sections = self.parse_cache.load_sections(excel_file)
+
+        # Open the workbook once and read every sheet from that handle
+        self.parser.section_results = {}
+        with self.parser.open_session(excel_file) as session:
+            if self.calculator.config.get('excel_streaming', False):
+                employees, leave_entries = self.parser.parse_excel_file_streaming(
+                    excel_file, session)
+            else:
+                employees, leave_entries = self.parser.parse_excel_file(
+                    excel_file, session, previous_sections)
 
-    def run_capacity_analysis(self) -> bool:
-        """Run the complete capacity analysis process"""
-        try:
-            logger.info("Starting sprint capacity analysis...")
+            if not employees:
+                return employees, leave_entries, []
+
+            oncall_schedules = self.parser.parse_oncall_schedules(
+                excel_file, session)
+
+        if use_cache:
+            self.parse_cache.save(
+                excel_file, employees, leave_entries, oncall_schedules,
+                self.parser.section_results)
+        return employees, leave_entries, oncall_schedules
 
-            # Step 1: Parse Excel data
+    def export_snapshot(self, snapshot_file: str) -> bool:
+        """Parse the Excel file and write the parsed data to a snapshot file"""
+        try:
             excel_file = self.calculator.config['excel_file_path']
             if not os.path.exists(excel_file):
                 logger.error(f"Excel file not found: {excel_file}")
                 return False
 
-            employees, leave_entries = self.parser.parse_excel_file(excel_file)
+            employees, leave_entries, oncall_schedules = self.load_workbook_data(
+                excel_file)
+            CapacitySnapshot.export(
+                snapshot_file, employees, leave_entries, oncall_schedules)
+            return True
+
+        except Exception as e:
+            logger.error(f"Error exporting snapshot: {e}")
+            return False
+
+    def run_capacity_analysis(self, horizon: int = None) -> bool:
+        """Run the complete capacity analysis process
+
+        horizon is the number of upcoming sprints to forecast after the current
+        one (default: the 'forecast_horizon' config key, or the next two sprints).
+        """
+        try:
+            logger.info("Starting sprint capacity analysis...")
+
+            # Step 1: Parse Excel data (or load a pre-parsed snapshot)
+            snapshot_file = self.calculator.config.get('snapshot_path', '')
+            if snapshot_file:
+                if not os.path.exists(snapshot_file):
+                    logger.error(f"Snapshot file not found: {snapshot_file}")
+                    return False
+                employees, leave_entries, oncall_schedules, holiday_calendar = CapacitySnapshot.load(
+                    snapshot_file)
+                self.parser.stats = IngestionStats(file_path=snapshot_file, from_snapshot=True)
+            else:
+                excel_file = self.calculator.config['excel_file_path']
+                if not os.path.exists(excel_file):
+                    logger.error(f"Excel file not found: {excel_file}")
+                    return False
+
+                employees, leave_entries, oncall_schedules = self.load_workbook_data(
+                    excel_file)
+                holiday_calendar = None
             self.calculator.employees = employees
             self.calculator.leave_entries = leave_entries
+            if holiday_calendar is not None:
+                self.calculator.set_holiday_calendar(holiday_calendar)
 
             if not employees:
                 logger.warning("No employees found in Excel file")
                 return False
 
-            # Step 1.5: Parse on-call schedules
-            oncall_schedules = self.parser.parse_oncall_schedules(excel_file)
+            # Step 1.5: On-call schedules (parsed from the same workbook)
             self.calculator.oncall_schedules = oncall_schedules
 
+            # Collect public holidays into one calendar per location, then build the
+            # leave index and calendar once for all sprint calculations
+            self.calculator.collapse_holidays()
+            self.calculator.get_leave_index()
+            self.calculator.get_calendar()
+
             # Step 2: Calculate sprint capacities
+            if horizon is None:
+                horizon = self.calculator.config.get('forecast_horizon') or DEFAULT_HORIZON
             sprints = self.sprint_manager.get_current_and_upcoming_sprints(
-                oncall_schedules)
-            sprint_capacities = []
-
-            for sprint in sprints:
-                capacity = self.sprint_manager.calculate_sprint_capacity(
-                    sprint)
-                sprint_capacities.append(capacity)
+                oncall_schedules, horizon)
+            self.sprint_baselines = self.sprint_manager.calculate_sprint_baselines(sprints)
+            self.sprints = sprints
+            sprint_capacities = [baseline.capacity for baseline in self.sprint_baselines]
 
             # Step 3: Generate reports
             text_report = self.report_generator.generate_text_report(
@@ -2334,6 +4922,20 @@ def main():
     parser.add_argument('--analyze', action='store_true',
                         help='Run capacity analysis')
     parser.add_argument('--excel-file', help='Override Excel file path')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Parse the Excel file without reading or writing the parse cache')
+    parser.add_argument('--refresh-cache', action='store_true',
+                        help='Re-parse the Excel file and overwrite the parse cache')
+    parser.add_argument('--ingestion-stats', action='store_true',
+                        help='Print row counts and per-sheet/per-section parse timings')
+    parser.add_argument('--export-snapshot', metavar='SNAPSHOT_FILE',
+                        help='Parse the Excel file and save the parsed data to a .npz snapshot')
+    parser.add_argument('--from-snapshot', metavar='SNAPSHOT_FILE',
+                        help='Run analysis from a .npz snapshot instead of the Excel file')
+    parser.add_argument('--horizon', type=int, metavar='N',
+                        help='Forecast capacity for the next N sprints after the current one (default: 2)')
+    parser.add_argument('--capacity-engine', choices=CAPACITY_ENGINES,
+                        help='Calculate sprints one at a time (loop) or all at once (matrix)')
     parser.add_argument('--output-dir', default='.',
                         help='Output directory for reports')
 
@@ -2351,14 +4953,41 @@ def main():
     if args.excel_file:
         app.calculator.config['excel_file_path'] = args.excel_file
 
+    # Parse cache switches
+    if args.no_cache:
+        app.calculator.config['parse_cache_enabled'] = False
+    if args.refresh_cache:
+        app.refresh_cache = True
+
+    # Load pre-parsed data from a snapshot if specified
+    if args.from_snapshot:
+        app.calculator.config['snapshot_path'] = args.from_snapshot
+    if args.capacity_engine:
+        app.calculator.config['capacity_engine'] = args.capacity_engine
+    if args.horizon is not None:
+        if args.horizon < 1:
+            parser.error("--horizon must be at least 1")
+        app.calculator.config['forecast_horizon'] = args.horizon
+
     # Run setup if requested
     if args.setup:
         app.setup_configuration()
         return
 
+    # Export snapshot if requested (analysis only runs when also asked for)
+    if args.export_snapshot:
+        if not app.export_snapshot(args.export_snapshot):
+            print("❌ Snapshot export failed. Check logs for details.")
+            return 1
+        print(f"✅ Snapshot saved to {args.export_snapshot}")
+        if not args.analyze:
+            return 0
+
     # Run analysis if requested or by default
     if args.analyze or not any([args.setup]):
         success = app.run_capacity_analysis()
+        if args.ingestion_stats:
+            print(app.parser.stats.format_table())
         if not success:
             print("❌ Capacity analysis failed. Check logs for details.")
             return 1
@@ -0,0 +1,76 @@
+"""Test that extracting a block of rows at once gives the same results as parsing row by row"""
+from dataclasses import asdict
+from datetime import datetime
+
+import numpy as np
+
+from sprint_capacity_app import EmployeeRegistry, ExcelDataParser, IngestionStats, SprintCapacityCalculator
+
+columns = ['Finance Systems', 'Unnamed: 1', datetime(2026, 3, 1), 'Location', 'Holiday',
+           'Optional Holiday', 'Opting?', 'Unnamed: 7']
+column_headers = {columns[2]: 'Planned Leave'}
+nan = float('nan')
+
+# Cells the sheet can hold: numbers, padded text, blanks, header text, repeated
+# texts across rows, opting spellings, unknown or missing locations, a repeated employee
+rows = np.array([
+    [5101, 'Asha', '2, 3', 'GCC', '6', '17', 'Yes', None],
+    [5102, 'Ben ', 16, ' US ', None, '17', 'no', nan],
+    [5103, nan, 16.0, 'UK', 'Holiday', '17', ' y ', ''],
+    [5104, 'Dev', '  ', nan, '', None, 'TRUE', 'NA'],
+    [5105, 'Esi', 'leave', 'US', '6', '20 to 24', nan, '2, 3'],
+    [5101, 'Asha', '9 to 11', 'GCC', None, nan, 'Yes', '  9th  '],
+    [' 5106 ', 'Femi', '30-31', 'gcc', 'Public Holiday', '31', 'True', 'No'],
+], dtype=object)
+
+calculator = SprintCapacityCalculator('config.json')
+parser = ExcelDataParser(calculator)
+positions = parser._column_positions(columns, columns[0], columns[1], 'Location')
+layout = parser._leave_column_layout(columns, column_headers, columns[0], columns[1])
+
+
+def entry_values(leave_entries):
+    return [(asdict(entry.employee), list(entry.leave_dates), entry.leave_type, entry.description)
+            for entry in leave_entries]
+
+
+def counters():
+    return {name: getattr(parser.stats, name) for name in ['cells_inspected', 'date_strings_parsed', 'parse_failures']}
+
+
+print("=" * 80)
+print("BLOCK EXTRACTION TEST")
+print("=" * 80)
+
+all_passed = True
+
+for label, block in [("All rows", rows), ("Single row", rows[:1]), ("Empty block", rows[:0])]:
+    parser.stats = IngestionStats()
+    row_registry = EmployeeRegistry()
+    row_entries = []
+    for row in block:
+        _, entries = parser._employee_row_entries(row, 3, 2026, positions, layout, row_registry)
+        row_entries.extend(entries)
+    row_counters = counters()
+
+    parser.stats = IngestionStats()
+    block_registry = EmployeeRegistry()
+    block_entries = parser._block_leave_entries(block, 3, 2026, positions, layout, block_registry)
+    block_counters = counters()
+
+    passed = (entry_values(block_entries) == entry_values(row_entries)
+              and [asdict(employee) for employee in block_registry.employees]
+              == [asdict(employee) for employee in row_registry.employees]
+              and block_counters == row_counters)
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} {label}: {len(block_entries)} leave entries for "
+          f"{len(block_registry.employees)} employees, {block_counters}")
+
+# Entries of the same employee share the interned Employee, as row by row
+block_entries = parser._block_leave_entries(rows, 3, 2026, positions, layout, EmployeeRegistry())
+asha = [entry.employee for entry in block_entries if entry.employee.emp_id == '5101']
+passed = len(asha) > 1 and all(employee is asha[0] for employee in asha)
+all_passed = all_passed and passed
+print(f"{'✅' if passed else '❌'} Repeated employee interned once across {len(asha)} entries")
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
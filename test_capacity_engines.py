@@ -0,0 +1,35 @@
+"""Test that the matrix capacity engine gives the same sprint capacities as the loop engine"""
+from datetime import datetime
+
+from sprint_capacity_app import SprintCapacityCalculator, ExcelDataParser, SprintManager
+
+calculator = SprintCapacityCalculator('config.json')
+parser = ExcelDataParser(calculator)
+excel_path = calculator.config['excel_file_path']
+
+calculator.employees, calculator.leave_entries = parser.parse_excel_file(excel_path)
+calculator.oncall_schedules = parser.parse_oncall_schedules(excel_path)
+
+sprint_manager = SprintManager(calculator)
+first_sprint_start = datetime.strptime(calculator.config['sprint_start_date'], '%Y-%m-%d').date()
+sprints = sprint_manager.calculate_sprints(first_sprint_start, 26, calculator.oncall_schedules)
+
+calculator.config['capacity_engine'] = 'loop'
+loop_capacities = sprint_manager.calculate_sprint_capacities(sprints)
+calculator.config['capacity_engine'] = 'matrix'
+matrix_capacities = sprint_manager.calculate_sprint_capacities(sprints)
+
+print("=" * 80)
+print("CAPACITY ENGINE TEST")
+print("=" * 80)
+
+all_passed = len(loop_capacities) == len(matrix_capacities) == len(sprints)
+for loop_capacity, matrix_capacity in zip(loop_capacities, matrix_capacities):
+    passed = vars(loop_capacity) == vars(matrix_capacity)
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Sprint {matrix_capacity.sprint.number}: "
+          f"ideal {matrix_capacity.ideal_capacity_hours}h, "
+          f"actual {matrix_capacity.actual_capacity_hours}h "
+          f"({matrix_capacity.capacity_percentage:.1f}%)")
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
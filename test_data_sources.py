@@ -0,0 +1,37 @@
+"""Test that the xlsx, openpyxl and CSV data sources parse the same data"""
+import os
+import tempfile
+
+from sprint_capacity_app import SprintCapacityCalculator, ExcelDataParser
+
+calculator = SprintCapacityCalculator('config.json')
+parser = ExcelDataParser(calculator)
+excel_path = calculator.config['excel_file_path']
+
+print("=" * 80)
+print("DATA SOURCE TEST")
+print("=" * 80)
+
+with tempfile.TemporaryDirectory() as export_dir:
+    # Export the year sheet and the on-call sheet the way the nightly job does
+    with parser.open_session(excel_path) as session:
+        sheet_name = parser.select_sheet(session.sheet_names)
+        csv_path = os.path.join(export_dir, f"{sheet_name}.csv")
+        session.read_sheet(sheet_name).to_csv(csv_path, index=False)
+        oncall_path = os.path.join(export_dir, "oncall.csv")
+        if session.has_sheet('On Call Schedules'):
+            session.read_sheet('On Call Schedules').to_csv(oncall_path, index=False)
+            calculator.config['oncall_csv_path'] = oncall_path
+
+    results = {}
+    for data_source, path in [('xlsx', excel_path), ('openpyxl', excel_path), ('csv', csv_path)]:
+        calculator.config['data_source'] = data_source
+        with parser.open_session(path) as session:
+            employees, leave_entries = parser.parse_excel_file(path, session)
+            oncall_schedules = parser.parse_oncall_schedules(path, session)
+        results[data_source] = (employees, leave_entries, oncall_schedules)
+        print(f"{data_source:>8}: {len(employees)} employees, {len(leave_entries)} leave entries, "
+              f"{len(oncall_schedules)} on-call schedules")
+
+all_match = all(result == results['xlsx'] for result in results.values())
+print(f"\nStatus: {'✅ PASS' if all_match else '❌ FAIL'}")
@@ -0,0 +1,38 @@
+"""Compare the single-pass date tokenizer with the regex pattern passes on real cell values"""
+import time
+
+import pandas as pd
+
+from sprint_capacity_app import SprintCapacityCalculator, LeaveDateParser
+
+calculator = SprintCapacityCalculator('config.json')
+excel_path = calculator.config['excel_file_path']
+
+# Every text cell of every sheet is a candidate date string
+corpus = []
+for sheet_name, df in pd.read_excel(excel_path, sheet_name=None).items():
+    corpus.extend(str(value).strip() for value in df.to_numpy().ravel()
+                  if isinstance(value, str) and value.strip())
+
+print("=" * 80)
+print("DATE TOKENIZER TEST")
+print("=" * 80)
+print(f"Corpus: {len(corpus)} cell values ({len(set(corpus))} distinct)")
+
+mismatches = [value for value in corpus
+              if LeaveDateParser.tokenize(value) != LeaveDateParser._pattern_spans(value)]
+print(f"Mismatching day spans: {len(mismatches)}")
+for value in mismatches[:10]:
+    print(f"  ❌ '{value}': {LeaveDateParser.tokenize(value)} vs {LeaveDateParser._pattern_spans(value)}")
+
+repeat = max(1, 20000 // max(len(corpus), 1))
+for label, scan in [("Single-pass tokenizer", LeaveDateParser.tokenize),
+                    ("Regex pattern passes", LeaveDateParser._pattern_spans)]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for value in corpus:
+            scan(value)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24}{elapsed * 1e6 / (repeat * len(corpus)):>8.2f} µs per cell")
+
+print(f"\nStatus: {'✅ PASS' if not mismatches else '❌ FAIL'}")
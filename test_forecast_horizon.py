@@ -0,0 +1,41 @@
+"""Test that the forecast horizon controls how many upcoming sprints are analyzed"""
+from datetime import date
+
+from sprint_capacity_app import DEFAULT_HORIZON, SprintCapacityCalculator, SprintManager
+
+calculator = SprintCapacityCalculator('config.json')
+sprint_manager = SprintManager(calculator)
+current_number = max(1, calculator.get_sprint_calendar().number_for_date(date.today()))
+first_number = max(1, current_number - 1)
+
+print("=" * 80)
+print("FORECAST HORIZON TEST")
+print("=" * 80)
+
+all_passed = True
+for horizon in (None, 1, 6, 26):
+    sprints = sprint_manager.get_current_and_upcoming_sprints(horizon=horizon)
+    expected = (horizon or DEFAULT_HORIZON) + 2
+    numbers = [s.number for s in sprints]
+    passed = (len(sprints) == expected and
+              numbers == list(range(first_number, first_number + expected)) and
+              current_number in numbers and
+              all(a.end_date < b.start_date for a, b in zip(sprints, sprints[1:])))
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Horizon {horizon}: Sprints {numbers[0]}-{numbers[-1]} ({len(sprints)} sprints)")
+
+capacities = sprint_manager.calculate_sprint_capacities(
+    sprint_manager.get_current_and_upcoming_sprints(horizon=12))
+capacities_ok = len(capacities) == 14
+all_passed = all_passed and capacities_ok
+print(f"{'✅' if capacities_ok else '❌'} Capacity calculated for {len(capacities)} sprints")
+
+try:
+    sprint_manager.get_current_and_upcoming_sprints(horizon=0)
+    invalid_ok = False
+except ValueError:
+    invalid_ok = True
+all_passed = all_passed and invalid_ok
+print(f"{'✅' if invalid_ok else '❌'} Zero-sprint horizon is rejected")
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
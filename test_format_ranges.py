@@ -0,0 +1,60 @@
+"""Test that formatting many date lists as ranges at once matches format_dates_as_ranges per list"""
+import random
+from datetime import date, timedelta
+
+from sprint_capacity_app import SprintCapacityCalculator
+
+calculator = SprintCapacityCalculator('config.json')
+calendar = calculator.get_calendar()
+
+date_lists = [
+    [],
+    [date(2026, 2, 16)],
+    [date(2026, 2, 16) + timedelta(days=offset) for offset in range(9)],
+    [date(2026, 2, 20), date(2026, 2, 16), date(2026, 2, 18), date(2026, 2, 17), date(2026, 2, 21)],
+    # Runs across a month end and a year end
+    [date(2026, 1, 30), date(2026, 1, 31), date(2026, 2, 1), date(2026, 12, 31), date(2027, 1, 1)],
+    # A day repeated in two cells
+    [date(2026, 3, 4), date(2026, 3, 4), date(2026, 3, 5)],
+    [],
+    # Outside the calendar's years, so the day table is extended
+    [date(2024, 2, 28), date(2024, 2, 29), date(2024, 3, 1), date(2029, 7, 4)],
+]
+random.seed(15)
+for _ in range(200):
+    start = date(2025, 1, 1) + timedelta(days=random.randrange(3 * 365))
+    date_lists.append([start + timedelta(days=random.randrange(40)) for _ in range(random.randrange(12))])
+
+ordinals = [day.toordinal() for dates in date_lists for day in dates]
+groups = [group for group, dates in enumerate(date_lists) for _ in dates]
+
+print("=" * 80)
+print("BATCH RANGE FORMATTING TEST")
+print("=" * 80)
+
+formatted = calendar.format_ranges(ordinals, groups, len(date_lists))
+expected = [calculator.format_dates_as_ranges(dates) for dates in date_lists]
+
+all_passed = len(formatted) == len(date_lists)
+for dates, result, expected_result in list(zip(date_lists, formatted, expected))[:8]:
+    passed = result == expected_result
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} {len(dates)} dates: '{result}'")
+
+mismatches = sum(result != expected_result for result, expected_result in zip(formatted, expected))
+all_passed = all_passed and mismatches == 0
+print(f"{'✅' if mismatches == 0 else '❌'} {len(date_lists) - 8} random lists: {mismatches} differ")
+
+# Lists given in any order (groups interleaved) give the same strings
+shuffled = list(zip(ordinals, groups))
+random.shuffle(shuffled)
+passed = calendar.format_ranges([ordinal for ordinal, _ in shuffled], [group for _, group in shuffled],
+                                len(date_lists)) == formatted
+all_passed = all_passed and passed
+print(f"{'✅' if passed else '❌'} Interleaved input gives the same strings")
+
+passed = calendar.format_ranges([], [], 3) == ["", "", ""]
+all_passed = all_passed and passed
+print(f"{'✅' if passed else '❌'} No dates gives empty strings")
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
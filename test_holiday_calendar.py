@@ -0,0 +1,89 @@
+"""Test collapsing per-employee public holiday entries into a per-location holiday calendar"""
+import os
+import shutil
+import tempfile
+from datetime import date, datetime
+
+import openpyxl
+
+from sprint_capacity_app import (Employee, ExcelDataParser, HolidayCalendar, LeaveEntry, ReportGenerator,
+                                 SprintCapacityCalculator, SprintManager, Sprint)
+
+calculator = SprintCapacityCalculator('config.json')
+employees = [
+    Employee(emp_id="1001", name="Alice", location="GCC"),
+    Employee(emp_id="1002", name="Bob", location="GCC"),
+    Employee(emp_id="1003", name="Carol", location="US"),
+    Employee(emp_id="1004", name="Dan", location="UK"),
+]
+gcc_days = [date(2026, 1, 1), date(2026, 1, 15)]
+calculator.employees = employees
+calculator.leave_entries = [
+    LeaveEntry(employee=employees[0], leave_dates=gcc_days, leave_type='public_holiday', description='1, 15'),
+    LeaveEntry(employee=employees[1], leave_dates=gcc_days, leave_type='public_holiday', description='1, 15'),
+    LeaveEntry(employee=employees[1], leave_dates=[date(2026, 1, 6)], leave_type='planned', description='6'),
+    LeaveEntry(employee=employees[2], leave_dates=[date(2026, 1, 19)], leave_type='public_holiday', description='19'),
+    LeaveEntry(employee=employees[3], leave_dates=[date(2026, 1, 5)], leave_type='public_holiday', description='5'),
+]
+sprint = Sprint(number=1, start_date=date(2025, 12, 31), end_date=date(2026, 1, 13))
+sprint_manager = SprintManager(calculator)
+
+before = sprint_manager.calculate_sprint_capacity(sprint)
+calculator.collapse_holidays()
+holiday_calendar = calculator.get_holiday_calendar()
+after = sprint_manager.calculate_sprint_capacity(sprint)
+report_generator = ReportGenerator(calculator)
+text_report = report_generator.generate_text_report([after])
+html_report = report_generator.generate_html_report([after])
+
+# Locations are read from the sheet in upper case (blank is GCC)
+temp_dir = tempfile.mkdtemp()
+excel_file = os.path.join(temp_dir, 'locations.xlsx')
+workbook = openpyxl.Workbook()
+workbook.active.title = calculator.config['excel_sheet_name']
+for row in [
+    ['Finance Systems', None, datetime(2026, 1, 1), 'Location', 'Holiday', 'Optional Holiday', 'Opting?'],
+    ['Emp Id', 'Emp Name', 'Planned Leave', None, None, None, None],
+    [1001, 'Alice', '6', 'GCC', '1, 15', None, 'No'],
+    [1003, 'Carol', None, 'US', '19', None, 'NA'],
+    [1004, 'Dan', '7', ' UK ', '5', None, 'No'],
+    [1005, 'Eve', None, None, None, None, 'No'],
+    [1006, 'Femi', None, 'us', '19', None, 'NA'],
+    [1007, 'Gus', '8', 'Uk', '5', None, 'No'],
+]:
+    workbook.active.append(row)
+workbook.save(excel_file)
+parser = ExcelDataParser(calculator)
+try:
+    parsed = [parse(excel_file) for parse in (parser.parse_excel_file, parser.parse_excel_file_streaming)]
+finally:
+    shutil.rmtree(temp_dir)
+parsed_locations = [[employee.location for employee in employees] for employees, _ in parsed]
+parsed_holidays = [HolidayCalendar.from_entries(leave_entries).holidays for _, leave_entries in parsed]
+
+print("=" * 80)
+print("HOLIDAY CALENDAR TEST")
+print("=" * 80)
+
+checks = [
+    ("Leave table keeps only non-holiday entries", len(calculator.leave_entries) == 1),
+    ("One holiday list per location", holiday_calendar.holidays == {
+        'GCC': tuple(gcc_days), 'US': (date(2026, 1, 19),), 'UK': (date(2026, 1, 5),)}),
+    ("Sprint holidays by location", sprint_manager.sprint_holidays(sprint) == {
+        'GCC': {date(2026, 1, 1)}, 'US': set(), 'UK': {date(2026, 1, 5)}}),
+    ("UK employee gets UK holidays", after.all_members_status[3] == (employees[3], "public_holiday: Jan 05")),
+    ("Capacity unchanged after collapsing", vars(before) == vars(after)),
+    ("Report holiday counts list every location", before.holiday_counts() == [('GCC', 1), ('UK', 1)]
+     and "Holidays:\n  GCC - 1\n  UK - 1\n" in text_report and "GCC - 1<br>UK - 1" in html_report),
+    ("Parsed locations in upper case", parsed_locations == [['GCC', 'US', 'UK', 'GCC', 'US', 'UK']] * 2),
+    ("Parsed UK holidays in their own calendar", parsed_holidays == [{
+        'GCC': (date(2026, 1, 1), date(2026, 1, 15)), 'US': (date(2026, 1, 19),),
+        'UK': (date(2026, 1, 5),)}] * 2),
+]
+
+all_passed = True
+for description, passed in checks:
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} {description}")
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
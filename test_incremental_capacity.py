@@ -0,0 +1,115 @@
+"""Test that single leave edits update capacities and report sections like a full recalculation"""
+from datetime import date, timedelta
+
+from sprint_capacity_app import (CapacityScenario, CapacityState, Employee, LeaveEntry, LeaveIndex,
+                                 OnCallSchedule, ReportGenerator, ScenarioEngine,
+                                 SprintCapacityCalculator, SprintManager)
+
+# Meena is on call for the whole quarter, so her leave also changes the on-call hours
+meena = Employee(emp_id="2001", name="Meena", location="GCC")
+omar = Employee(emp_id="2002", name="Omar", location="US")
+priya = Employee(emp_id="2003", name="Priya", location="GCC")
+
+calculator = SprintCapacityCalculator('config.json')
+calculator.config['capacity_engine'] = 'matrix'
+calculator.employees = [meena, omar, priya]
+calculator.leave_entries = [
+    LeaveEntry(employee=meena, leave_dates=[date(2026, 11, 16), date(2026, 11, 17)], leave_type='planned', description=''),
+    LeaveEntry(employee=omar, leave_dates=[date(2026, 11, 26), date(2026, 11, 27)], leave_type='planned', description=''),
+    LeaveEntry(employee=priya, leave_dates=[date(2026, 12, 4)], leave_type='optional_holiday', description=''),
+]
+calculator.oncall_schedules = [
+    OnCallSchedule(start_date=date(2026, 10, 1), end_date=date(2026, 12, 31), primary="Meena", secondary="Omar"),
+]
+
+sprint_manager = SprintManager(calculator)
+sprints = list(calculator.get_sprint_calendar().sprints_between(date(2026, 10, 19), date(2026, 12, 27)))
+for sprint in sprints:
+    sprint_manager.assign_oncall_to_sprint(sprint, calculator.oncall_schedules)
+
+# Start from the matrix engine's results, as the dashboard does after an analysis
+state = CapacityState(sprint_manager, sprints, sprint_manager.calculate_sprint_baselines(sprints))
+report_generator = ReportGenerator(calculator)
+report_generator.generate_text_report(state.sprint_capacities)
+fragments_before = dict(report_generator.fragments)
+
+print("=" * 80)
+print("INCREMENTAL CAPACITY TEST")
+print("=" * 80)
+
+# What a scenario says re-adding Meena's Nov 16 does, before the edit is made
+already_on_leave = ScenarioEngine(sprint_manager, sprints).evaluate(
+    CapacityScenario("Again").add_leave("2001", [date(2026, 11, 16)]))
+
+edits = [
+    ("Meena re-adds a day she is already on leave", lambda: state.add_leave("2001", [date(2026, 11, 16)])),
+    ("Meena re-adds it again", lambda: state.add_leave("2001", [date(2026, 11, 16)])),
+    ("Meena (on call) books Nov 23-25",
+     lambda: state.add_leave("2001", [date(2026, 11, 23) + timedelta(days=offset) for offset in range(3)])),
+    ("Omar cancels Nov 27", lambda: state.remove_leave("2002", [date(2026, 11, 27)])),
+    ("Priya cancels her only optional holiday", lambda: state.remove_leave("2003", [date(2026, 12, 4)], 'optional_holiday')),
+    ("Meena moves Nov 17 to Dec 08", lambda: state.apply("2001", 'planned', [date(2026, 12, 8)], [date(2026, 11, 17)])),
+]
+all_passed = True
+recalculated = set()
+changes = {}
+for label, edit in edits:
+    before = list(state.sprint_capacities)
+    diffs = edit()
+    changes[label] = [(diff.sprint_number, diff.actual_hours_change) for diff in diffs]
+    changed = {diff.sprint_number for diff in diffs}
+    recalculated |= changed
+    expected = [sprint_manager.calculate_sprint_capacity(sprint) for sprint in sprints]
+    passed = all(vars(capacity) == vars(expected_capacity)
+                 for capacity, expected_capacity in zip(state.sprint_capacities, expected))
+    passed = passed and all(capacity is previous for capacity, previous in zip(state.sprint_capacities, before)
+                            if capacity.sprint.number not in changed)
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} {label}: " + (", ".join(
+        f"Sprint {diff.sprint_number} {diff.actual_hours_change:+.1f} hours" for diff in diffs) or "no sprint changed"))
+
+# Adding a day already on leave changes nothing, as in the scenario engine
+repeat_ok = (changes[edits[0][0]] == changes[edits[1][0]] == [] and
+             [diff.actual_hours_change for diff in already_on_leave.diffs] == [0])
+all_passed = all_passed and repeat_ok
+print(f"{'✅' if repeat_ok else '❌'} Days already on leave are not counted twice")
+
+# Meena's three days cost her on-call hours per day, not the full working day
+oncall_hours = (calculator.config.get('hours_per_day', 6)
+                - calculator.config.get('oncall_primary_hours_reduction', 3))
+oncall_sprint = calculator.get_sprint_calendar().sprint_for_date(date(2026, 11, 23))
+oncall_ok = changes[edits[2][0]] == [(oncall_sprint.number, -3 * oncall_hours)]
+all_passed = all_passed and oncall_ok
+print(f"{'✅' if oncall_ok else '❌'} On-call leave reduces the on-call hours: {changes[edits[2][0]]}")
+
+index_ok = (calculator.get_leave_index() is state.leave_index and
+            {emp_id: days for emp_id, days in state.leave_index.display_days.items() if days[0]}
+            == LeaveIndex(calculator.leave_entries).display_days)
+entries_ok = [(entry.employee.emp_id, entry.leave_dates) for entry in calculator.leave_entries] == [
+    ("2001", [date(2026, 11, 16)]),
+    ("2002", [date(2026, 11, 26)]),
+    ("2001", [date(2026, 11, 23), date(2026, 11, 24), date(2026, 11, 25)]),
+    ("2001", [date(2026, 12, 8)]),
+]
+all_passed = all_passed and index_ok and entries_ok
+print(f"{'✅' if index_ok else '❌'} Leave index updated in place")
+print(f"{'✅' if entries_ok else '❌'} Leave entries edited: {len(calculator.leave_entries)} entries")
+
+text_report = report_generator.generate_text_report(state.sprint_capacities)
+fresh_report = ReportGenerator(calculator).generate_text_report(state.sprint_capacities)
+reused = [number for (_, number), (_, fragment) in report_generator.fragments.items()
+          if fragments_before[('text', number)][1] is fragment]
+fragments_ok = (text_report.split('\n')[4:] == fresh_report.split('\n')[4:] and
+                reused == [sprint.number for sprint in sprints if sprint.number not in recalculated])
+all_passed = all_passed and fragments_ok
+print(f"{'✅' if fragments_ok else '❌'} Report sections reused for Sprints {reused}")
+
+try:
+    state.add_leave("2001", [date(2026, 11, 2)], 'public_holiday')
+    invalid_ok = False
+except ValueError:
+    invalid_ok = True
+all_passed = all_passed and invalid_ok
+print(f"{'✅' if invalid_ok else '❌'} Public holiday edits are rejected")
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
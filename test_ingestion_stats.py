@@ -0,0 +1,71 @@
+"""Test the ingestion counters of a workbook parse against a sheet with known contents"""
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+import openpyxl
+
+from sprint_capacity_app import ExcelDataParser, SprintCapacityCalculator
+
+# Two month sections. The leave columns are the month column, Location, Holiday,
+# Optional Holiday and Opting?, so every employee row has 5 cells inspected.
+rows = [
+    ['Finance Systems', None, datetime(2026, 1, 1), 'Location', 'Holiday', 'Optional Holiday', 'Opting?'],
+    ['Emp Id', 'Emp Name', 'Planned Leave', None, None, None, None],                # header
+    [4101, 'Asha', '5, 6', 'GCC', '1', '14', 'Yes'],    # 4 parsed: 5-6, GCC (fails), 1, 14
+    [4102, 'Ben', 'sick', 'US', None, '14', 'No'],      # 2 parsed: sick and US fail; not opting for 14
+    [4103, 'Chen', None, 'GCC', 'Holiday', None, 'No'], # 1 parsed: GCC fails; 'Holiday' repeats a header
+    [None, None, None, None, None, None, None],                                      # blank
+    ['Total', None, None, None, None, None, None],                                   # no employee ID
+    ['Finance Systems', None, 'Feb', 'Location', 'Holiday', 'Optional Holiday', 'Opting?'],  # separator
+    ['Emp Id', 'Emp Name', 'Planned Leave', None, None, None, None],                # header
+    [4101, 'Asha', '2 to 4', 'GCC', None, None, 'Yes'], # 2 parsed: 2-4, GCC fails
+    [4102, 'Ben', 9, 'US', None, None, 'No'],           # 2 parsed: 9, US fails
+]
+expected = {
+    'rows_scanned': len(rows) - 1,  # The first row holds the column names
+    'header_rows': 2,
+    'separator_rows': 1,
+    'employee_rows': 5,
+    'cells_inspected': 5 * 5,
+    'date_strings_parsed': 4 + 2 + 1 + 2 + 2,
+    'parse_failures': 1 + 2 + 1 + 1 + 1,
+}
+
+temp_dir = tempfile.mkdtemp()
+excel_file = os.path.join(temp_dir, 'stats.xlsx')
+calculator = SprintCapacityCalculator('config.json')
+workbook = openpyxl.Workbook()
+sheet = workbook.active
+sheet.title = calculator.config['excel_sheet_name']
+for row in rows:
+    sheet.append(row)
+workbook.save(excel_file)
+
+print("=" * 80)
+print("INGESTION STATS TEST")
+print("=" * 80)
+
+all_passed = True
+
+try:
+    parser = ExcelDataParser(calculator)
+    for label, parse in [("batch", parser.parse_excel_file), ("streaming", parser.parse_excel_file_streaming)]:
+        employees, leave_entries = parse(excel_file)
+        stats = parser.stats
+        counters = {name: getattr(stats, name) for name in expected}
+        passed = (counters == expected and stats.file_path == excel_file and not stats.from_cache
+                  and len(employees) == 3 and len(leave_entries) == 5
+                  and [section.rows for section in stats.sections] == [3, 2])
+        all_passed = all_passed and passed
+        print(f"{'✅' if passed else '❌'} {label}: {counters}")
+
+    table = stats.format_table()
+    passed = all(f"{value:>12,}" in table for value in expected.values()) and "INGESTION REPORT" in table
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Ingestion report lists the counters")
+finally:
+    shutil.rmtree(temp_dir)
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
@@ -0,0 +1,37 @@
+"""Test the cached leave date parser and its batch API"""
+from datetime import date
+
+from sprint_capacity_app import LeaveDateParser
+
+parser = LeaveDateParser()
+
+test_cases = [
+    ("22, 30", 1, 2026, [date(2026, 1, 22), date(2026, 1, 30)]),
+    ("16 to 27", 2, 2026, [date(2026, 2, d) for d in range(16, 28)]),
+    ("2, 3, 16, 17", 2, 2026, [date(2026, 2, d) for d in (2, 3, 16, 17)]),
+    ("19,20,23", 2, 2026, [date(2026, 2, d) for d in (19, 20, 23)]),
+    ("16 and 17", 2, 2026, [date(2026, 2, 16), date(2026, 2, 17)]),
+    ("26th - 28th", 2, 2026, [date(2026, 2, 26), date(2026, 2, 27), date(2026, 2, 28)]),
+    ("27 to 31", 2, 2026, [date(2026, 2, 27), date(2026, 2, 28)]),
+    ("", 2, 2026, []),
+]
+
+print("=" * 80)
+print("LEAVE DATE PARSER TEST")
+print("=" * 80)
+
+all_passed = True
+for date_str, month, year, expected in test_cases:
+    result = parser.parse(date_str, month, year)
+    passed = isinstance(result, tuple) and list(result) == expected
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} '{date_str}' -> {[d.strftime('%b %d') for d in result]}")
+
+strings = ["26th", "16 to 27", "26th", "1st & 4th"] * 1000
+batch = parser.parse_many(strings, 3, 2026)
+batch_ok = batch == [parser.parse(s, 3, 2026) for s in strings]
+all_passed = all_passed and batch_ok
+print(f"\nBatch of {len(strings)} strings matches single parses: {batch_ok}")
+print(f"Cache: {parser.cache_info()}")
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
@@ -0,0 +1,60 @@
+"""Test that the per-employee leave index answers sprint windows like a full scan"""
+from datetime import date, timedelta
+
+from sprint_capacity_app import Employee, LeaveEntry, LeaveIndex
+
+alice = Employee(emp_id="1001", name="Alice", location="GCC")
+bob = Employee(emp_id="1002", name="Bob", location="US")
+leave_entries = [
+    LeaveEntry(employee=alice, leave_dates=[date(2026, 2, d) for d in (2, 3, 4, 16)], leave_type='planned', description=''),
+    LeaveEntry(employee=alice, leave_dates=[date(2026, 2, 3)], leave_type='optional_holiday', description=''),
+    LeaveEntry(employee=alice, leave_dates=[date(2026, 2, 5)], leave_type='public_holiday', description=''),
+    LeaveEntry(employee=bob, leave_dates=[date(2026, 2, d) for d in range(6, 11)], leave_type='planned', description=''),
+    LeaveEntry(employee=alice, leave_dates=[date(2026, 2, 14), date(2026, 2, 9)], leave_type='planned', description=''),
+]
+
+index = LeaveIndex(leave_entries)
+
+
+def scan_count(emp_id, start, end, excluded=()):
+    """Capacity leave days the way a scan over every entry counts them"""
+    return sum(
+        1 for entry in leave_entries
+        if entry.employee.emp_id == emp_id and entry.leave_type in ['planned', 'optional_holiday']
+        for d in entry.leave_dates
+        if start <= d <= end and d.weekday() < 5 and d not in excluded
+    )
+
+
+def scan_lists(emp_id, start, end):
+    """Non-public-holiday date lists in the window, one per entry"""
+    lists = []
+    for entry in leave_entries:
+        if entry.employee.emp_id != emp_id or entry.leave_type == 'public_holiday':
+            continue
+        days = sorted(d.toordinal() for d in entry.leave_dates if start <= d <= end)
+        if days:
+            lists.append((entry.leave_type, days))
+    return lists
+
+
+print("=" * 80)
+print("LEAVE INDEX TEST")
+print("=" * 80)
+
+all_passed = True
+for emp_id in ("1001", "1002", "9999"):
+    for offset in range(0, 28, 7):
+        start = date(2026, 1, 26) + timedelta(days=offset)
+        end = start + timedelta(days=13)
+        excluded = {date(2026, 2, 3)}
+        counts_ok = (index.count_leave_days(emp_id, start, end) == scan_count(emp_id, start, end) and
+                     index.count_leave_days(emp_id, start, end, excluded) == scan_count(emp_id, start, end, excluded))
+        lists_ok = index.leave_lists(emp_id, start, end) == scan_lists(emp_id, start, end)
+        passed = counts_ok and lists_ok
+        all_passed = all_passed and passed
+        print(f"{'✅' if passed else '❌'} {emp_id} {start} - {end}: "
+              f"{index.count_leave_days(emp_id, start, end)} leave days, "
+              f"{len(index.leave_lists(emp_id, start, end))} date lists")
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
@@ -0,0 +1,60 @@
+"""Test the on-call interval index and per-shift on-call capacity"""
+from datetime import date
+
+from sprint_capacity_app import (Employee, OnCallIndex, OnCallSchedule, Sprint,
+                                 SprintCapacityCalculator, SprintManager)
+
+rotations = [
+    OnCallSchedule(start_date=date(2026, 1, 21), end_date=date(2026, 2, 3), primary="Bob", secondary="Alice"),
+    OnCallSchedule(start_date=date(2026, 1, 7), end_date=date(2026, 1, 20), primary="Alice", secondary="Bob"),
+    OnCallSchedule(start_date=date(2026, 3, 1), end_date=date(2026, 3, 31), primary="Carol", secondary="Alice"),
+]
+index = OnCallIndex(rotations)
+
+
+def scan(start_date, end_date):
+    """Overlapping rotations found by checking every row"""
+    return sorted((oncall for oncall in rotations
+                   if oncall.start_date <= end_date and oncall.end_date >= start_date),
+                  key=lambda oncall: oncall.start_date)
+
+
+print("=" * 80)
+print("ON-CALL INDEX TEST")
+print("=" * 80)
+
+all_passed = True
+windows = [(date(2026, 1, 1), date(2026, 1, 6)), (date(2026, 1, 14), date(2026, 1, 27)),
+           (date(2026, 2, 1), date(2026, 3, 5)), (date(2026, 4, 1), date(2026, 4, 14))]
+for start_date, end_date in windows:
+    overlapping = index.overlapping(start_date, end_date)
+    passed = overlapping == scan(start_date, end_date)
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} {start_date} - {end_date}: {[oncall.primary for oncall in overlapping]}")
+
+shifts = index.primary_shifts(date(2026, 1, 14), date(2026, 1, 27))
+shifts_ok = [(start, end, oncall.primary) for start, end, oncall in shifts] == [
+    (date(2026, 1, 14), date(2026, 1, 20), "Alice"), (date(2026, 1, 21), date(2026, 1, 27), "Bob")]
+all_passed = all_passed and shifts_ok
+print(f"{'✅' if shifts_ok else '❌'} Mid-sprint rotation splits into shifts: "
+      f"{[(f'{start:%b %d}-{end:%b %d}', oncall.primary) for start, end, oncall in shifts]}")
+
+# Each primary loses the on-call hours only on the weekdays of their own shift
+calculator = SprintCapacityCalculator('config.json')
+calculator.employees = [Employee(emp_id="1", name="Alice"), Employee(emp_id="2", name="Bob")]
+calculator.leave_entries = []
+sprint_manager = SprintManager(calculator)
+sprint = Sprint(number=1, start_date=date(2026, 1, 14), end_date=date(2026, 1, 27))
+sprint_manager.assign_oncall_to_sprint(sprint, rotations)
+capacity = sprint_manager.calculate_sprint_capacity(sprint)
+
+hours_per_day = calculator.config.get('hours_per_day', 6)
+reduction = calculator.config.get('oncall_primary_hours_reduction', 3)
+expected_hours = 2 * 10 * hours_per_day - 10 * reduction  # 5 + 5 on-call weekdays
+capacity_ok = (sprint.oncall_primary == "Alice" and len(sprint.oncall_shifts) == 2 and
+               capacity.ideal_capacity_hours == expected_hours)
+all_passed = all_passed and capacity_ok
+print(f"{'✅' if capacity_ok else '❌'} Prorated on-call capacity: {capacity.ideal_capacity_hours}h "
+      f"(expected {expected_hours}h)")
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
@@ -0,0 +1,47 @@
+"""Test on-call name resolution: matching strategies, aliases, memoization and diagnostics"""
+from sprint_capacity_app import Employee, EmployeeRegistry, OnCallResolver
+
+employees = [
+    Employee(emp_id="200010", name="Sivaguru Ramesh"),
+    Employee(emp_id="200011", name="Lakshmipathy"),
+    Employee(emp_id="200012", name="Priya Kumar"),
+    Employee(emp_id="200013", name="Priya Raman"),
+    Employee(emp_id="200014", name="Dhivya Dharmaraj", location="US"),
+]
+registry = EmployeeRegistry.from_employees(employees)
+resolver = OnCallResolver(registry, {"DD": "200014", "Laksh": "Lakshmipathy"})
+reversed_resolver = OnCallResolver(EmployeeRegistry.from_employees(employees[::-1]))
+
+test_cases = [
+    ("Lakshmipathy", "200011"),       # exact
+    ("  lakshmipathy ", "200011"),     # exact after strip/lowercase
+    ("Siva Guru", "200010"),           # name part "siva" inside "sivaguru"
+    ("Dhivya D.", "200014"),           # name part
+    ("DD", "200014"),                  # alias to emp_id
+    ("Laksh", "200011"),               # alias to name
+    ("Priya", "200012"),               # ambiguous: lowest (name, emp_id) wins
+    ("Nobody Known", None),
+]
+
+print("=" * 80)
+print("ON-CALL RESOLVER TEST")
+print("=" * 80)
+
+all_passed = True
+for oncall_name, expected in test_cases:
+    employee = resolver.resolve(oncall_name)
+    result = employee.emp_id if employee else None
+    passed = result == expected
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} '{oncall_name}' -> {employee.name if employee else None}")
+
+order_ok = all(
+    resolver.resolve(name) == reversed_resolver.resolve(name) for name in ("Priya", "Siva Guru", "Dhivya"))
+memo_ok = resolver.resolve("Priya") is resolver.resolve("PRIYA")
+diagnostics_ok = set(resolver.diagnostics) == {"priya", "nobody known"}
+all_passed = all_passed and order_ok and memo_ok and diagnostics_ok
+print(f"\nSame result for reversed employee order: {order_ok}")
+print(f"Memoized per on-call name: {memo_ok}")
+print(f"Diagnostics: {resolver.diagnostics}")
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
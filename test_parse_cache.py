@@ -0,0 +1,120 @@
+"""Test that the parse cache is reused while the workbook is unchanged and discarded when it changes"""
+import json
+import os
+import shutil
+import tempfile
+
+import openpyxl
+
+from sprint_capacity_app import SprintCapacityApp
+
+temp_dir = tempfile.mkdtemp()
+excel_file = os.path.join(temp_dir, 'CapacityUpdate.xlsx')
+cache_dir = os.path.join(temp_dir, 'cache')
+
+app = SprintCapacityApp('config.json')
+shutil.copy(app.calculator.config['excel_file_path'], excel_file)
+app.calculator.config['excel_file_path'] = excel_file
+app.calculator.config['parse_cache_dir'] = app.parse_cache.cache_dir = cache_dir
+cache_file = app.parse_cache.cache_path(excel_file)
+
+
+def load():
+    """Parsed data as comparable tuples, and whether it came from the cache"""
+    employees, leave_entries, oncall_schedules = app.load_workbook_data(excel_file)
+    data = ([vars(employee) for employee in employees],
+            [(entry.employee.emp_id, entry.leave_dates, entry.leave_type, entry.description)
+             for entry in leave_entries],
+            oncall_schedules)
+    return data, app.parser.stats.from_cache
+
+
+def planned_days(data, emp_id):
+    return sorted(day for entry_emp_id, days, leave_type, _ in data[1]
+                  if entry_emp_id == emp_id and leave_type == 'planned' for day in days)
+
+
+print("=" * 80)
+print("PARSE CACHE TEST")
+print("=" * 80)
+
+all_passed = True
+
+try:
+    parsed, from_cache = load()
+    passed = not from_cache and os.path.exists(cache_file)
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} First load parses the workbook and writes {os.path.basename(cache_file)}")
+
+    cached, from_cache = load()
+    passed = from_cache and cached == parsed
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Second load is a cache hit with the same data")
+
+    # A touched but unchanged file still matches by content hash
+    stat = os.stat(excel_file)
+    os.utime(excel_file, (stat.st_atime, stat.st_mtime + 60))
+    touched, from_cache = load()
+    passed = from_cache and touched == parsed
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Touched workbook with the same contents is still a cache hit")
+
+    # The hit stored the new mtime, so the next load does not hash the workbook again
+    hashes = []
+    file_hash = app.parse_cache.file_hash
+    app.parse_cache.file_hash = lambda path: hashes.append(path) or file_hash(path)
+    with open(cache_file, encoding='utf-8') as f:
+        stored_mtime = json.load(f)['fingerprint']['mtime']
+    touched, from_cache = load()
+    del app.parse_cache.file_hash
+    passed = from_cache and touched == parsed and stored_mtime == os.stat(excel_file).st_mtime and not hashes
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Cache fingerprint updated after the touch: {len(hashes)} hashes on the next load")
+
+    # Suganya's January leave moves from the 22nd and 30th to the 22nd and 23rd
+    workbook = openpyxl.load_workbook(excel_file)
+    sheet = workbook[app.calculator.config['excel_sheet_name']]
+    edited_cell = next(row[2] for row in sheet.iter_rows() if row[0].value == 200325)
+    edited_cell.value = '22, 23'
+    workbook.save(excel_file)
+
+    edited, from_cache = load()
+    days = [day.day for day in planned_days(edited, '200325') if day.month == 1]
+    passed = not from_cache and days == [22, 23] and edited[1] != parsed[1]
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Edited workbook discards the cache: January leave {days}")
+
+    cached, from_cache = load()
+    passed = from_cache and cached == edited
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Cache rewritten for the edited workbook")
+
+    # A parse setting that changes the result invalidates the cache
+    app.calculator.config['excel_streaming'] = True
+    streamed, from_cache = load()
+    app.calculator.config['excel_streaming'] = False
+    passed = not from_cache and streamed == edited
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Changed parse settings re-parse the workbook")
+
+    # --refresh-cache re-parses a valid cache and writes it again
+    load()
+    cache_mtime = os.stat(cache_file).st_mtime_ns
+    app.refresh_cache = True
+    refreshed, from_cache = load()
+    app.refresh_cache = False
+    passed = not from_cache and refreshed == edited and os.stat(cache_file).st_mtime_ns != cache_mtime
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Refresh re-parses and overwrites a valid cache")
+
+    # --no-cache neither reads nor writes the cache
+    shutil.rmtree(cache_dir)
+    app.calculator.config['parse_cache_enabled'] = False
+    uncached, from_cache = load()
+    passed = not from_cache and uncached == edited and not os.path.exists(cache_file)
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Disabled cache parses without writing a cache file")
+finally:
+    shutil.rmtree(temp_dir)
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
@@ -0,0 +1,85 @@
+"""Test that what-if scenarios match a full recalculation on the edited leave and on-call data"""
+from datetime import date, timedelta
+
+from sprint_capacity_app import (CapacityScenario, Employee, LeaveEntry, OnCallSchedule, ScenarioEngine,
+                                 SprintCapacityCalculator, SprintManager)
+
+alice = Employee(emp_id="1001", name="Alice", location="GCC")
+bob = Employee(emp_id="1002", name="Bob", location="US")
+carol = Employee(emp_id="1003", name="Carol", location="GCC")
+
+calculator = SprintCapacityCalculator('config.json')
+calculator.employees = [alice, bob, carol]
+calculator.leave_entries = [
+    LeaveEntry(employee=alice, leave_dates=[date(2026, 10, 20), date(2026, 10, 21)], leave_type='planned', description=''),
+    LeaveEntry(employee=bob, leave_dates=[date(2026, 11, 3)], leave_type='optional_holiday', description=''),
+    LeaveEntry(employee=carol, leave_dates=[date(2026, 11, 2)], leave_type='public_holiday', description=''),
+]
+calculator.oncall_schedules = [
+    OnCallSchedule(start_date=date(2026, 10, 1), end_date=date(2026, 12, 31), primary="Carol", secondary="Bob"),
+]
+calculator.collapse_holidays()
+
+sprint_manager = SprintManager(calculator)
+sprints = list(calculator.get_sprint_calendar().sprints_between(date(2026, 10, 5), date(2026, 12, 20)))
+for sprint in sprints:
+    sprint_manager.assign_oncall_to_sprint(sprint, calculator.oncall_schedules)
+engine = ScenarioEngine(sprint_manager, sprints)
+
+diwali_week = [date(2026, 11, 2) + timedelta(days=offset) for offset in range(5)]
+scenario = (CapacityScenario("Diwali week")
+            .add_leave("1001", diwali_week)
+            .add_leave("1002", diwali_week, 'optional_holiday')
+            .remove_leave("1001", [date(2026, 10, 21)])
+            .swap_oncall("Carol", "Bob", date(2026, 11, 9), date(2026, 11, 13)))
+result = engine.evaluate(scenario)
+
+# The same changes made to a copy of the leave table, recalculated in full
+base_entries = calculator.leave_entries
+calculator.leave_entries = [
+    LeaveEntry(employee=alice, leave_dates=[date(2026, 10, 20)], leave_type='planned', description=''),
+    base_entries[1],
+    LeaveEntry(employee=alice, leave_dates=diwali_week, leave_type='planned', description=''),
+    LeaveEntry(employee=bob, leave_dates=[day for day in diwali_week if day != date(2026, 11, 3)],
+               leave_type='optional_holiday', description=''),
+]
+calculator.holiday_calendar_entries = calculator.leave_entries
+expected = [sprint_manager.calculate_sprint_capacity(engine.swap_oncall(sprint, scenario))
+            for sprint in sprints]
+calculator.leave_entries = base_entries
+calculator.holiday_calendar_entries = base_entries
+
+print("=" * 80)
+print("WHAT-IF SCENARIO TEST")
+print("=" * 80)
+
+all_passed = True
+changed_numbers = {diff.sprint_number for diff in result.diffs}
+for capacity, expected_capacity, baseline in zip(result.sprint_capacities, expected, engine.baseline):
+    passed = vars(capacity) == vars(expected_capacity)
+    if capacity.sprint.number not in changed_numbers:
+        passed = passed and capacity is baseline
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Sprint {capacity.sprint.number}: "
+          f"{baseline.capacity_percentage:.1f}% -> {capacity.capacity_percentage:.1f}%"
+          f"{'' if capacity.sprint.number in changed_numbers else ' (baseline reused)'}")
+
+swapped = [capacity.sprint for capacity in result.sprint_capacities
+           if capacity.sprint.start_date <= date(2026, 11, 9) <= capacity.sprint.end_date][0]
+swap_ok = (date(2026, 11, 9), date(2026, 11, 13), "Bob") in swapped.oncall_shifts
+base_ok = all(primary == "Carol" for sprint in sprints for _, _, primary in sprint.oncall_shifts)
+all_passed = all_passed and swap_ok and base_ok
+print(f"{'✅' if swap_ok else '❌'} Bob covers on-call Nov 09-13: {swapped.oncall_shifts}")
+print(f"{'✅' if base_ok else '❌'} Baseline sprints are unchanged")
+
+try:
+    engine.evaluate(CapacityScenario("Unknown").add_leave("9999", diwali_week))
+    unknown_ok = False
+except ValueError:
+    unknown_ok = True
+all_passed = all_passed and unknown_ok
+print(f"{'✅' if unknown_ok else '❌'} Unknown employees are rejected")
+
+print()
+print(result.format_table())
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
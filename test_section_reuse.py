@@ -0,0 +1,86 @@
+"""Test that unchanged month sections are reused from an earlier parse and changed ones re-parsed"""
+import os
+import shutil
+import tempfile
+
+import openpyxl
+
+from sprint_capacity_app import EmployeeRegistry, ExcelDataParser, SprintCapacityCalculator
+
+temp_dir = tempfile.mkdtemp()
+excel_file = os.path.join(temp_dir, 'CapacityUpdate.xlsx')
+
+calculator = SprintCapacityCalculator('config.json')
+shutil.copy(calculator.config['excel_file_path'], excel_file)
+parser = ExcelDataParser(calculator)
+
+
+def snapshot(leave_entries):
+    return [(entry.employee.emp_id, entry.employee.location, list(entry.leave_dates), entry.leave_type)
+            for entry in leave_entries]
+
+
+def reused_flags():
+    return [(section.label, section.reused) for section in parser.stats.sections]
+
+
+print("=" * 80)
+print("SECTION REUSE TEST")
+print("=" * 80)
+
+all_passed = True
+
+try:
+    employees, leave_entries = parser.parse_excel_file(excel_file)
+    previous_sections = parser.section_results
+    cached_before = {fingerprint: snapshot(entries) for fingerprint, (_, entries) in previous_sections.items()}
+    fresh = snapshot(leave_entries)
+
+    # Reusing every section twice from the same results gives equal but separate entries
+    _, first_entries = parser.parse_excel_file(excel_file, None, previous_sections)
+    first = snapshot(first_entries)
+    _, second_entries = parser.parse_excel_file(excel_file, None, previous_sections)
+    reused_ids = {id(entry) for _, entries in previous_sections.values() for entry in entries}
+    passed = (first == fresh and snapshot(second_entries) == fresh and snapshot(first_entries) == first
+              and all(reused for _, reused in reused_flags())
+              and not {id(entry) for entry in first_entries} & {id(entry) for entry in second_entries}
+              and not {id(entry) for entry in first_entries + second_entries} & reused_ids)
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Unchanged sections reused: {reused_flags()}, entries copied on each parse")
+
+    passed = {fingerprint: snapshot(entries)
+              for fingerprint, (_, entries) in previous_sections.items()} == cached_before
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Reused section results are left unchanged")
+
+    # Two sections with the same results are merged as separate entries
+    section_employees, section_entries = next(iter(previous_sections.values()))
+    registry = EmployeeRegistry()
+    merged = []
+    parser._merge_section(registry, section_employees, section_entries, merged)
+    parser._merge_section(registry, section_employees, section_entries, merged)
+    half = len(section_entries)
+    passed = (len(merged) == 2 * half and snapshot(merged[:half]) == snapshot(merged[half:])
+              and all(first is not second and first.leave_dates is not second.leave_dates
+                      for first, second in zip(merged[:half], merged[half:])))
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Same section merged twice gives {len(merged)} separate entries")
+
+    # Suganya's January leave moves from the 22nd and 30th to the 22nd and 23rd
+    workbook = openpyxl.load_workbook(excel_file)
+    sheet = workbook[calculator.config['excel_sheet_name']]
+    edited_cell = next(row[2] for row in sheet.iter_rows() if row[0].value == 200325)
+    edited_cell.value = '22, 23'
+    workbook.save(excel_file)
+
+    _, edited_entries = parser.parse_excel_file(excel_file, None, previous_sections)
+    flags = reused_flags()
+    _, reparsed_entries = parser.parse_excel_file(excel_file)
+    passed = (flags[0] == (flags[0][0], False) and all(reused for _, reused in flags[1:])
+              and snapshot(edited_entries) == snapshot(reparsed_entries) != fresh)
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Changed section re-parsed, the others reused: {flags}")
+finally:
+    shutil.rmtree(temp_dir)
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
@@ -0,0 +1,89 @@
+"""Test that capacities from an exported snapshot match a fresh parse of the workbook"""
+import os
+import tempfile
+from datetime import datetime
+
+from sprint_capacity_app import (CapacitySnapshot, ExcelDataParser, SprintCapacityApp, SprintCapacityCalculator,
+                                 SprintManager)
+
+# Fresh parse of the workbook
+calculator = SprintCapacityCalculator('config.json')
+parser = ExcelDataParser(calculator)
+excel_path = calculator.config['excel_file_path']
+calculator.employees, calculator.leave_entries = parser.parse_excel_file(excel_path)
+calculator.oncall_schedules = parser.parse_oncall_schedules(excel_path)
+public_holiday_entries = sum(1 for entry in calculator.leave_entries if entry.leave_type == 'public_holiday')
+
+with tempfile.TemporaryDirectory() as temp_dir:
+    snapshot_file = os.path.join(temp_dir, 'capacity.npz')
+    CapacitySnapshot.export(snapshot_file, calculator.employees, calculator.leave_entries,
+                            calculator.oncall_schedules)
+    employees, leave_entries, oncall_schedules, holiday_calendar = CapacitySnapshot.load(snapshot_file)
+
+    # A full analysis from the snapshot, writing its reports under the temporary folder
+    app = SprintCapacityApp(os.path.abspath('config.json'))
+    app.calculator.config['snapshot_path'] = snapshot_file
+    working_dir = os.getcwd()
+    os.chdir(temp_dir)
+    try:
+        analysis_ok = app.run_capacity_analysis()
+    finally:
+        os.chdir(working_dir)
+    snapshot_stats = app.parser.stats
+    stats_table = snapshot_stats.format_table()
+
+calculator.collapse_holidays()
+
+# The same sprints calculated from the snapshot, as run_capacity_analysis loads it
+snapshot_calculator = SprintCapacityCalculator('config.json')
+snapshot_calculator.employees = employees
+snapshot_calculator.leave_entries = leave_entries
+snapshot_calculator.oncall_schedules = oncall_schedules
+snapshot_calculator.set_holiday_calendar(holiday_calendar)
+snapshot_calculator.collapse_holidays()
+
+first_sprint_start = datetime.strptime(calculator.config['sprint_start_date'], '%Y-%m-%d').date()
+
+print("=" * 80)
+print("SNAPSHOT TEST")
+print("=" * 80)
+
+all_passed = True
+
+holidays_ok = (holiday_calendar.holidays == calculator.get_holiday_calendar().holidays and
+               snapshot_calculator.get_holiday_calendar() is holiday_calendar)
+all_passed = all_passed and holidays_ok
+print(f"{'✅' if holidays_ok else '❌'} Holiday calendar loaded: {len(holiday_calendar)} holidays at "
+      f"{sorted(holiday_calendar.locations)}")
+
+entries_ok = ([(entry.employee, entry.leave_dates, entry.leave_type, entry.description) for entry in leave_entries] ==
+              [(entry.employee, entry.leave_dates, entry.leave_type, entry.description)
+               for entry in calculator.leave_entries])
+all_passed = all_passed and entries_ok
+print(f"{'✅' if entries_ok else '❌'} {len(leave_entries)} leave entries loaded, "
+      f"{public_holiday_entries} per-employee public holiday entries stored as the calendar")
+
+stats_ok = (analysis_ok and snapshot_stats.from_snapshot and snapshot_stats.file_path == snapshot_file
+            and "Loaded from snapshot (no sheets parsed)" in stats_table and "Rows scanned" not in stats_table)
+all_passed = all_passed and stats_ok
+print(f"{'✅' if stats_ok else '❌'} Analysis from the snapshot reports where its data came from")
+
+oncall_ok = oncall_schedules == calculator.oncall_schedules
+all_passed = all_passed and oncall_ok
+print(f"{'✅' if oncall_ok else '❌'} {len(oncall_schedules)} on-call schedules loaded")
+
+for engine in ['loop', 'matrix']:
+    capacities = []
+    for sprint_calculator in [calculator, snapshot_calculator]:
+        sprint_calculator.config['capacity_engine'] = engine
+        sprint_manager = SprintManager(sprint_calculator)
+        sprints = sprint_manager.calculate_sprints(first_sprint_start, 26, sprint_calculator.oncall_schedules)
+        capacities.append(sprint_manager.calculate_sprint_capacities(sprints))
+    fresh, loaded = capacities
+    passed = len(fresh) == len(loaded) == 26 and all(
+        vars(fresh_capacity) == vars(loaded_capacity) for fresh_capacity, loaded_capacity in zip(fresh, loaded))
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} {engine} engine: {len(loaded)} sprint capacities match the fresh parse "
+          f"({sum(capacity.actual_capacity_hours for capacity in loaded)}h in total)")
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
@@ -0,0 +1,49 @@
+"""Test closed-form sprint lookup against walking sprints from the first sprint"""
+from datetime import date, timedelta
+from itertools import islice
+
+from sprint_capacity_app import SprintCalendar, SprintCapacityCalculator, SprintManager
+
+calculator = SprintCapacityCalculator('config.json')
+sprint_calendar = calculator.get_sprint_calendar()
+first_sprint_start = sprint_calendar.first_sprint_start
+duration = sprint_calendar.duration_days
+
+# Sprints built one after another, the way they used to be
+walked = SprintManager(calculator).calculate_sprints(first_sprint_start, 80)
+
+print("=" * 80)
+print("SPRINT CALENDAR TEST")
+print("=" * 80)
+
+all_passed = True
+for sprint in walked[::13]:
+    by_number = sprint_calendar.sprint_by_number(sprint.number)
+    passed = (by_number == sprint and
+              sprint_calendar.sprint_for_date(sprint.start_date) == sprint and
+              sprint_calendar.sprint_for_date(sprint.end_date) == sprint)
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} Sprint {sprint.number}: {sprint.start_date} to {sprint.end_date}")
+
+far_day = first_sprint_start + timedelta(days=365 * 40)
+far_sprint = sprint_calendar.sprint_for_date(far_day)
+far_ok = far_sprint.start_date <= far_day <= far_sprint.end_date
+before_ok = sprint_calendar.number_for_date(first_sprint_start - timedelta(days=1)) == 0
+lazy_ok = [s.number for s in islice(sprint_calendar.iter_sprints(5), 3)] == [5, 6, 7]
+window = list(sprint_calendar.sprints_between(walked[2].end_date, walked[4].start_date))
+window_ok = [s.number for s in window] == [3, 4, 5]
+all_passed = all_passed and far_ok and before_ok and lazy_ok and window_ok
+print(f"{'✅' if far_ok else '❌'} 40 years on: {far_day} is in Sprint {far_sprint.number}")
+print(f"{'✅' if before_ok else '❌'} Day before the first sprint is in Sprint 0")
+print(f"{'✅' if lazy_ok else '❌'} Lazy iterator from Sprint 5")
+print(f"{'✅' if window_ok else '❌'} Sprints overlapping a window: {[s.number for s in window]}")
+
+try:
+    SprintCalendar(date(2026, 1, 1), 0)
+    invalid_ok = False
+except ValueError:
+    invalid_ok = True
+all_passed = all_passed and invalid_ok
+print(f"{'✅' if invalid_ok else '❌'} Zero-day sprints are rejected")
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
@@ -0,0 +1,32 @@
+"""Test that streaming mode parses the same data as the DataFrame parser"""
+from sprint_capacity_app import SprintCapacityCalculator, ExcelDataParser
+
+calculator = SprintCapacityCalculator('config.json')
+parser = ExcelDataParser(calculator)
+excel_path = calculator.config['excel_file_path']
+
+employees, leave_entries = parser.parse_excel_file(excel_path)
+stream_employees, stream_entries = parser.parse_excel_file_streaming(excel_path)
+
+print("=" * 80)
+print("STREAMING PARSER TEST")
+print("=" * 80)
+print(f"DataFrame parser: {len(employees)} employees, {len(leave_entries)} leave entries")
+print(f"Streaming parser: {len(stream_employees)} employees, {len(stream_entries)} leave entries")
+
+employees_match = employees == stream_employees
+entries_match = [
+    (entry.employee, entry.leave_dates, entry.leave_type) for entry in leave_entries
+] == [
+    (entry.employee, entry.leave_dates, entry.leave_type) for entry in stream_entries
+]
+
+print(f"\nEmployees match: {employees_match}")
+print(f"Leave entries match: {entries_match}")
+
+sections = list(parser.iter_leave_sections(excel_path))
+print(f"Month sections streamed: {len(sections)}")
+for i, (section_employees, section_entries) in enumerate(sections, 1):
+    print(f"  Section {i}: {len(section_employees)} employees, {len(section_entries)} leave entries")
+
+print(f"\nStatus: {'✅ PASS' if employees_match and entries_match else '❌ FAIL'}")
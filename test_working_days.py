@@ -0,0 +1,44 @@
+"""Test business-day counting for sprints and per-location calendars"""
+from datetime import date, timedelta
+
+from sprint_capacity_app import Calendar, Sprint
+
+gcc_holidays = {date(2026, 1, 1), date(2026, 1, 15), date(2026, 1, 17)}  # Jan 17 is a Saturday
+us_holidays = {date(2026, 1, 19)}
+calendar = Calendar(2026, 2026, {'GCC': gcc_holidays, 'US': us_holidays})
+
+
+def count_by_walking(start_date, end_date, holidays=()):
+    """Weekdays that are not holidays, counted one day at a time"""
+    days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    return sum(1 for day in days if day.weekday() < 5 and day not in holidays)
+
+
+print("=" * 80)
+print("WORKING DAYS TEST")
+print("=" * 80)
+
+all_passed = True
+for start_date in [date(2025, 12, 31) + timedelta(days=14 * i) for i in range(4)] + [date(2026, 12, 24)]:
+    end_date = start_date + timedelta(days=13)
+    sprint = Sprint(number=1, start_date=start_date, end_date=end_date)
+    checks = [
+        sprint.get_working_days() == count_by_walking(start_date, end_date),
+        sprint.get_working_days(gcc_holidays) == count_by_walking(start_date, end_date, gcc_holidays),
+        calendar.weekdays(start_date, end_date) == count_by_walking(start_date, end_date),
+        calendar.working_days(start_date, end_date, 'GCC') == count_by_walking(start_date, end_date, gcc_holidays),
+        calendar.working_days(start_date, end_date, 'US') == count_by_walking(start_date, end_date, us_holidays),
+    ]
+    passed = all(checks)
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} {start_date} - {end_date}: "
+          f"{calendar.weekdays(start_date, end_date)} weekdays, "
+          f"GCC {calendar.working_days(start_date, end_date, 'GCC')}, "
+          f"US {calendar.working_days(start_date, end_date, 'US')}")
+
+empty_sprint = Sprint(number=1, start_date=date(2026, 1, 19), end_date=date(2026, 1, 16))
+empty_ok = empty_sprint.get_working_days() == 0 and calendar.weekdays(date(2026, 1, 19), date(2026, 1, 16)) == 0
+all_passed = all_passed and empty_ok
+print(f"{'✅' if empty_ok else '❌'} End date before start date counts 0 days")
+
+print(f"\nStatus: {'✅ PASS' if all_passed else '❌ FAIL'}")
@@ -13,7 +13,7 @@ from flask import Flask, render_template, request, jsonify, send_file, flash, re
 import os
 import json
 from datetime import datetime
-from sprint_capacity_app import SprintCapacityApp
+from sprint_capacity_app import SprintCapacityApp, CapacityState
 import tempfile
 import threading
 
@@ -23,6 +23,9 @@ app.secret_key = 'sprint_capacity_secret_key_2025'
 # Global variables
 capacity_app = None
 latest_report_data = None
+capacity_state = None
+# Guards capacity_app, capacity_state and latest_report_data across request threads
+state_lock = threading.Lock()
 
 
 def initialize_app():
@@ -31,6 +34,29 @@ def initialize_app():
     capacity_app = SprintCapacityApp()
 
 
+def capacity_to_dict(capacity):
+    """Dashboard data of one sprint capacity"""
+    return {
+        'sprint_number': capacity.sprint.number,
+        'start_date': capacity.sprint.start_date.strftime('%Y-%m-%d'),
+        'end_date': capacity.sprint.end_date.strftime('%Y-%m-%d'),
+        'total_members': capacity.total_team_members,
+        'available_members': capacity.available_members,
+        'capacity_percentage': round(capacity.capacity_percentage, 1),
+        'working_days': capacity.working_days,
+        'ideal_capacity_hours': round(capacity.ideal_capacity_hours, 1),
+        'actual_capacity_hours': round(capacity.actual_capacity_hours, 1),
+        'members_on_leave': [
+            {
+                'name': emp.name,
+                'emp_id': emp.emp_id,
+                'reason': reason
+            }
+            for emp, reason in capacity.members_on_leave
+        ]
+    }
+
+
 @app.route('/')
 def index():
     """Main dashboard page"""
@@ -41,60 +67,112 @@ def index():
 def analyze_capacity():
     """API endpoint to run capacity analysis"""
     try:
-        global latest_report_data
-
-        # Run analysis in background
-        success = capacity_app.run_capacity_analysis()
-
-        if success:
-            # Get the latest report data
-            sprints = capacity_app.sprint_manager.get_current_and_upcoming_sprints()
-            sprint_capacities = []
-
-            for sprint in sprints:
-                capacity = capacity_app.sprint_manager.calculate_sprint_capacity(
-                    sprint)
-                sprint_capacities.append({
-                    'sprint_number': capacity.sprint.number,
-                    'start_date': capacity.sprint.start_date.strftime('%Y-%m-%d'),
-                    'end_date': capacity.sprint.end_date.strftime('%Y-%m-%d'),
-                    'total_members': capacity.total_team_members,
-                    'available_members': capacity.available_members,
-                    'capacity_percentage': round(capacity.capacity_percentage, 1),
-                    'working_days': capacity.working_days,
-                    'ideal_capacity_hours': round(capacity.ideal_capacity_hours, 1),
-                    'actual_capacity_hours': round(capacity.actual_capacity_hours, 1),
-                    'members_on_leave': [
-                        {
-                            'name': emp.name,
-                            'emp_id': emp.emp_id,
-                            'reason': reason
-                        }
-                        for emp, reason in capacity.members_on_leave
-                    ]
+        global latest_report_data, capacity_state
+
+        # Optional forecast horizon: upcoming sprints after the current one
+        horizon = request.args.get('horizon')
+        if horizon is None and request.is_json:
+            horizon = (request.get_json(silent=True) or {}).get('horizon')
+        if horizon is not None:
+            try:
+                horizon = int(horizon)
+            except (TypeError, ValueError):
+                horizon = 0
+            if horizon < 1:
+                return jsonify({
+                    'success': False,
+                    'message': 'horizon must be a positive number of sprints'
+                }), 400
+
+        with state_lock:
+            # Run analysis in background
+            success = capacity_app.run_capacity_analysis(horizon)
+
+            if success:
+                # Keep the analysis results so leave edits only recalculate the sprints they touch
+                capacity_state = CapacityState(
+                    capacity_app.sprint_manager, capacity_app.sprints, capacity_app.sprint_baselines)
+                sprint_capacities = [capacity_to_dict(capacity)
+                                     for capacity in capacity_state.sprint_capacities]
+
+                latest_report_data = {
+                    'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'sprint_capacities': sprint_capacities
+                }
+
+                return jsonify({
+                    'success': True,
+                    'message': 'Analysis completed successfully',
+                    'data': latest_report_data
                 })
+            else:
+                return jsonify({
+                    'success': False,
+                    'message': 'Analysis failed. Check logs for details.'
+                }), 500
 
-            latest_report_data = {
-                'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'sprint_capacities': sprint_capacities
-            }
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error during analysis: {str(e)}'
+        }), 500
 
+
+@app.route('/api/leave', methods=['POST'])
+def edit_leave():
+    """API endpoint to add or remove one employee's leave days and update the capacity"""
+    data = request.get_json(silent=True) or {}
+    action = data.get('action', 'add')
+    try:
+        if action not in ('add', 'remove'):
+            raise ValueError(f"action must be 'add' or 'remove', got '{action}'")
+        dates = [datetime.strptime(value, '%Y-%m-%d').date() for value in data.get('dates', [])]
+        if not dates:
+            raise ValueError('dates must list at least one YYYY-MM-DD date')
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    emp_id = str(data.get('emp_id', ''))
+    leave_type = data.get('leave_type', 'planned')
+
+    with state_lock:
+        if capacity_state is None or latest_report_data is None:
             return jsonify({
-                'success': True,
-                'message': 'Analysis completed successfully',
-                'data': latest_report_data
-            })
-        else:
+                'success': False,
+                'message': 'No capacity data available. Run analysis first.'
+            }), 409
+
+        try:
+            if action == 'add':
+                diffs = capacity_state.add_leave(emp_id, dates, leave_type)
+            else:
+                diffs = capacity_state.remove_leave(emp_id, dates, leave_type)
+        except ValueError as e:
             return jsonify({
                 'success': False,
-                'message': 'Analysis failed. Check logs for details.'
-            }), 500
+                'message': str(e)
+            }), 400
+
+        # Replace the dashboard data of the recalculated sprints only
+        positions = {capacity['sprint_number']: position
+                     for position, capacity in enumerate(latest_report_data['sprint_capacities'])}
+        updated = []
+        for diff in diffs:
+            sprint_data = capacity_to_dict(diff.scenario)
+            latest_report_data['sprint_capacities'][positions[diff.sprint_number]] = sprint_data
+            updated.append(dict(sprint_data,
+                                capacity_percentage_change=round(diff.capacity_percentage_change, 1),
+                                actual_hours_change=round(diff.actual_hours_change, 1)))
+        latest_report_data['generated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-    except Exception as e:
         return jsonify({
-            'success': False,
-            'message': f'Error during analysis: {str(e)}'
-        }), 500
+            'success': True,
+            'message': f'{len(updated)} sprints updated',
+            'updated_sprints': updated,
+            'data': latest_report_data
+        })
 
 
 @app.route('/api/report-data')
@@ -102,12 +180,12 @@ def get_report_data():
     """Get the latest report data"""
     global latest_report_data
 
-    if latest_report_data:
-        return jsonify(latest_report_data)
-    else:
-        return jsonify({
-            'message': 'No report data available. Run analysis first.'
-        }), 404
+    with state_lock:
+        if latest_report_data:
+            return jsonify(latest_report_data)
+    return jsonify({
+        'message': 'No report data available. Run analysis first.'
+    }), 404
 
 
 @app.route('/api/config', methods=['GET', 'POST'])